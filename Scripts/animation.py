@@ -0,0 +1,73 @@
+import pygame
+
+from utils import load_sprite, sprite_cache
+
+
+class Animation:
+	"""Класс неизменяемой анимации: кадры и длительность одного кадра.
+
+	Отражённые по горизонтали кадры создаются один раз при загрузке,
+	поэтому смена направления сводится к выбору банка кадров."""
+	__slots__ = ('frames', 'flipped_frames', 'banks', 'frame_duration')
+
+	def __init__(self, frames, frame_duration):
+		self.frames = tuple(frames)
+		self.flipped_frames = tuple(pygame.transform.flip(frame, True, False) for frame in self.frames)
+		# banks[0] - кадры вправо, banks[1] - кадры влево
+		self.banks = (self.frames, self.flipped_frames)
+		self.frame_duration = frame_duration
+
+	def __len__(self):
+		return len(self.frames)
+
+	def __getitem__(self, index):
+		return self.frames[index]
+
+	def frame(self, index, flipped=False):
+		"""Получение кадра с учётом направления"""
+		return self.banks[flipped][index]
+
+	@classmethod
+	def from_names(cls, names, frame_duration, with_alpha=True):
+		"""Создание анимации из имён спрайтов"""
+		return cls([load_sprite(name, with_alpha) for name in names], frame_duration)
+
+
+class AnimationSet:
+	"""Класс набора анимаций, общего для всех объектов одного типа.
+
+	Набор создаётся один раз на тип сущности, а каждый объект хранит только
+	имя текущей анимации, индекс кадра и таймер."""
+	__slots__ = ('_animations',)
+
+	def __init__(self, animations: dict):
+		self._animations = dict(animations)
+
+	def __getitem__(self, name) -> Animation:
+		return self._animations[name]
+
+	def __contains__(self, name):
+		return name in self._animations
+
+	def names(self):
+		return tuple(self._animations)
+
+
+_animation_sets = {}
+
+
+def get_animation_set(key, builder) -> AnimationSet:
+	"""Получение набора анимаций по ключу; builder вызывается только при первом обращении"""
+	animation_set = _animation_sets.get(key)
+	if animation_set is None:
+		animation_set = builder()
+		_animation_sets[key] = animation_set
+	return animation_set
+
+
+def _on_sprite_cache_invalidated(name):
+	"""Сброс наборов анимаций при инвалидации кэша спрайтов"""
+	_animation_sets.clear()
+
+
+sprite_cache.add_invalidation_callback(_on_sprite_cache_invalidated)
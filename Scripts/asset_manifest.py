@@ -0,0 +1,69 @@
+from asset_preloader import SpriteAsset, ImageAsset, DataAsset, FontAsset
+from utils import get_atlas_index, get_atlas_entry
+from text_cache import size_steps
+from player import PLAYER_IDLE_SPRITE_NAMES, PLAYER_MOVE_SPRITE_NAMES, PLAYER_DIE_SPRITE_NAMES
+from enemy import SLIME_SPRITE_NAMES
+from weapon import PROJECTILE_SPRITE_NAME, PISTOL_IDLE_SPRITE_NAME, DOT_SPRITE_PATH
+from weapon_stats import WEAPON_STATS
+from upgrades_list import UPGRADES
+from constants import (
+	MENU_MUSIC_PATH, GAME_MUSIC_PATH, WAVE_INTRO_MIN_FONT_SIZE, WAVE_INTRO_MAX_FONT_SIZE,
+	GAME_OVER_MAX_FONT_SIZE
+)
+from UI.upgrade_box import UPGRADE_WINDOW_PATH
+
+# Кнопки интерфейса (пути от корня проекта, как в Button)
+UI_BUTTON_PATHS = [
+	f"UI/ui_sprites/{name}_button_{state}.png"
+	for name in ('play', 'settings', 'close', 'resume')
+	for state in ('unpressed', 'pressed')
+] + ["UI/ui_sprites/pause_button.png"]
+
+
+# Размеры шрифтов интерфейса (кнопки, меню, окна улучшений, HUD)
+UI_FONT_SIZES = [22, 24, 30, 40, 48, 74]
+
+
+def _font_sizes():
+	"""Размеры шрифтов интерфейса и все ступени размеров анимированных заголовков"""
+	sizes = list(UI_FONT_SIZES)
+	sizes += size_steps(WAVE_INTRO_MIN_FONT_SIZE, WAVE_INTRO_MAX_FONT_SIZE)
+	sizes += size_steps(GAME_OVER_MAX_FONT_SIZE * 0.8, GAME_OVER_MAX_FONT_SIZE)
+	sizes.append(GAME_OVER_MAX_FONT_SIZE)
+	return sorted(set(sizes))
+
+
+def _melee_sprite_names():
+	"""Имена спрайтов оружия ближнего боя из WEAPON_STATS"""
+	names = []
+	for stats in WEAPON_STATS.values():
+		if stats.get('type') != 'melee':
+			continue
+		names.append(stats['idle_sprite_name'])
+		names.extend(stats['attack_sprite_pattern'].format(i) for i in range(1, stats['attack_sprite_count'] + 1))
+	return names
+
+
+def build_asset_manifest():
+	"""Список ресурсов, которые загружаются до показа главного меню"""
+	sprite_names = (PLAYER_IDLE_SPRITE_NAMES + PLAYER_MOVE_SPRITE_NAMES + PLAYER_DIE_SPRITE_NAMES
+	                + SLIME_SPRITE_NAMES + _melee_sprite_names()
+	                + [PISTOL_IDLE_SPRITE_NAME, PROJECTILE_SPRITE_NAME])
+	image_paths = UI_BUTTON_PATHS + [DOT_SPRITE_PATH, UPGRADE_WINDOW_PATH]
+	image_paths += [upgrade['icon'] for upgrade in UPGRADES.values() if upgrade.get('icon')]
+
+	# Спрайты из атласа не загружаются по отдельности: достаточно загрузить его страницы
+	atlas = get_atlas_index()
+	atlas_pages = []
+	for entry in [atlas.get(name) for name in sprite_names] + [get_atlas_entry(path) for path in image_paths]:
+		if entry is not None and entry[0] not in atlas_pages:
+			atlas_pages.append(entry[0])
+	manifest = [ImageAsset(page) for page in atlas_pages]
+	manifest.extend(SpriteAsset(name) for name in sprite_names if name not in atlas)
+	# Фон без прозрачности загружается через convert
+	manifest.append(SpriteAsset("grass", with_alpha=False))
+	manifest.extend(ImageAsset(path) for path in image_paths if get_atlas_entry(path) is None)
+	manifest.extend(DataAsset(path) for path in (MENU_MUSIC_PATH, GAME_MUSIC_PATH))
+	# Шрифты создаются заранее, чтобы анимации заголовков не создавали их во время игры
+	manifest.extend(FontAsset(size) for size in _font_sizes())
+	return manifest
@@ -0,0 +1,154 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from pygame.image import load
+
+from utils import (
+	sprite_cache, image_cache, convert_surface, store_asset_data, has_asset_data,
+	_sprite_path, _asset_path
+)
+from text_cache import text_cache
+from constants import ASSET_LOADER_WORKERS, ASSET_CONVERT_BUDGET_MS
+
+
+class SpriteAsset:
+	"""Спрайт из папки Sprites (по имени, как в load_sprite)"""
+	def __init__(self, name, with_alpha=True):
+		self.name = name
+		self.with_alpha = with_alpha
+
+	def is_loaded(self):
+		return sprite_cache.contains(self.name, self.with_alpha)
+
+	def decode(self):
+		"""Чтение и декодирование файла (в рабочем потоке)"""
+		return load(_sprite_path(self.name))
+
+	def finish(self, surface):
+		"""Конвертация пикселей и сохранение в кэш (в основном потоке)"""
+		sprite_cache.put(self.name, convert_surface(surface, self.with_alpha), self.with_alpha)
+
+
+class ImageAsset:
+	"""Изображение интерфейса (по пути от корня проекта, как в load_image)"""
+	def __init__(self, path, with_alpha=True):
+		self.name = path
+		self.with_alpha = with_alpha
+
+	def is_loaded(self):
+		return image_cache.contains(self.name, self.with_alpha)
+
+	def decode(self):
+		"""Чтение и декодирование файла (в рабочем потоке)"""
+		return load(_asset_path(self.name))
+
+	def finish(self, surface):
+		"""Конвертация пикселей и сохранение в кэш (в основном потоке)"""
+		image_cache.put(self.name, convert_surface(surface, self.with_alpha), self.with_alpha)
+
+
+class DataAsset:
+	"""Файл, который целиком читается в память (музыка)"""
+	def __init__(self, path):
+		self.name = path
+
+	def is_loaded(self):
+		return has_asset_data(self.name)
+
+	def decode(self):
+		"""Чтение файла (в рабочем потоке)"""
+		with open(_asset_path(self.name), 'rb') as file:
+			return file.read()
+
+	def finish(self, data):
+		store_asset_data(self.name, data)
+
+
+class FontAsset:
+	"""Шрифт заданного размера в кэше текста"""
+	def __init__(self, size, font_name=None):
+		self.name = f"font:{font_name or 'default'}:{size}"
+		self.size = size
+		self.font_name = font_name
+
+	def is_loaded(self):
+		return text_cache.has_font(self.size, self.font_name)
+
+	def decode(self):
+		return None
+
+	def finish(self, _):
+		"""Создание шрифта (в основном потоке, как и вся работа с pygame.font)"""
+		text_cache.get_font(self.size, self.font_name)
+
+
+class AssetPreloader:
+	"""Класс фоновой загрузки ресурсов из манифеста.
+
+	Чтение и декодирование файлов идёт в пуле потоков, а конвертация пикселей
+	(convert/convert_alpha требуют основного потока и окна) - в update, небольшими
+	порциями не дольше convert_budget_ms за вызов, чтобы экран загрузки не замирал.
+	Ресурсы, которые не удалось загрузить, пропускаются: при обращении к ним
+	сработает обычная загрузка с её обработкой ошибок."""
+	def __init__(self, manifest, workers=ASSET_LOADER_WORKERS, convert_budget_ms=ASSET_CONVERT_BUDGET_MS):
+		self.manifest = list(manifest)
+		self.workers = workers
+		self.convert_budget = convert_budget_ms / 1000
+		self.total = len(self.manifest)
+		self.completed = 0
+		self.errors = []
+		self._executor = None
+		self._pending = deque()
+
+	def start(self):
+		"""Запуск чтения файлов в рабочих потоках"""
+		if self._executor is not None:
+			return
+		self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='asset-loader')
+		for asset in self.manifest:
+			if asset.is_loaded():
+				self.completed += 1
+			else:
+				self._pending.append((asset, self._executor.submit(asset.decode)))
+		if not self._pending:
+			self._shutdown()
+
+	def update(self):
+		"""Обработка прочитанных файлов в пределах бюджета времени; возвращает прогресс"""
+		if self._executor is None:
+			self.start()
+		deadline = perf_counter() + self.convert_budget
+		# Ресурсы обрабатываются по порядку манифеста, чтобы прогресс рос равномерно
+		while self._pending and self._pending[0][1].done():
+			asset, future = self._pending.popleft()
+			try:
+				asset.finish(future.result())
+			except Exception as e:
+				self.errors.append((asset.name, e))
+			self.completed += 1
+			if perf_counter() >= deadline:
+				break
+		if not self._pending:
+			self._shutdown()
+		return self.progress
+
+	def wait(self):
+		"""Загрузка всех ресурсов с блокировкой (без экрана загрузки)"""
+		while not self.finished:
+			if self._pending:
+				self._pending[0][1].result()
+			self.update()
+
+	def _shutdown(self):
+		if self._executor is not None:
+			self._executor.shutdown(wait=False)
+
+	@property
+	def progress(self):
+		"""Доля загруженных ресурсов от 0 до 1"""
+		return self.completed / self.total if self.total else 1.0
+
+	@property
+	def finished(self):
+		return self._executor is not None and not self._pending
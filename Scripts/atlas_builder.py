@@ -0,0 +1,147 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+
+# Добавляем корневую директорию проекта и папку Scripts в sys.path
+dir_scripts = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(dir_scripts, '..'))
+for path in (dir_scripts, project_root):
+	if path not in sys.path:
+		sys.path.append(path)
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+
+from constants import ATLAS_DIR, ATLAS_INDEX_NAME, ATLAS_PAGE_SIZE, ATLAS_MAX_SPRITE_SIZE, ATLAS_PADDING
+
+ATLAS_INDEX_VERSION = 1
+EXIT_OK = 0
+EXIT_STALE = 1
+
+
+def _file_digest(path):
+	"""Хэш содержимого файла для проверки актуальности атласа"""
+	with open(path, 'rb') as file:
+		return hashlib.sha1(file.read()).hexdigest()
+
+
+def collect_sprites(sprites_dir, atlas_dir, max_size=ATLAS_MAX_SPRITE_SIZE):
+	"""Поиск спрайтов для атласа: {имя как в load_sprite: путь к файлу}.
+
+	Крупные изображения (фон, окна интерфейса) в атлас не кладутся."""
+	sprites = {}
+	for directory, subdirectories, files in os.walk(sprites_dir):
+		subdirectories.sort()
+		if os.path.abspath(directory).startswith(os.path.abspath(atlas_dir)):
+			continue
+		for file_name in sorted(files):
+			if not file_name.lower().endswith('.png'):
+				continue
+			path = os.path.join(directory, file_name)
+			width, height = pygame.image.load(path).get_size()
+			if width > max_size or height > max_size:
+				continue
+			name = os.path.relpath(path, sprites_dir)[:-len('.png')].replace(os.sep, '/')
+			sprites[name] = path
+	return sprites
+
+
+def pack(sizes, page_size=ATLAS_PAGE_SIZE, padding=ATLAS_PADDING):
+	"""Упаковка прямоугольников полками: {имя: (страница, x, y)}.
+
+	Спрайты сортируются по убыванию высоты и раскладываются слева направо;
+	когда строка заполнена, начинается новая полка, когда заполнена страница - новая страница."""
+	placements = {}
+	page = x = y = shelf_height = 0
+	for name, (width, height) in sorted(sizes.items(), key=lambda item: (-item[1][1], -item[1][0], item[0])):
+		if x + width > page_size:
+			x = 0
+			y += shelf_height + padding
+			shelf_height = 0
+		if y + height > page_size:
+			page += 1
+			x = y = shelf_height = 0
+		placements[name] = (page, x, y)
+		x += width + padding
+		shelf_height = max(shelf_height, height)
+	return placements
+
+
+def build_atlas(sprites_dir, atlas_dir, page_size=ATLAS_PAGE_SIZE, padding=ATLAS_PADDING):
+	"""Сборка страниц атласа и индекса; возвращает индекс"""
+	sprites = collect_sprites(sprites_dir, atlas_dir)
+	surfaces = {name: pygame.image.load(path) for name, path in sprites.items()}
+	placements = pack({name: surface.get_size() for name, surface in surfaces.items()}, page_size, padding)
+
+	page_count = max((page for page, _, _ in placements.values()), default=-1) + 1
+	pages = []
+	for page in range(page_count):
+		# Страница обрезается по занятой области, чтобы не хранить пустое место
+		used = [(x + surfaces[name].get_width(), y + surfaces[name].get_height())
+		        for name, (sprite_page, x, y) in placements.items() if sprite_page == page]
+		width = max(right for right, _ in used)
+		height = max(bottom for _, bottom in used)
+		pages.append(pygame.Surface((width, height), pygame.SRCALPHA, 32))
+
+	index = {'version': ATLAS_INDEX_VERSION, 'pages': [], 'sprites': {}}
+	for name in sorted(placements):
+		page, x, y = placements[name]
+		surface = surfaces[name]
+		pages[page].blit(surface, (x, y))
+		index['sprites'][name] = {
+			'page': page,
+			'rect': [x, y, surface.get_width(), surface.get_height()],
+			'sha1': _file_digest(sprites[name]),
+		}
+
+	os.makedirs(atlas_dir, exist_ok=True)
+	for page, surface in enumerate(pages):
+		file_name = f"atlas_{page}.png"
+		pygame.image.save(surface, os.path.join(atlas_dir, file_name))
+		index['pages'].append(file_name)
+	with open(os.path.join(atlas_dir, ATLAS_INDEX_NAME), 'w', encoding='utf-8') as file:
+		json.dump(index, file, indent=1, sort_keys=True)
+		file.write("\n")
+	return index
+
+
+def find_stale(sprites_dir, atlas_dir):
+	"""Список спрайтов, которые добавлены, удалены или изменены после сборки атласа"""
+	index_path = os.path.join(atlas_dir, ATLAS_INDEX_NAME)
+	sprites = collect_sprites(sprites_dir, atlas_dir)
+	if not os.path.exists(index_path):
+		return sorted(sprites)
+	with open(index_path, encoding='utf-8') as file:
+		packed = json.load(file)['sprites']
+	stale = [name for name in packed if name not in sprites]
+	stale += [name for name, path in sprites.items()
+	          if name not in packed or packed[name]['sha1'] != _file_digest(path)]
+	return sorted(stale)
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Pack small sprites into texture atlas pages")
+	parser.add_argument('--sprites', default=os.path.join(project_root, 'Sprites'), help="sprite directory")
+	parser.add_argument('--output', default=os.path.join(project_root, ATLAS_DIR), help="atlas directory")
+	parser.add_argument('--page-size', type=int, default=ATLAS_PAGE_SIZE)
+	parser.add_argument('--check', action='store_true', help="only check that the atlas is up to date")
+	args = parser.parse_args()
+
+	if args.check:
+		stale = find_stale(args.sprites, args.output)
+		if stale:
+			print("Atlas is out of date, rebuild with atlas_builder.py:\n  " + "\n  ".join(stale), file=sys.stderr)
+			return EXIT_STALE
+		print("Atlas is up to date")
+		return EXIT_OK
+
+	index = build_atlas(args.sprites, args.output, args.page_size)
+	print(f"Packed {len(index['sprites'])} sprites into {len(index['pages'])} page(s) in {args.output}")
+	return EXIT_OK
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -1,5 +1,11 @@
+import io
+import os
 import pygame
 
+from profiler import profiler
+from utils import has_asset_data, load_asset_data
+from constants import MENU_MUSIC_PATH, GAME_MUSIC_PATH
+
 class AudioManager:
     def __init__(self):
         pygame.mixer.init()
@@ -7,19 +13,31 @@ class AudioManager:
         self.master_volume = 0.2
         self.game_volume_multiplier = 0.5
         
-        self.menu_music = "Audio/main_menu_music.mp3"
-        self.game_music = "Audio/in_game_music.mp3"
+        self.menu_music = MENU_MUSIC_PATH
+        self.game_music = GAME_MUSIC_PATH
+        # Поток с данными текущей музыки должен жить, пока она играет
+        self.music_stream = None
+        
+    def _load_music(self, path):
+        """Загрузка музыки; предзагруженный файл читается из памяти, а не с диска"""
+        with profiler.section('music_load'):
+            if has_asset_data(path):
+                self.music_stream = io.BytesIO(load_asset_data(path))
+                pygame.mixer.music.load(self.music_stream, os.path.splitext(path)[1][1:])
+            else:
+                self.music_stream = None
+                pygame.mixer.music.load(path)
         
     def play_menu_music(self):
         if self.current_music != self.menu_music:
-            pygame.mixer.music.load(self.menu_music)
+            self._load_music(self.menu_music)
             pygame.mixer.music.play(-1)
             pygame.mixer.music.set_volume(self.master_volume)
             self.current_music = self.menu_music
             
     def play_game_music(self):
         if self.current_music != self.game_music:
-            pygame.mixer.music.load(self.game_music)
+            self._load_music(self.game_music)
             pygame.mixer.music.set_volume(self.master_volume * self.game_volume_multiplier)
             self.current_music = self.game_music
             
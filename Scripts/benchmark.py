@@ -0,0 +1,283 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import subprocess
+
+# Добавляем корневую директорию проекта и папку Scripts в sys.path
+dir_scripts = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(dir_scripts, '..'))
+for path in (dir_scripts, project_root):
+	if path not in sys.path:
+		sys.path.append(path)
+
+# Приветствие pygame не должно попадать в JSON-вывод
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+from pygame.math import Vector2
+
+from headless import HeadlessRunner
+from input_source import StubInput
+from profiler import profiler
+from enemy_swarm import NUMPY_AVAILABLE
+from constants import ENEMY_BACKEND, SLIME_BASE_HP, SLIME_BASE_DAMAGE
+
+try:
+	import resource
+	RESOURCE_AVAILABLE = True
+except ImportError:
+	RESOURCE_AVAILABLE = False
+
+BENCHMARK_SEED = 1234
+# Здоровье и мана игрока в сценариях, чтобы он не погиб и не остался без патронов
+BENCHMARK_PLAYER_POOL = 10 ** 9
+
+
+class Scenario:
+	"""Класс сценария нагрузочного теста.
+
+	setup(runner, rng) вызывается один раз после создания игры, drive(runner, rng)
+	- перед каждым тиком. Первые warmup тиков не попадают в замеры."""
+	def __init__(self, name, ticks, weapon='ranged', setup=None, drive=None,
+	             auto_fire=False, warmup=30, stop_when_finished=False):
+		self.name = name
+		self.ticks = ticks
+		self.weapon = weapon
+		self.setup = setup
+		self.drive = drive
+		self.auto_fire = auto_fire
+		self.warmup = warmup
+		self.stop_when_finished = stop_when_finished
+
+
+def _make_invulnerable(game):
+	"""Игрок не погибает и не тратит ману до конца сценария"""
+	player = game.player
+	player.max_hp = player.hp = BENCHMARK_PLAYER_POOL
+	player.max_mana = player.current_mana = BENCHMARK_PLAYER_POOL
+
+
+def _spawn_slimes(game, count, rng, min_radius=100, max_radius=600):
+	"""Создание слаймов в кольце вокруг игрока"""
+	player = game.player
+	for _ in range(count):
+		offset = Vector2(rng.uniform(min_radius, max_radius), 0).rotate(rng.uniform(0, 360))
+		enemy = game.spawner.enemy_factory(position=player.position + offset, target=player,
+		                                   hp=SLIME_BASE_HP, damage=SLIME_BASE_DAMAGE)
+		game.game_state.add_enemy(enemy)
+
+
+def _freeze_waves(game):
+	"""Отключение спаунера и опыта, чтобы число врагов менялось только сценарием"""
+	game.spawner.active = False
+	game.player.xp_multiplier = 0
+	_make_invulnerable(game)
+
+
+def _world_to_screen(camera, position):
+	"""Перевод мировых координат в координаты экрана"""
+	return (int((position.x - camera.camera.x) * camera.zoom),
+	        int((position.y - camera.camera.y) * camera.zoom))
+
+
+def _slime_horde(count, ticks):
+	"""Сценарий с count слаймами вокруг неподвижного игрока"""
+	def setup(runner, rng):
+		_freeze_waves(runner.game)
+		_spawn_slimes(runner.game, count, rng)
+	return Scenario(f'slimes_{count}', ticks, setup=setup)
+
+
+def _setup_barrage(runner, rng):
+	_freeze_waves(runner.game)
+
+
+def _drive_barrage(runner, rng, live_projectiles=1000, shots_per_tick=40):
+	"""Стрельба из пистолета, пока в воздухе не окажется live_projectiles снарядов"""
+	game = runner.game
+	weapon = game.player.active_weapon
+	for _ in range(shots_per_tick):
+		if len(game.projectiles) >= live_projectiles:
+			break
+		target = game.player.position + Vector2(100, 0).rotate(rng.uniform(0, 360))
+		weapon.cooldown_timer = 0
+		weapon.attack(target, game.game_state)
+
+
+def _setup_melee(runner, rng):
+	_freeze_waves(runner.game)
+	_spawn_slimes(runner.game, 500, rng, 30, 200)
+
+
+def _drive_melee(runner, rng, slime_count=500):
+	"""Удары мечом по кругу; погибшие слаймы заменяются новыми"""
+	game = runner.game
+	if len(game.enemies) < slime_count:
+		_spawn_slimes(game, slime_count - len(game.enemies), rng, 30, 200)
+	angle = (runner.ticks * 37) % 360
+	target = game.player.position + Vector2(60, 0).rotate(angle)
+	runner.input_source.mouse_pos = _world_to_screen(game.camera, target)
+
+
+def _setup_full_run(runner, rng):
+	_make_invulnerable(runner.game)
+
+
+def _drive_full_run(runner, rng):
+	"""Прицеливание в ближайшего живого врага"""
+	game = runner.game
+	player_position = game.player.position
+	nearest = None
+	nearest_distance = None
+	for enemy in game.enemies:
+		if not enemy.alive:
+			continue
+		distance = (enemy.position - player_position).length_squared()
+		if nearest_distance is None or distance < nearest_distance:
+			nearest, nearest_distance = enemy, distance
+	if nearest is not None:
+		runner.input_source.mouse_pos = _world_to_screen(game.camera, nearest.position)
+
+
+SCENARIOS = {scenario.name: scenario for scenario in (
+	_slime_horde(500, 600),
+	_slime_horde(2000, 300),
+	_slime_horde(10000, 60),
+	Scenario('projectiles_1000', 600, setup=_setup_barrage, drive=_drive_barrage),
+	Scenario('melee_sweeps', 600, weapon='melee', setup=_setup_melee, drive=_drive_melee, auto_fire=True),
+	Scenario('full_run_5_waves', 60 * 60 * 10, setup=_setup_full_run, drive=_drive_full_run,
+	         auto_fire=True, warmup=0, stop_when_finished=True),
+)}
+
+
+def _peak_rss_mb():
+	"""Пиковый размер резидентной памяти процесса в мегабайтах (None, если недоступно)"""
+	if not RESOURCE_AVAILABLE:
+		return None
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	# Linux возвращает килобайты, macOS - байты
+	if sys.platform == 'darwin':
+		return peak / (1024 * 1024)
+	return peak / 1024
+
+
+def run_scenario(scenario, enemy_backend=ENEMY_BACKEND, render=True, ticks=None, seed=BENCHMARK_SEED):
+	"""Запуск сценария в текущем процессе; возвращает словарь с результатами"""
+	rng = random.Random(seed)
+	input_source = StubInput(mouse_pos=(0, 0), auto_fire=scenario.auto_fire)
+	runner = HeadlessRunner(scenario.weapon, enemy_backend=enemy_backend, input_source=input_source,
+	                        seed=seed, render=render)
+	if scenario.setup is not None:
+		scenario.setup(runner, rng)
+	ticks = ticks if ticks is not None else scenario.ticks
+
+	profiler.window = max(ticks, 1)
+	profiler.set_enabled(True)
+	measured_ticks = 0
+	start = None
+	for index in range(scenario.warmup + ticks):
+		if index == scenario.warmup:
+			# Замеры начинаются после прогрева
+			profiler.reset()
+			start = time.perf_counter()
+		if scenario.stop_when_finished and runner.is_finished():
+			break
+		if scenario.drive is not None:
+			scenario.drive(runner, rng)
+		runner.step()
+		if start is not None:
+			measured_ticks += 1
+	elapsed = time.perf_counter() - start if start is not None else 0.0
+	profiler.set_enabled(False)
+
+	game = runner.game
+	phases = {path: {'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99}
+	          for path, (p50, p95, p99) in profiler.get_stats().items()}
+	return {
+		'ticks': measured_ticks,
+		'elapsed_s': elapsed,
+		'ticks_per_second': measured_ticks / elapsed if elapsed > 0 else 0.0,
+		'phases': phases,
+		'peak_rss_mb': _peak_rss_mb(),
+		'enemies': len(game.enemies),
+		'projectiles': len(game.projectiles),
+		'wave': game.current_wave,
+		'game_won': game.is_game_won,
+	}
+
+
+def run_scenario_isolated(name, enemy_backend=ENEMY_BACKEND, render=True, ticks=None):
+	"""Запуск сценария в отдельном процессе, чтобы пиковая память не накапливалась между сценариями"""
+	command = [sys.executable, os.path.abspath(__file__), '--worker', name, '--backend', enemy_backend]
+	if not render:
+		command.append('--no-render')
+	if ticks is not None:
+		command.extend(['--ticks', str(ticks)])
+	env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1')
+	completed = subprocess.run(command, capture_output=True, text=True, env=env)
+	if completed.returncode != 0:
+		raise RuntimeError(f"Benchmark scenario '{name}' failed:\n{completed.stderr}")
+	# Результат - последняя строка вывода
+	return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def get_environment_info(enemy_backend, render):
+	"""Описание окружения, в котором получены результаты"""
+	return {
+		'python': platform.python_version(),
+		'pygame': pygame.version.ver,
+		'numpy': NUMPY_AVAILABLE,
+		'platform': platform.platform(),
+		'enemy_backend': enemy_backend,
+		'render': render,
+		'seed': BENCHMARK_SEED,
+	}
+
+
+def run_benchmarks(names=None, enemy_backend=ENEMY_BACKEND, render=True, ticks=None, isolate=True):
+	"""Запуск набора сценариев; возвращает отчёт в виде словаря"""
+	names = list(names) if names else list(SCENARIOS)
+	results = {}
+	for name in names:
+		if isolate:
+			results[name] = run_scenario_isolated(name, enemy_backend, render, ticks)
+		else:
+			results[name] = run_scenario(SCENARIOS[name], enemy_backend, render, ticks)
+	return {'environment': get_environment_info(enemy_backend, render), 'scenarios': results}
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Headless benchmark scenarios")
+	parser.add_argument('scenarios', nargs='*', metavar='SCENARIO',
+	                    help="scenarios to run (default: all): " + ", ".join(SCENARIOS))
+	parser.add_argument('--backend', choices=('objects', 'numpy'), default=ENEMY_BACKEND)
+	parser.add_argument('--no-render', dest='render', action='store_false', help="skip Game.draw")
+	parser.add_argument('--ticks', type=int, default=None, help="override the scenario tick count")
+	parser.add_argument('--no-isolate', dest='isolate', action='store_false',
+	                    help="run all scenarios in this process")
+	parser.add_argument('--output', metavar='PATH', help="write the JSON report to a file")
+	parser.add_argument('--worker', metavar='SCENARIO', help=argparse.SUPPRESS)
+	args = parser.parse_args()
+	unknown = [name for name in args.scenarios + [args.worker or ''] if name and name not in SCENARIOS]
+	if unknown:
+		parser.error("unknown scenario: " + ", ".join(unknown))
+
+	if args.worker:
+		result = run_scenario(SCENARIOS[args.worker], args.backend, args.render, args.ticks)
+		print(json.dumps(result))
+		return
+
+	report = run_benchmarks(args.scenarios, args.backend, args.render, args.ticks, args.isolate)
+	text = json.dumps(report, indent=2)
+	if args.output:
+		with open(args.output, 'w', encoding='utf-8') as file:
+			file.write(text + "\n")
+	print(text)
+
+
+if __name__ == '__main__':
+	main()
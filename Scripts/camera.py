@@ -9,15 +9,54 @@ class Camera:
 		self.height = height
 		self.zoom = zoom
 		self.camera = pygame.rect.Rect(0, 0, width, height)
-	
-	def apply(self, entity):
-		"""Применение камеры к объекту"""
-		screen_x = (entity.rect.x - self.camera.x) * self.zoom
-		screen_y = (entity.rect.y - self.camera.y) * self.zoom
+		# Доля шага симуляции, прошедшая после последнего обновления (1.0 - без интерполяции)
+		self.alpha = 1.0
+		self.previous_offset = None
+
+	def snapshot(self):
+		"""Запоминание положения камеры перед шагом симуляции"""
+		self.previous_offset = (self.camera.x, self.camera.y)
+
+	def set_interpolation(self, alpha):
+		"""Установка доли шага симуляции для интерполяции при отрисовке"""
+		self.alpha = alpha
+
+	def get_offset(self):
+		"""Получение смещения камеры с учётом интерполяции"""
+		if self.alpha >= 1.0 or self.previous_offset is None:
+			return self.camera.x, self.camera.y
+		previous_x, previous_y = self.previous_offset
+		return (previous_x + (self.camera.x - previous_x) * self.alpha,
+		        previous_y + (self.camera.y - previous_y) * self.alpha)
+
+	def get_motion_offset(self, entity):
+		"""Смещение объекта от текущей позиции к интерполированной"""
+		if self.alpha >= 1.0:
+			return 0.0, 0.0
+		previous = getattr(entity, 'previous_position', None)
+		if previous is None:
+			return 0.0, 0.0
+		position = entity.position
+		back = 1.0 - self.alpha
+		return (previous.x - position.x) * back, (previous.y - position.y) * back
+
+	def apply(self, entity, motion_source=None):
+		"""Применение камеры к объекту (motion_source - объект, движение которого интерполируется)"""
+		offset_x, offset_y = self.get_offset()
+		motion_x, motion_y = self.get_motion_offset(motion_source if motion_source is not None else entity)
+		screen_x = (entity.rect.x + motion_x - offset_x) * self.zoom
+		screen_y = (entity.rect.y + motion_y - offset_y) * self.zoom
 		screen_w = entity.rect.width * self.zoom
 		screen_h = entity.rect.height * self.zoom
 		return pygame.Rect(int(screen_x), int(screen_y), int(screen_w), int(screen_h))
 	
+	def get_view_rect(self, margin=0):
+		"""Видимая часть мира в мировых координатах с запасом margin с каждой стороны"""
+		width = self.width / self.zoom
+		height = self.height / self.zoom
+		return pygame.Rect(int(self.camera.x - margin), int(self.camera.y - margin),
+		                   int(width + 2 * margin) + 1, int(height + 2 * margin) + 1)
+	
 	def update(self, target):
 		"""Обновление камеры"""
 		x = target.rect.centerx - (self.width / 2.0) / self.zoom
@@ -4,7 +4,13 @@ ACCELERATION = 0.25
 WINDOW_WIDTH = 1920*0.7
 WINDOW_HEIGHT = 1080*0.7
 SPEED = 250
+# Максимальная частота отрисовки; симуляция идёт с фиксированным шагом SIMULATION_HZ
 FPS = 240
+# Частота обновления и отрисовки меню (им не нужна частота игры)
+MENU_FPS = 60
+SIMULATION_HZ = 60
+# Максимум шагов симуляции за кадр, чтобы после подвисания игра не уходила в догонялки
+MAX_SIMULATION_STEPS = 5
 BASE_DAMAGE = 60
 UP = Vector2(0, -1)
 
@@ -51,4 +57,84 @@ BASE_MAX_MANA = 50
 BASE_HP_BAR_WIDTH = 200
 BASE_MANA_BAR_WIDTH = 180
 MAX_HP_BAR_WIDTH = 400
-MAX_MANA_BAR_WIDTH = 360
\ No newline at end of file
+MAX_MANA_BAR_WIDTH = 360
+
+# Полоски здоровья над врагами
+ENTITY_HP_BAR_HEIGHT = 5
+ENTITY_HP_BAR_PADDING = 2
+ENTITY_HP_BAR_BG_COLOR = (128, 0, 0)
+ENTITY_HP_BAR_FG_COLOR = (0, 200, 0)
+
+SPRITE_CACHE_MAX_SIZE = 256
+SCALED_SPRITE_CACHE_MAX_SIZE = 512
+
+ENEMY_GRID_CELL_SIZE = 64
+# Запас вокруг поля зрения камеры (в мировых координатах), в котором объекты
+# считаются видимыми: отрисовываются и анимируются
+VIEW_CULLING_MARGIN = 64
+ROTATION_BUCKETS = 64
+PROJECTILE_POOL_CAPACITY = 1024
+
+# 'objects' - каждый враг отдельный объект, 'numpy' - векторизованная симуляция SlimeSwarm
+ENEMY_BACKEND = 'objects'
+
+# Запись ввода игровых сессий для воспроизведения в headless.py --replay
+RECORD_SESSIONS = False
+RECORDINGS_DIR = 'Recordings'
+
+# Профилировщик кадров: окно для перцентилей (в кадрах) и период обновления оверлея (сек)
+PROFILER_WINDOW = 300
+PROFILER_OVERLAY_REFRESH = 0.5
+
+# Запись трассировки кадров в формате Chrome Trace Event (chrome://tracing, Perfetto)
+TRACE_SESSIONS = False
+TRACES_DIR = 'Traces'
+
+# Проверка производительности (perf_gate.py): сценарии, повторы и допуски
+PERF_BASELINE_PATH = 'Benchmarks/perf_baseline.json'
+PERF_GATE_SCENARIOS = ('slimes_500', 'slimes_2000', 'projectiles_1000', 'melee_sweeps', 'full_run_5_waves')
+PERF_GATE_REPETITIONS = 5
+PERF_GATE_TOLERANCE = 0.10
+PERF_GATE_NOISE_FACTOR = 3.0
+PERF_GATE_MIN_DELTA_MS = 0.05
+# Перцентили времени фаз, которые сравниваются с эталоном (p99 - подвисания)
+PERF_GATE_PERCENTILES = ('p50_ms', 'p99_ms')
+
+# Музыка (пути от корня проекта)
+MENU_MUSIC_PATH = 'Audio/main_menu_music.mp3'
+GAME_MUSIC_PATH = 'Audio/in_game_music.mp3'
+
+# Предзагрузка ресурсов: потоки для чтения и декодирования файлов и время на
+# конвертацию пикселей в основном потоке за один кадр экрана загрузки (мс)
+ASSET_LOADER_WORKERS = 4
+ASSET_CONVERT_BUDGET_MS = 4.0
+
+# Атлас спрайтов (собирается atlas_builder.py): папка, размер страницы, предельный
+# размер спрайта, который ещё кладётся в атлас, и отступ между спрайтами (пиксели)
+ATLAS_DIR = 'Sprites/Atlas'
+ATLAS_INDEX_NAME = 'atlas.json'
+ATLAS_PAGE_SIZE = 1024
+ATLAS_MAX_SPRITE_SIZE = 256
+ATLAS_PADDING = 1
+
+# Кэш текста: число отрисованных надписей и шрифтов в памяти и шаг размера
+# шрифта, с которым рисуются анимированные заголовки (волна, проигрыш)
+TEXT_CACHE_MAX_SIZE = 256
+FONT_CACHE_MAX_SIZE = 64
+TEXT_SIZE_STEP = 4
+
+# Кэш готовых поверхностей кнопок интерфейса (спрайты в масштабе и с надписью)
+BUTTON_SURFACE_CACHE_MAX_SIZE = 128
+
+# Видео на фоне главного меню: файл, число кадров в кольцевом буфере декодера и
+# частота кадров, если видеофайл её не сообщает
+MENU_VIDEO_PATH = 'Videos/background_1.mp4'
+VIDEO_BUFFER_FRAMES = 4
+VIDEO_DEFAULT_FPS = 30.0
+
+# Кэш кадров видео меню на диске (необязательный): кадры размера окна декодируются
+# один раз и дальше проигрываются без кодека. Занимает около 3 МБ на кадр (около
+# 2.7 ГБ для текущего ролика), поэтому выключен по умолчанию и ограничен по размеру
+MENU_VIDEO_CACHE = False
+MENU_VIDEO_CACHE_DIR = 'Videos/Cache'
+VIDEO_CACHE_MAX_MB = 4096
@@ -1,16 +1,38 @@
 import pygame
 import sys
+import os
+import time
+import random
 
 from Scripts.game import Game
 from UI.ui_scenes.main_menu import MainMenu, ACTION_START_GAME, ACTION_OPEN_SETTINGS, ACTION_EXIT
 from UI.ui_scenes.settings_menu import SettingsMenu, ACTION_CLOSE_SETTINGS
 from UI.ui_scenes.weapon_selection_menu import WeaponSelectionMenu, ACTION_START_MELEE, ACTION_START_RANGED
-from Scripts.constants import WINDOW_WIDTH, WINDOW_HEIGHT, ACTION_NEW_GAME
+from UI.ui_scenes.loading_screen import LoadingScreen, ACTION_LOADING_FINISHED
+from Scripts.constants import (
+	WINDOW_WIDTH, WINDOW_HEIGHT, ACTION_NEW_GAME,
+	ENEMY_BACKEND, RECORD_SESSIONS, RECORDINGS_DIR,
+	FPS, MENU_FPS, SIMULATION_HZ, MAX_SIMULATION_STEPS,
+	TRACE_SESSIONS, TRACES_DIR
+)
 from Scripts.game_states import (
 	STATE_MAIN_MENU, STATE_SETTINGS_MENU, STATE_GAMEPLAY, 
-	STATE_EXIT, STATE_GO_TO_MENU, STATE_WEAPON_SELECTION
+	STATE_EXIT, STATE_GO_TO_MENU, STATE_WEAPON_SELECTION, STATE_LOADING
 )
 from Scripts.audio_manager import AudioManager
+from Scripts.input_source import PygameInput
+from Scripts.input_recording import InputRecorder
+from UI.profiler_overlay import ProfilerOverlay
+from profiler import profiler
+from trace_recorder import TraceRecorder
+from asset_preloader import AssetPreloader
+from asset_manifest import build_asset_manifest
+from scene_registry import SceneRegistry
+
+SIMULATION_DT = 1 / SIMULATION_HZ
+# Сцены меню обновляются с прежней частотой 60 Гц, а не с частотой отрисовки игры
+MENU_STATES = (STATE_MAIN_MENU, STATE_SETTINGS_MENU, STATE_WEAPON_SELECTION)
+PROFILER_TOGGLE_KEY = pygame.K_F3
 
 
 class GameController:
@@ -18,22 +40,50 @@ class GameController:
 	def __init__(self):
 		"""Инициализация игры"""
 		pygame.init()
+		if TRACE_SESSIONS:
+			# Трассировка подключается первой, чтобы в неё попала загрузка меню и музыки
+			trace_path = os.path.join(TRACES_DIR, time.strftime("trace_%Y%m%d_%H%M%S.json"))
+			profiler.attach_tracer(TraceRecorder(trace_path))
 		self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-		pygame.display.set_caption("Terra - Main Menu")
+		pygame.display.set_caption("Terra - Loading")
 		
 		self.clock = pygame.time.Clock()
-		self.current_state = STATE_MAIN_MENU
-		self.active_scene = MainMenu() 
-		self.settings_menu = None
-		self.weapon_selection_menu = None
-		self.game_instance = None
-		
 		self.audio_manager = AudioManager()
-		self.audio_manager.play_menu_music()
+		self.game_instance = None
+		self.input_recorder = None
+		# Время, накопленное для следующих шагов симуляции
+		self.accumulator = 0.0
+		# Оверлей профилировщика создаётся при первом включении (клавиша PROFILER_TOGGLE_KEY)
+		self.profiler_overlay = None
+
+		# Меню создаются один раз и переживают переходы; экран загрузки и игра - свои на каждый вход
+		self.scenes = SceneRegistry()
+		self.scenes.register(STATE_LOADING, lambda: LoadingScreen(AssetPreloader(build_asset_manifest())),
+		                     cached=False)
+		self.scenes.register(STATE_MAIN_MENU, MainMenu)
+		self.scenes.register(STATE_SETTINGS_MENU, SettingsMenu)
+		self.scenes.register(STATE_WEAPON_SELECTION, WeaponSelectionMenu)
+		self.scenes.register(STATE_GAMEPLAY, self._start_game, cached=False)
+		self.current_state = None
+		self.active_scene = None
+		# Ресурсы из манифеста загружаются до показа главного меню
+		self._switch_scene(STATE_LOADING, "Terra - Loading")
+
+	def _consume_simulation_steps(self, frame_time):
+		"""Накопление времени кадра и расчёт числа шагов симуляции фиксированной длины"""
+		self.accumulator += frame_time
+		steps = min(int(self.accumulator / SIMULATION_DT), MAX_SIMULATION_STEPS)
+		self.accumulator -= steps * SIMULATION_DT
+		if steps == MAX_SIMULATION_STEPS and self.accumulator >= SIMULATION_DT:
+			# Не догоняем отставание после подвисания: лишнее время отбрасывается
+			self.accumulator %= SIMULATION_DT
+		return steps
 
 	def run(self):
 		while self.current_state != STATE_EXIT:
-			dt = self.clock.tick(60) / 1000
+			# Частота отрисовки ограничена FPS (в меню - MENU_FPS), симуляция идёт фиксированными шагами SIMULATION_DT
+			frame_time = self.clock.tick(MENU_FPS if self.current_state in MENU_STATES else FPS) / 1000
+			profiler.begin_frame()
 			
 			events = pygame.event.get()
 			action = None
@@ -42,81 +92,116 @@ class GameController:
 				if event.type == pygame.QUIT:
 					self.current_state = STATE_EXIT
 					break
+				if event.type == pygame.KEYDOWN and event.key == PROFILER_TOGGLE_KEY:
+					self._toggle_profiler()
 					
 			if self.current_state == STATE_EXIT:
 				break
+
+			in_gameplay = self.current_state == STATE_GAMEPLAY
+			steps = self._consume_simulation_steps(frame_time) if in_gameplay else 0
 				
-			if self.active_scene:
-				if self.current_state == STATE_GAMEPLAY:
-					action = self.active_scene.handle_events(events) 
-				else:
-					action = self.active_scene.handle_events(events)
+			with profiler.section('events'):
+				if self.active_scene:
+					if in_gameplay:
+						dt = SIMULATION_DT
+						if self.input_recorder is not None:
+							# Запись ввода кадра до его обработки игрой
+							dt, steps, events = self.input_recorder.begin_frame(dt, steps, events)
+						action = self.active_scene.handle_events(events) 
+					else:
+						action = self.active_scene.handle_events(events)
 			
 			if action:
 				# Обработка действий
-				self._handle_action(action)
+				with profiler.section('action'):
+					self._handle_action(action)
 			
 			if self.active_scene and self.current_state != STATE_EXIT:
 				# Обновление сцены
-				self.active_scene.update(dt)
+				with profiler.section('update'):
+					if self.current_state == STATE_GAMEPLAY:
+						for _ in range(steps):
+							self.active_scene.update(SIMULATION_DT)
+						# Доля следующего шага для интерполяции позиций при отрисовке
+						self.active_scene.set_interpolation(self.accumulator / SIMULATION_DT)
+					else:
+						self.active_scene.update(frame_time)
 
 			if self.active_scene and self.current_state != STATE_EXIT:
 				# Отрисовка сцены
-				self.active_scene.draw(self.screen)
+				with profiler.section('draw'):
+					self.active_scene.draw(self.screen)
+			if self.profiler_overlay is not None:
+				self.profiler_overlay.draw(self.screen, frame_time)
 				
-			pygame.display.update()
+			with profiler.section('present'):
+				pygame.display.update()
+			profiler.end_frame()
 		
+		self._stop_recording()
+		self.scenes.close()
+		tracer = profiler.detach_tracer()
+		if tracer is not None:
+			tracer.close()
 		self.audio_manager.stop_music()
 		pygame.quit()
 		sys.exit()
 
+	def _toggle_profiler(self):
+		"""Включение или выключение профилировщика кадров и его оверлея"""
+		profiler.toggle()
+		if profiler.enabled and self.profiler_overlay is None:
+			self.profiler_overlay = ProfilerOverlay(profiler)
+
+	def _start_game(self, weapon_type):
+		"""Создание новой игры (с записью ввода, если она включена)"""
+		self._stop_recording()
+		self.accumulator = 0.0
+		if not RECORD_SESSIONS:
+			return Game(starting_weapon_type=weapon_type)
+		os.makedirs(RECORDINGS_DIR, exist_ok=True)
+		seed = random.randrange(2 ** 32)
+		path = os.path.join(RECORDINGS_DIR, time.strftime("session_%Y%m%d_%H%M%S.rec"))
+		self.input_recorder = InputRecorder(PygameInput(), path, seed, weapon_type, ENEMY_BACKEND)
+		return Game(starting_weapon_type=weapon_type, input_source=self.input_recorder, seed=seed)
+
+	def _stop_recording(self):
+		"""Завершение записи ввода текущей игры"""
+		if self.input_recorder is not None:
+			self.input_recorder.close(self.game_instance)
+			self.input_recorder = None
+
+	def _switch_scene(self, state, caption, **kwargs):
+		"""Переход на сцену состояния state (из кэша реестра или новую)"""
+		scene = self.scenes.switch(state, **kwargs)
+		scene.set_audio_manager(self.audio_manager)
+		self.active_scene = scene
+		self.current_state = state
+		pygame.display.set_caption(caption)
+		return scene
+
 	def _handle_action(self, action):
 		"""Обработка действий"""
-		if action == ACTION_START_GAME:
-			if not self.weapon_selection_menu:
-				self.weapon_selection_menu = WeaponSelectionMenu()
-				self.weapon_selection_menu.set_audio_manager(self.audio_manager)
-			self.active_scene = self.weapon_selection_menu
-			self.current_state = STATE_WEAPON_SELECTION
-			pygame.display.set_caption("Terra - Choose Weapon")
+		if self.current_state == STATE_GAMEPLAY:
+			self._stop_recording()
+		if action == ACTION_LOADING_FINISHED or action == STATE_GO_TO_MENU:
+			self._switch_scene(STATE_MAIN_MENU, "Terra - Main Menu")
+			self.audio_manager.play_menu_music()
+
+		elif action == ACTION_START_GAME or action == ACTION_NEW_GAME:
+			self._switch_scene(STATE_WEAPON_SELECTION, "Terra - Choose Weapon")
 
 		elif action == ACTION_START_MELEE or action == ACTION_START_RANGED:
 			weapon_type = 'melee' if action == ACTION_START_MELEE else 'ranged'
-			self.active_scene = Game(starting_weapon_type=weapon_type)
-			self.active_scene.set_audio_manager(self.audio_manager)
-			pygame.display.set_caption("Terra")
-			self.current_state = STATE_GAMEPLAY
+			self.game_instance = self._switch_scene(STATE_GAMEPLAY, "Terra", weapon_type=weapon_type)
 			self.audio_manager.play_game_music()
 
 		elif action == ACTION_OPEN_SETTINGS:
-			if not self.settings_menu:
-				self.settings_menu = SettingsMenu()
-				self.settings_menu.set_audio_manager(self.audio_manager)
-			self.active_scene = self.settings_menu
-			self.current_state = STATE_SETTINGS_MENU
-			pygame.display.set_caption("Terra - Settings")
+			self._switch_scene(STATE_SETTINGS_MENU, "Terra - Settings")
 		
 		elif action == ACTION_CLOSE_SETTINGS:
-			self.active_scene = MainMenu()
-			self.current_state = STATE_MAIN_MENU
-			pygame.display.set_caption("Terra - Main Menu")
+			self._switch_scene(STATE_MAIN_MENU, "Terra - Main Menu")
 		
 		elif action == ACTION_EXIT:
 			self.current_state = STATE_EXIT
-		
-		elif action == STATE_GO_TO_MENU:
-			self.active_scene = MainMenu()
-			self.active_scene.set_audio_manager(self.audio_manager)
-			self.current_state = STATE_MAIN_MENU
-			pygame.display.set_caption("Terra - Main Menu")
-			self.audio_manager.play_menu_music()
-		
-		elif action == ACTION_NEW_GAME:
-			if not self.weapon_selection_menu:
-				self.weapon_selection_menu = WeaponSelectionMenu()
-				self.weapon_selection_menu.set_audio_manager(self.audio_manager)
-			self.active_scene = self.weapon_selection_menu
-			self.current_state = STATE_WEAPON_SELECTION
-			pygame.display.set_caption("Terra - Choose Weapon")
-		else:
-			pass
\ No newline at end of file
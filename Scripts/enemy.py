@@ -2,9 +2,28 @@ import pygame
 from pygame.math import Vector2
 import math
 from game_object import GameObject
-from utils import load_sprite
+from animation import Animation, AnimationSet, get_animation_set
 from constants import SLIME_XP_REWARD, SLIME_BASE_HP, SLIME_BASE_DAMAGE
 import random
+
+# Имена кадров анимаций слайма (все слаймы используют одни и те же Surface из кэша)
+SLIME_MOVE_SPRITE_NAMES = [f"Enemies/Slime/Slime_run/slime_move_{i}" for i in range(1, 7)]
+SLIME_IDLE_SPRITE_NAMES = [f"Enemies/Slime/Slime_idle/slime_idle_{i}" for i in range(1, 5)]
+SLIME_DIE_SPRITE_NAMES = [f"Enemies/Slime/Slime_die/slime_die_{i}" for i in range(1, 6)]
+SLIME_SPRITE_NAMES = SLIME_MOVE_SPRITE_NAMES + SLIME_IDLE_SPRITE_NAMES + SLIME_DIE_SPRITE_NAMES
+
+def _build_slime_animations():
+	"""Создание набора анимаций слайма"""
+	return AnimationSet({
+		'move': Animation.from_names(SLIME_MOVE_SPRITE_NAMES, 0.2),
+		'idle': Animation.from_names(SLIME_IDLE_SPRITE_NAMES, 0.2),
+		'die': Animation.from_names(SLIME_DIE_SPRITE_NAMES, 0.2),
+	})
+
+def get_slime_animations():
+	"""Получение общего для всех слаймов набора анимаций"""
+	return get_animation_set('slime', _build_slime_animations)
+
 class NPCLogic:
 	
 	def __init__(self, target, speed=100, attack_range=50):
@@ -28,7 +47,7 @@ class NPCLogic:
 				direction.normalize_ip()
 			enemy.velocity = direction
 			enemy.position += direction * (self.speed * 0.5) * dt
-			enemy.rect.center = (int(enemy.position.x), int(enemy.position.y))
+			enemy.sync_position()
 			return
 		target_center = self.target.position
 		enemy_center = enemy.position
@@ -36,12 +55,12 @@ class NPCLogic:
 		distance = direction.length()
 		if enemy.attack_cooldown_timer > 0 and distance < self.attack_range:
 			enemy.velocity = Vector2(0, 0)
-			enemy.rect.center = (int(enemy.position.x), int(enemy.position.y))
+			enemy.sync_position()
 			return
 		if distance < (0.5 * self.attack_range) and enemy.attack_cooldown_timer <= 0 and not enemy.is_attacking:
 			enemy.attack()
 			enemy.velocity = Vector2(0, 0)
-			enemy.rect.center = (int(enemy.position.x), int(enemy.position.y))
+			enemy.sync_position()
 			return
 		if distance != 0:
 			direction.normalize_ip()
@@ -49,7 +68,7 @@ class NPCLogic:
 			enemy.position += direction * self.speed * dt
 		else:
 			enemy.velocity = Vector2(0, 0)
-		enemy.rect.center = (int(enemy.position.x), int(enemy.position.y))
+		enemy.sync_position()
 class Enemy(GameObject):
 	
 	def __init__(self, position, sprite, damage=10, speed=100, hp=100, attack_range=50, target=None, xp_reward=0):
@@ -70,10 +89,23 @@ class Enemy(GameObject):
 		self.knockback_recovery_timer = 0.0
 		self.knockback_velocity = Vector2(0, 0)
 		self.knockback_timer = 0.0
+		self.spatial_index = None
+		# Генератор случайных чисел игры (задаётся GameState при добавлении врага)
+		self.rng = random
+		# Множество врагов в поле зрения камеры (задаётся GameState); None - враг всегда видим
+		self.visible_enemies = None
+	def is_on_screen(self):
+		"""Проверка, находится ли враг в поле зрения камеры"""
+		return self.visible_enemies is None or self in self.visible_enemies
+	def sync_position(self):
+		"""Синхронизация rect и ячейки в пространственной сетке с позицией"""
+		self.rect.center = (int(self.position.x), int(self.position.y))
+		if self.spatial_index is not None:
+			self.spatial_index.update(self)
 	def update(self, dt):
 		if self.knockback_timer > 0:
 			self.position += self.knockback_velocity * dt
-			self.rect.center = (int(self.position.x), int(self.position.y))
+			self.sync_position()
 			self.knockback_timer -= dt
 			if self.knockback_timer <= 0:
 				self.knockback_velocity = Vector2(0, 0)
@@ -88,13 +120,13 @@ class Enemy(GameObject):
 					if self.position.distance_to(target_pos) < self.npc_logic.attack_range:
 						self.npc_logic.target.take_damage(self.damage)
 				self.attack_cooldown_timer = self.attack_cooldown
-			self.rect.center = (int(self.position.x), int(self.position.y))
+			self.sync_position()
 			return
 		if self.attack_cooldown_timer > 0:
 			self.attack_cooldown_timer -= dt
 		if self.npc_logic and self.npc_logic.target:
 			self.npc_logic.update(self, dt)
-		self.rect.center = (int(self.position.x), int(self.position.y))
+		self.sync_position()
 	def attack(self):
 		if not self.is_attacking:
 			self.is_attacking = True
@@ -113,7 +145,7 @@ class Enemy(GameObject):
 		if direction.length_squared() > 0:
 			push_direction = direction.normalize()
 		else:
-			push_direction = Vector2(random.uniform(-1, 1), random.uniform(-1, 1)).normalize()
+			push_direction = Vector2(self.rng.uniform(-1, 1), self.rng.uniform(-1, 1)).normalize()
 		knockback_speed = strength * 100
 		knockback_duration = 0.2
 		self.knockback_velocity = push_direction * knockback_speed
@@ -123,7 +155,8 @@ class Enemy(GameObject):
 class Slime(Enemy):
 	
 	def __init__(self, position, target, hp=SLIME_BASE_HP, damage=SLIME_BASE_DAMAGE):
-		sprite = load_sprite("Enemies/Slime/Slime_idle/slime_idle_1", with_alpha=True)
+		animations = get_slime_animations()
+		sprite = animations['idle'][0]
 		super().__init__(position, sprite,
 					 damage=damage,
 					 speed=120,
@@ -131,44 +164,34 @@ class Slime(Enemy):
 					 attack_range=30,
 					 target=target,
 					 xp_reward=SLIME_XP_REWARD)
-		self.slime_move_sprites = [
-			load_sprite("Enemies/Slime/Slime_run/slime_move_1"),
-			load_sprite("Enemies/Slime/Slime_run/slime_move_2"),
-			load_sprite("Enemies/Slime/Slime_run/slime_move_3"),
-			load_sprite("Enemies/Slime/Slime_run/slime_move_4"),
-			load_sprite("Enemies/Slime/Slime_run/slime_move_5"),
-			load_sprite("Enemies/Slime/Slime_run/slime_move_6"),
-		]
-		self.slime_idle_sprites = [
-			load_sprite("Enemies/Slime/Slime_idle/slime_idle_1"),
-			load_sprite("Enemies/Slime/Slime_idle/slime_idle_2"),
-			load_sprite("Enemies/Slime/Slime_idle/slime_idle_3"),
-			load_sprite("Enemies/Slime/Slime_idle/slime_idle_4"),
-		]
+		# Кадры хранятся в общем наборе анимаций, у слайма только индекс кадра и таймер
+		self.animations = animations
 		self.last_direction = Vector2(1, 0)
 		self.current_sprite_index = 0
-		self.current_slime_animation = self.slime_move_sprites
-		self.previous_animation = self.current_slime_animation
-		self.animation_speed = 0.2
+		self.current_slime_animation = animations['move']
 		self.animation_timer = 0
-		self.death_sprites = [
-			load_sprite("Enemies/Slime/Slime_die/slime_die_1"),
-			load_sprite("Enemies/Slime/Slime_die/slime_die_2"),
-			load_sprite("Enemies/Slime/Slime_die/slime_die_3"),
-			load_sprite("Enemies/Slime/Slime_die/slime_die_4"),
-			load_sprite("Enemies/Slime/Slime_die/slime_die_5"),
-		]
 		self.dying = False
 		self.death_timer = 0.0
 		self.death_frame_index = 0
-		self.death_frame_duration = 0.2
 		self.time_since_last_frame = 0.0
 		self.removal_delay = 5.0
+	def _advance_animation(self):
+		"""Переход к следующему кадру анимации.
+
+		Вне поля зрения камеры таймер только накапливается, поэтому при
+		появлении в кадре анимация перематывается на все пропущенные кадры."""
+		animation = self.current_slime_animation
+		frames = int(self.animation_timer // animation.frame_duration)
+		self.animation_timer = 0
+		self.current_sprite_index = (self.current_sprite_index + frames) % len(animation)
+		self.sprite = animation.frame(self.current_sprite_index, self.last_direction.x < 0)
+		self.rect.width = self.sprite.get_width()
+		self.rect.height = self.sprite.get_height()
 	def die(self):
 		self.dying = True
 		self.death_timer = 0.0
 		self.death_frame_index = 0
-		self.sprite = self.death_sprites[0]
+		self.sprite = self.animations['die'][0]
 		try:
 			if self.npc_logic and self.npc_logic.target and not self.npc_logic.target.is_dying:
 				xp_to_grant = self.xp_reward * self.npc_logic.target.xp_multiplier
@@ -179,7 +202,7 @@ class Slime(Enemy):
 	def update(self, dt):
 		if self.knockback_timer > 0:
 			self.position += self.knockback_velocity * dt
-			self.rect.center = (int(self.position.x), int(self.position.y))
+			self.sync_position()
 			self.knockback_timer -= dt
 			if self.knockback_timer <= 0:
 				self.knockback_velocity = Vector2(0, 0)
@@ -187,27 +210,23 @@ class Slime(Enemy):
 		if self.dying:
 			self.death_timer += dt
 			self.time_since_last_frame += dt
-			if self.death_frame_index < len(self.death_sprites):
-				if self.time_since_last_frame >= self.death_frame_duration:
+			death_animation = self.animations['die']
+			if self.death_frame_index < len(death_animation) and self.is_on_screen():
+				if self.time_since_last_frame >= death_animation.frame_duration:
+					frames = int(self.time_since_last_frame // death_animation.frame_duration)
 					self.time_since_last_frame = 0
-					self.death_frame_index += 1
-					if self.death_frame_index < len(self.death_sprites):
-						self.sprite = self.death_sprites[self.death_frame_index]
+					self.death_frame_index = min(self.death_frame_index + frames, len(death_animation))
+					self.sprite = death_animation[min(self.death_frame_index, len(death_animation) - 1)]
 			if self.death_timer >= self.removal_delay:
 				self.should_be_removed = True
 			return
 		if self.is_attacking:
 			self.velocity = Vector2(0, 0)
 			self.attack_windup_timer -= dt
-			self.current_slime_animation = self.slime_idle_sprites
+			self.current_slime_animation = self.animations['idle']
 			self.animation_timer += dt
-			if self.animation_timer >= self.animation_speed:
-				self.animation_timer = 0
-				self.current_sprite_index = (self.current_sprite_index + 1) % len(self.current_slime_animation)
-				self.sprite = self.current_slime_animation[self.current_sprite_index]
-				if self.last_direction.x < 0:
-					self.sprite = pygame.transform.flip(self.sprite, True, False)
-				self.rect.size = self.sprite.get_size()
+			if self.animation_timer >= self.current_slime_animation.frame_duration and self.is_on_screen():
+				self._advance_animation()
 			if self.attack_windup_timer <= 0:
 				self.is_attacking = False
 				if self.npc_logic and self.npc_logic.target:
@@ -215,26 +234,20 @@ class Slime(Enemy):
 					if self.position.distance_to(target_pos) < self.npc_logic.attack_range:
 						self.npc_logic.target.take_damage(self.damage)
 				self.attack_cooldown_timer = self.attack_cooldown
-			self.rect.center = (int(self.position.x), int(self.position.y))
+			self.sync_position()
 			return
-			self.rect.center = (int(self.position.x), int(self.position.y))
+			self.sync_position()
 			return
 		if self.attack_cooldown_timer > 0:
 			self.attack_cooldown_timer -= dt
 		if self.npc_logic and self.npc_logic.target:
 			self.npc_logic.update(self, dt)
 		if self.velocity.length_squared() > 0:
-			self.current_slime_animation = self.slime_move_sprites
+			self.current_slime_animation = self.animations['move']
 			self.last_direction = self.velocity.normalize()
 		else:
-			self.current_slime_animation = self.slime_idle_sprites
+			self.current_slime_animation = self.animations['idle']
 		self.animation_timer += dt
-		if self.animation_timer >= self.animation_speed:
-			self.animation_timer = 0
-			self.current_sprite_index = (self.current_sprite_index + 1) % len(self.current_slime_animation)
-			self.sprite = self.current_slime_animation[self.current_sprite_index]
-			if self.last_direction.x < 0:
-				self.sprite = pygame.transform.flip(self.sprite, True, False)
-			self.rect.width = self.sprite.get_width()
-			self.rect.height = self.sprite.get_height()
-		self.rect.center = (int(self.position.x), int(self.position.y))
+		if self.animation_timer >= self.current_slime_animation.frame_duration and self.is_on_screen():
+			self._advance_animation()
+		self.sync_position()
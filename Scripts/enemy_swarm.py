@@ -0,0 +1,441 @@
+import random
+from pygame.math import Vector2
+
+from game_object import GameObject
+from enemy import get_slime_animations
+from constants import SLIME_XP_REWARD, SLIME_BASE_HP, SLIME_BASE_DAMAGE
+
+try:
+	import numpy
+	NUMPY_AVAILABLE = True
+except ImportError:
+	print("Warning: NumPy library not found. Vectorized enemy backend disabled. Install with 'pip install numpy'")
+	NUMPY_AVAILABLE = False
+
+# Индексы анимаций слайма в массивах состояния
+ANIM_MOVE = 0
+ANIM_IDLE = 1
+ANIM_DIE = 2
+ANIM_NAMES = ('move', 'idle', 'die')
+
+
+class SlimeView(GameObject):
+	"""Класс тонкого представления слайма, данные которого хранятся в массивах SlimeSwarm.
+
+	Повторяет интерфейс Enemy, которым пользуются Game, оружие, снаряды и
+	отрисовка, но не хранит собственного состояния кроме индекса в массивах."""
+	def __init__(self, swarm, index):
+		self.swarm = swarm
+		self.index = index
+		self.spatial_index = None
+		self.xp_reward = SLIME_XP_REWARD
+
+	@property
+	def position(self):
+		x, y = self.swarm.positions[self.index]
+		return Vector2(float(x), float(y))
+
+	@position.setter
+	def position(self, value):
+		self.swarm.positions[self.index] = (value[0], value[1])
+		self.sync_position()
+
+	@property
+	def previous_position(self):
+		x, y = self.swarm.previous_positions[self.index]
+		return Vector2(float(x), float(y))
+
+	@property
+	def velocity(self):
+		x, y = self.swarm.velocities[self.index]
+		return Vector2(float(x), float(y))
+
+	@velocity.setter
+	def velocity(self, value):
+		self.swarm.velocities[self.index] = (value[0], value[1])
+
+	@property
+	def last_direction(self):
+		x, y = self.swarm.last_directions[self.index]
+		return Vector2(float(x), float(y))
+
+	@property
+	def sprite(self):
+		swarm = self.swarm
+		i = self.index
+		animation = swarm.animations[ANIM_NAMES[swarm.display_kinds[i]]]
+		return animation.frame(int(swarm.display_frames[i]), bool(swarm.display_flips[i]))
+
+	@property
+	def rect(self):
+		sprite = self.sprite
+		rect = sprite.get_rect()
+		x, y = self.swarm.positions[self.index]
+		rect.center = (int(x), int(y))
+		return rect
+
+	@property
+	def radius(self):
+		return self.sprite.get_width() / 2
+
+	@property
+	def hp(self):
+		return float(self.swarm.hps[self.index])
+
+	@property
+	def max_hp(self):
+		return float(self.swarm.max_hps[self.index])
+
+	@property
+	def damage(self):
+		return float(self.swarm.damages[self.index])
+
+	@property
+	def alive(self):
+		return bool(self.swarm.alive[self.index])
+
+	@property
+	def dying(self):
+		return bool(self.swarm.dying[self.index])
+
+	@property
+	def is_attacking(self):
+		return bool(self.swarm.attacking[self.index])
+
+	@property
+	def should_be_removed(self):
+		return bool(self.swarm.removal_flags[self.index])
+
+	def sync_position(self):
+		"""Синхронизация ячейки в пространственной сетке с позицией"""
+		if self.spatial_index is not None:
+			self.spatial_index.update(self)
+
+	def update(self, dt):
+		"""Состояние обновляется пакетно в SlimeSwarm.update"""
+		pass
+
+	def take_damage(self, damage):
+		self.swarm.damage_enemy(self.index, damage)
+
+	def apply_knockback(self, direction: Vector2, strength: float, stun_duration: float):
+		self.swarm.knockback_enemy(self.index, direction, strength, stun_duration)
+
+	def despawn(self):
+		"""Удаление слайма из массивов после удаления из игры"""
+		self.swarm.remove(self)
+
+
+class SlimeSwarm:
+	"""Класс векторизованной симуляции слаймов на массивах NumPy.
+
+	Позиции, скорости, здоровье и таймеры всех слаймов лежат в непрерывных
+	массивах, а поиск цели, замах атаки и отбрасывание считаются за один проход."""
+	# Те же параметры, что и у Slime
+	SPEED = 120
+	ATTACK_RANGE = 30
+	ATTACK_COOLDOWN = 1.0
+	ATTACK_ANIM_DURATION = 0.5
+	INITIAL_ATTACK_COOLDOWN = 2.0
+	KNOCKBACK_DURATION = 0.2
+	REMOVAL_DELAY = 5.0
+
+	# Массивы состояния: имя, форма одного элемента, тип
+	_FIELDS = (
+		('positions', (2,), 'float64'),
+		('previous_positions', (2,), 'float64'),
+		('velocities', (2,), 'float64'),
+		('knockback_velocities', (2,), 'float64'),
+		('last_directions', (2,), 'float64'),
+		('hps', (), 'float64'),
+		('max_hps', (), 'float64'),
+		('damages', (), 'float64'),
+		('stun_timers', (), 'float64'),
+		('knockback_timers', (), 'float64'),
+		('knockback_recovery_timers', (), 'float64'),
+		('attack_cooldown_timers', (), 'float64'),
+		('attack_windup_timers', (), 'float64'),
+		('death_timers', (), 'float64'),
+		('death_frame_timers', (), 'float64'),
+		('animation_timers', (), 'float64'),
+		('animation_kinds', (), 'int8'),
+		('animation_frames', (), 'int32'),
+		('death_frames', (), 'int32'),
+		('display_kinds', (), 'int8'),
+		('display_frames', (), 'int32'),
+		('display_flips', (), 'bool'),
+		('attacking', (), 'bool'),
+		('alive', (), 'bool'),
+		('dying', (), 'bool'),
+		('removal_flags', (), 'bool'),
+	)
+
+	def __init__(self, target, capacity=256, rng=None):
+		if not NUMPY_AVAILABLE:
+			raise RuntimeError("NumPy is required for the vectorized enemy backend")
+		self.target = target
+		self.rng = rng if rng is not None else random
+		self.count = 0
+		self.capacity = 0
+		self.views = []
+		self.animations = get_slime_animations()
+		self.frame_counts = numpy.array([len(self.animations[name]) for name in ANIM_NAMES])
+		self.frame_durations = numpy.array([self.animations[name].frame_duration for name in ANIM_NAMES])
+		self._allocate(capacity)
+
+	def _allocate(self, capacity):
+		"""Выделение (или расширение) массивов состояния"""
+		for name, shape_tail, dtype in self._FIELDS:
+			new_array = numpy.zeros((capacity,) + shape_tail, dtype=dtype)
+			old_array = getattr(self, name, None)
+			if old_array is not None:
+				new_array[:self.count] = old_array[:self.count]
+			setattr(self, name, new_array)
+		self.capacity = capacity
+
+	def __len__(self):
+		return self.count
+
+	def spawn(self, position, target=None, hp=SLIME_BASE_HP, damage=SLIME_BASE_DAMAGE):
+		"""Создание слайма; сигнатура совпадает с конструктором Slime"""
+		if self.count == self.capacity:
+			self._allocate(self.capacity * 2)
+		i = self.count
+		self.count += 1
+
+		for array in self._arrays():
+			array[i] = 0
+		self.positions[i] = (position[0], position[1])
+		self.previous_positions[i] = self.positions[i]
+		self.last_directions[i] = (1, 0)
+		self.hps[i] = hp
+		self.max_hps[i] = hp
+		self.damages[i] = damage
+		self.attack_cooldown_timers[i] = self.INITIAL_ATTACK_COOLDOWN
+		self.animation_kinds[i] = ANIM_MOVE
+		self.display_kinds[i] = ANIM_IDLE
+		self.alive[i] = True
+
+		view = SlimeView(self, i)
+		self.views.append(view)
+		return view
+
+	def remove(self, view):
+		"""Удаление слайма с переносом последнего слайма на его место"""
+		i = view.index
+		if i < 0:
+			return
+		last = self.count - 1
+		if i != last:
+			for array in self._arrays():
+				array[i] = array[last]
+			moved_view = self.views[last]
+			moved_view.index = i
+			self.views[i] = moved_view
+		self.views.pop()
+		self.count -= 1
+		view.index = -1
+
+	def store_previous_positions(self):
+		"""Запоминание позиций перед шагом симуляции для интерполяции отрисовки"""
+		self.previous_positions[:self.count] = self.positions[:self.count]
+
+	def _arrays(self):
+		return tuple(getattr(self, name) for name, _, _ in self._FIELDS)
+
+	def damage_enemy(self, i, damage):
+		"""Нанесение урона слайму"""
+		if not self.alive[i]:
+			return
+		self.hps[i] -= damage
+		if self.hps[i] <= 0:
+			self.alive[i] = False
+			self._die(i)
+
+	def _die(self, i):
+		"""Начало анимации смерти и награда игроку"""
+		self.dying[i] = True
+		self.death_timers[i] = 0
+		self.death_frames[i] = 0
+		self.display_kinds[i] = ANIM_DIE
+		self.display_frames[i] = 0
+		self.display_flips[i] = False
+		try:
+			if self.target and not self.target.is_dying:
+				xp_to_grant = SLIME_XP_REWARD * self.target.xp_multiplier
+				self.target.gain_xp(xp_to_grant)
+				self.target.restore_mana(10)
+		except AttributeError:
+			pass
+
+	def knockback_enemy(self, i, direction: Vector2, strength: float, stun_duration: float):
+		"""Отбрасывание слайма"""
+		if not self.alive[i]:
+			return
+		if direction.length_squared() > 0:
+			push_direction = direction.normalize()
+		else:
+			push_direction = Vector2(self.rng.uniform(-1, 1), self.rng.uniform(-1, 1)).normalize()
+		knockback_speed = strength * 100
+		self.knockback_velocities[i] = (push_direction.x * knockback_speed, push_direction.y * knockback_speed)
+		self.knockback_timers[i] = self.KNOCKBACK_DURATION
+		self.stun_timers[i] = max(self.stun_timers[i], stun_duration)
+		self.knockback_recovery_timers[i] = max(self.knockback_recovery_timers[i], self.KNOCKBACK_DURATION + 0.1)
+
+	def update(self, dt):
+		"""Пакетное обновление всех слаймов; возвращает слаймы, которые нужно удалить"""
+		n = self.count
+		if n == 0:
+			return []
+
+		pos = self.positions[:n]
+		old_cells = numpy.floor(pos / self._cell_size()).astype(numpy.int64) if self._has_grid() else None
+
+		# Отбрасывание
+		knockback = self.knockback_timers[:n] > 0
+		pos[knockback] += self.knockback_velocities[:n][knockback] * dt
+		self.knockback_timers[:n][knockback] -= dt
+		knockback_ended = knockback & (self.knockback_timers[:n] <= 0)
+		self.knockback_velocities[:n][knockback_ended] = 0
+		rest = ~knockback
+
+		# Анимация смерти
+		dying = rest & self.dying[:n]
+		self._step_dying(dying, dt)
+		rest &= ~self.dying[:n]
+
+		# Замах атаки
+		attacking = rest & self.attacking[:n]
+		self._step_attacking(attacking, dt)
+		rest &= ~attacking
+
+		# Поиск цели
+		self._step_seek(rest, dt)
+		self._step_animation(rest, dt)
+
+		if old_cells is not None:
+			self._sync_grid(old_cells)
+
+		removed = numpy.flatnonzero(self.removal_flags[:n])
+		return [self.views[i] for i in removed]
+
+	def _step_dying(self, mask, dt):
+		"""Проход анимации смерти"""
+		n = self.count
+		self.death_timers[:n][mask] += dt
+		self.death_frame_timers[:n][mask] += dt
+		die_frames = self.frame_counts[ANIM_DIE]
+		advance = mask & (self.death_frames[:n] < die_frames) & (self.death_frame_timers[:n] >= self.frame_durations[ANIM_DIE])
+		self.death_frame_timers[:n][advance] = 0
+		self.death_frames[:n][advance] += 1
+		show = advance & (self.death_frames[:n] < die_frames)
+		self.display_kinds[:n][show] = ANIM_DIE
+		self.display_frames[:n][show] = self.death_frames[:n][show]
+		self.display_flips[:n][show] = False
+		self.removal_flags[:n] |= mask & (self.death_timers[:n] >= self.REMOVAL_DELAY)
+
+	def _step_attacking(self, mask, dt):
+		"""Проход замаха атаки"""
+		n = self.count
+		self.velocities[:n][mask] = 0
+		self.attack_windup_timers[:n][mask] -= dt
+		self.animation_kinds[:n][mask] = ANIM_IDLE
+		self._tick_animation(mask, dt)
+
+		finished = mask & (self.attack_windup_timers[:n] <= 0)
+		if not finished.any():
+			return
+		self.attacking[:n][finished] = False
+		self.attack_cooldown_timers[:n][finished] = self.ATTACK_COOLDOWN
+		if self.target is None:
+			return
+		target = numpy.array((self.target.position.x, self.target.position.y))
+		distances = numpy.hypot(*(self.positions[:n] - target).T)
+		for i in numpy.flatnonzero(finished & (distances < self.ATTACK_RANGE)):
+			self.target.take_damage(float(self.damages[i]))
+
+	def _step_seek(self, mask, dt):
+		"""Проход оглушения, восстановления после отбрасывания и движения к цели"""
+		n = self.count
+		pos = self.positions[:n]
+		vel = self.velocities[:n]
+		cooldowns = self.attack_cooldown_timers[:n]
+
+		cooling = mask & (cooldowns > 0)
+		cooldowns[cooling] -= dt
+		if self.target is None:
+			return
+
+		stunned = mask & (self.stun_timers[:n] > 0)
+		self.stun_timers[:n][stunned] -= dt
+		active = mask & ~stunned
+
+		target = numpy.array((self.target.position.x, self.target.position.y))
+		delta = target - pos
+		distances = numpy.hypot(delta[:, 0], delta[:, 1])
+		safe = numpy.where(distances != 0, distances, 1.0)
+		directions = delta / safe[:, None]
+
+		# Восстановление после отбрасывания: движение с половинной скоростью
+		recovering = active & (self.knockback_recovery_timers[:n] > 0)
+		self.knockback_recovery_timers[:n][recovering] -= dt
+		recovering_close = recovering & (distances < 0.5 * self.ATTACK_RANGE)
+		vel[recovering_close] = 0
+		recovering_move = recovering & ~recovering_close
+		vel[recovering_move] = directions[recovering_move]
+		pos[recovering_move] += directions[recovering_move] * (self.SPEED * 0.5) * dt
+
+		# Обычное поведение
+		normal = active & ~recovering
+		holding = normal & (cooldowns > 0) & (distances < self.ATTACK_RANGE)
+		vel[holding] = 0
+		starting_attack = normal & ~holding & (distances < 0.5 * self.ATTACK_RANGE) & (cooldowns <= 0) & ~self.attacking[:n]
+		self.attacking[:n][starting_attack] = True
+		self.attack_windup_timers[:n][starting_attack] = self.ATTACK_ANIM_DURATION
+		vel[starting_attack] = 0
+		moving = normal & ~holding & ~starting_attack
+		at_target = moving & (distances == 0)
+		vel[at_target] = 0
+		moving &= ~at_target
+		vel[moving] = directions[moving]
+		pos[moving] += directions[moving] * self.SPEED * dt
+
+	def _step_animation(self, mask, dt):
+		"""Выбор анимации по скорости и смена кадров"""
+		n = self.count
+		vel = self.velocities[:n]
+		speeds = numpy.hypot(vel[:, 0], vel[:, 1])
+		moving = mask & (speeds > 0)
+		self.animation_kinds[:n][moving] = ANIM_MOVE
+		self.last_directions[:n][moving] = vel[moving] / speeds[moving][:, None]
+		self.animation_kinds[:n][mask & ~moving] = ANIM_IDLE
+		self._tick_animation(mask, dt)
+
+	def _tick_animation(self, mask, dt):
+		"""Смена кадров анимации движения и ожидания"""
+		n = self.count
+		kinds = self.animation_kinds[:n]
+		self.animation_timers[:n][mask] += dt
+		tick = mask & (self.animation_timers[:n] >= self.frame_durations[kinds])
+		if not tick.any():
+			return
+		self.animation_timers[:n][tick] = 0
+		frames = self.animation_frames[:n]
+		frames[tick] = (frames[tick] + 1) % self.frame_counts[kinds[tick]]
+		self.display_kinds[:n][tick] = kinds[tick]
+		self.display_frames[:n][tick] = frames[tick]
+		self.display_flips[:n][tick] = self.last_directions[:n, 0][tick] < 0
+
+	def _has_grid(self):
+		return bool(self.views) and self.views[0].spatial_index is not None
+
+	def _cell_size(self):
+		return self.views[0].spatial_index.cell_size
+
+	def _sync_grid(self, old_cells):
+		"""Перенос в сетке только тех слаймов, которые сменили ячейку"""
+		n = self.count
+		new_cells = numpy.floor(self.positions[:n] / self._cell_size()).astype(numpy.int64)
+		changed = numpy.flatnonzero((new_cells != old_cells).any(axis=1))
+		for i in changed:
+			self.views[i].sync_position()
@@ -2,7 +2,7 @@ import pygame
 import random
 from pygame.math import Vector2
 
-from utils import load_sprite
+from utils import load_sprite, preload_sprites, get_scaled_sprite, load_image
 from player import Player
 from constants import (
     WINDOW_WIDTH, WINDOW_HEIGHT,
@@ -13,51 +13,133 @@ from constants import (
     GAME_OVER_END_ALPHA,
     NEW_GAME_BUTTON_DELAY, ACTION_NEW_GAME,
     UPGRADE_CARD_SIZE, UPGRADE_CARD_Y_POS, UPGRADE_CARD_SPACING, 
-    BASE_PLAYER_HP, BASE_MAX_MANA, 
-    BASE_HP_BAR_WIDTH, BASE_MANA_BAR_WIDTH, 
-    MAX_HP_BAR_WIDTH, MAX_MANA_BAR_WIDTH
+    ENEMY_BACKEND, VIEW_CULLING_MARGIN
 )
 from camera import Camera
+from spatial_hash import SpatialHash
+from enemy_swarm import SlimeSwarm, NUMPY_AVAILABLE
+from projectile_pool import ProjectilePool
+from render_queue import RenderQueue
+from tiled_background import get_tiled_background
+from text_cache import text_cache, quantize_size, blit_with_alpha
+from input_source import PygameInput, StubInput
+from profiler import profiler
 from UI.button import Button
 from Scripts.spawner import Spawner
 from UI.upgrade_box import UpgradeBox
+from UI.hud import PlayerHud
 from Scripts.game_states import STATE_GO_TO_MENU
 from Scripts.upgrades_list import get_upgrade_data, get_all_upgrade_names
 from Scripts.upgrades_list import get_upgrade_data, get_all_upgrade_names
+from Scripts.enemy import SLIME_SPRITE_NAMES
+from weapon import PROJECTILE_SPRITE_NAME
 
 
 class GameState:
     """Класс для управления состоянием игры"""
-    def __init__(self, player, enemies, projectiles, camera):
+    def __init__(self, player, enemies, projectiles, camera, input_source=None, rng=None):
         self.player = player
         self.enemies = enemies
         self.projectiles = projectiles
         self.camera = camera
+        self.input_source = input_source if input_source is not None else PygameInput()
+        # Генератор случайных чисел игры: вся случайность симуляции берётся из него
+        self.rng = rng if rng is not None else random.Random()
+        # Пул снарядов (если доступен NumPy); иначе снаряды хранятся в списке projectiles
+        self.projectile_pool = None
+        # Пространственная сетка врагов для поиска попаданий
+        self.enemy_grid = SpatialHash()
+        # Враги в поле зрения камеры; вне его анимация слаймов не продвигается
+        self.visible_enemies = set()
+        for enemy in self.enemies:
+            self._register_enemy(enemy)
+
+    def _register_enemy(self, enemy):
+        """Добавление врага в пространственную сетку"""
+        enemy.spatial_index = self.enemy_grid
+        enemy.rng = self.rng
+        enemy.visible_enemies = self.visible_enemies
+        self.enemy_grid.insert(enemy)
+
+    def add_enemy(self, enemy):
+        """Добавление врага в игру"""
+        self.enemies.append(enemy)
+        self._register_enemy(enemy)
+
+    def remove_enemy(self, enemy):
+        """Удаление врага из игры"""
+        self.enemies.remove(enemy)
+        self.enemy_grid.remove(enemy)
+        enemy.spatial_index = None
+        if hasattr(enemy, 'despawn'):
+            enemy.despawn()
+
+    def query_visible_enemies(self, margin=VIEW_CULLING_MARGIN):
+        """Враги, которые могут попасть в кадр (поиск по сетке вокруг поля зрения камеры)"""
+        return self.enemy_grid.query_rect(self.camera.get_view_rect(), margin)
+
+    def query_visible_projectiles(self, margin=VIEW_CULLING_MARGIN):
+        """Снаряды, которые могут попасть в кадр"""
+        view = self.camera.get_view_rect(margin)
+        if self.projectile_pool is not None:
+            return self.projectile_pool.query_rect(view)
+        return [p for p in self.projectiles if view.collidepoint(p.position)]
+
+    def update_visible_enemies(self):
+        """Пересчёт множества врагов в поле зрения камеры"""
+        self.visible_enemies.clear()
+        self.visible_enemies.update(self.query_visible_enemies())
 
     def get_mouse_world_pos(self) -> Vector2:
         """Получение позиции мыши в мировой системе координат"""
-        mouse_screen_pos = pygame.mouse.get_pos()
+        mouse_screen_pos = self.input_source.get_mouse_pos()
         return self.camera.screen_to_world(mouse_screen_pos)
 
 
 class Game:
     """Класс для управления игрой"""
-    def __init__(self, starting_weapon_type: str):
+    def __init__(self, starting_weapon_type: str, enemy_backend: str = ENEMY_BACKEND,
+                 headless: bool = False, input_source=None, seed=None):
         """Инициализация игры"""
-        self.background = load_sprite("grass", False)
-        self.background_width = self.background.get_width()
-        self.background_height = self.background.get_height()
-        self.scaled_background = None
-        self.last_camera_zoom = None
+        # В режиме без окна не создаются элементы интерфейса, а улучшения выбираются автоматически
+        self.headless = headless
+        # Интерполяция нужна только при отрисовке чаще, чем идёт симуляция
+        self.interpolation_enabled = not headless
+        if input_source is None:
+            input_source = StubInput() if headless else PygameInput()
+        self.input_source = input_source
+        # Зерно генератора случайных чисел; при одинаковом зерне и вводе игра повторяется точно
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        # Прогрев кэша спрайтов, чтобы спаун врагов и выстрелы не читали файлы с диска
+        preload_sprites(SLIME_SPRITE_NAMES)
+        preload_sprites([PROJECTILE_SPRITE_NAME])
+        # Слой фона из плиток собирается под зум камеры и выводится одним вызовом blits;
+        # он общий для всех игр, поэтому новая игра не собирает его заново
+        self.background_layer = get_tiled_background("grass", WINDOW_WIDTH, WINDOW_HEIGHT)
+        # HUD перерисовывается только при изменении показателей игрока
+        self.hud = PlayerHud()
         # Инициализация игрока
-        self.player = Player(position=(400, 300), starting_weapon_type=starting_weapon_type)
+        self.player = Player(position=(400, 300), starting_weapon_type=starting_weapon_type,
+                             input_source=self.input_source)
         self.camera = Camera(WINDOW_WIDTH, WINDOW_HEIGHT)
+        # Очередь, через которую враги и снаряды выводятся одним вызовом Surface.blits
+        self.render_queue = RenderQueue()
         self.enemies = []
-        self.projectiles = []
+        self.projectile_pool = ProjectilePool() if NUMPY_AVAILABLE else None
+        # При наличии пула список снарядов принадлежит ему и не пересоздаётся каждый кадр
+        self.projectiles = self.projectile_pool.projectiles if self.projectile_pool is not None else []
 
-        self.game_state = GameState(self.player, self.enemies, self.projectiles, self.camera)
+        self.game_state = GameState(self.player, self.enemies, self.projectiles, self.camera,
+                                    input_source=self.input_source, rng=self.rng)
+        self.game_state.projectile_pool = self.projectile_pool
         # Инициализация спаунера
         self.spawner = Spawner(self.player, self.game_state)
+        # Векторизованная симуляция врагов (если выбрана и доступен NumPy)
+        self.enemy_swarm = None
+        if enemy_backend == 'numpy' and NUMPY_AVAILABLE:
+            self.enemy_swarm = SlimeSwarm(self.player, rng=self.rng)
+            self.spawner.enemy_factory = self.enemy_swarm.spawn
 
         # Инициализация менеджера звука
         self.audio_manager = None
@@ -67,26 +149,27 @@ class Game:
         self.slider_handle_radius = 15
         # Инициализация переменной для отслеживания перетаскивания слайдера
         self.is_dragging = False
-        self.volume_font = pygame.font.Font(None, 48)
-        self.volume_text = self.volume_font.render("Громкость", True, (255, 255, 255))
+        self.volume_text = text_cache.render("Громкость", 48, (255, 255, 255))
         
         # Инициализация переменной для отслеживания паузы
         self.is_paused = False
         # Инициализация кнопки паузы
-        self._setup_pause_button()
-        self._setup_resume_button()
-        self._setup_pause_overlay_elements()
+        self.pause_button = None
+        self.resume_button = None
+        self.exit_button = None
+        if not self.headless:
+            self._setup_pause_button()
+            self._setup_resume_button()
+            self._setup_pause_overlay_elements()
         
         # Инициализация переменной для отслеживания текущей волны
         self.current_wave = 0
         self.is_showing_wave_intro = False
         self.wave_intro_timer = 0.0
         self.wave_intro_stage = 'fade_in'
-        self.wave_font = None
 
         # Инициализация переменной для отслеживания окончания игры
         self.is_game_over = False
-        self.game_over_font = None
         self.game_over_timer = 0.0
         self.new_game_button_appear_timer = 0.0
         self.new_game_button = None
@@ -105,7 +188,7 @@ class Game:
         """Настройка кнопки паузы"""
         try:
             pause_sprite_path = "UI/ui_sprites/pause_button.png"
-            temp_pause_img = pygame.image.load(pause_sprite_path)
+            temp_pause_img = load_image(pause_sprite_path)
             btn_width, btn_height = temp_pause_img.get_size()
             
             pause_x = WINDOW_WIDTH - btn_width - 10
@@ -156,13 +239,9 @@ class Game:
     def _setup_pause_overlay_elements(self):
         """Настройка элементов паузы"""
         try:
-            self.pause_font = pygame.font.Font(None, 74)
+            self.paused_text_surface = text_cache.render("PAUSED", 74, (255, 255, 255))
         except pygame.error:
-            self.pause_font = pygame.font.SysFont('arial', 60)
-            
-        self.paused_text_surface = self.pause_font.render(
-            "PAUSED", True, (255, 255, 255)
-        )
+            self.paused_text_surface = text_cache.render("PAUSED", 60, (255, 255, 255), name='arial')
         screen_rect = pygame.display.get_surface().get_rect() 
         self.paused_text_rect = self.paused_text_surface.get_rect(
             center=screen_rect.center
@@ -347,10 +426,35 @@ class Game:
                         # Установка нового положения
                         self.audio_manager.set_volume(new_volume)
         
+    def set_interpolation(self, alpha):
+        """Установка доли шага симуляции, прошедшей с последнего обновления"""
+        self.camera.set_interpolation(alpha)
+
+    def _store_previous_positions(self):
+        """Запоминание позиций перед шагом симуляции для интерполяции отрисовки"""
+        self.camera.snapshot()
+        self.player.previous_position = Vector2(self.player.position)
+        if self.enemy_swarm is not None:
+            self.enemy_swarm.store_previous_positions()
+        else:
+            for enemy in self.enemies:
+                enemy.previous_position = Vector2(enemy.position)
+        if self.projectile_pool is not None:
+            self.projectile_pool.store_previous_positions()
+        else:
+            for projectile in self.projectiles:
+                projectile.previous_position = Vector2(projectile.position)
+
     def update(self, dt):
         """Обновление состояния игры"""
+        if self.interpolation_enabled:
+            self._store_previous_positions()
+        profiler.set_count('enemies', len(self.enemies))
+        profiler.set_count('projectiles', len(self.projectiles))
+        profiler.set_count('wave', self.current_wave)
         # Проверка, находится ли игрок в состоянии смерти и не закончилась ли игра
         if self.player.is_dying and not self.is_game_over:
+            profiler.mark('game_over', wave=self.current_wave)
             self.is_game_over = True
             self.game_over_timer = 0.0
         # Проверка, закончилась ли игра
@@ -366,13 +470,13 @@ class Game:
                     # Увеличение таймера
                     self.new_game_button_appear_timer += dt
                 # Проверка, прошло ли достаточно времени для появления кнопки новой игры
-            if self.new_game_button_appear_timer >= NEW_GAME_BUTTON_DELAY and self.new_game_button is None:
+            if self.new_game_button_appear_timer >= NEW_GAME_BUTTON_DELAY and self.new_game_button is None and not self.headless:
                 self._setup_new_game_button()
             return
 
         if self.is_game_won:
             # Проверка, появилась ли кнопка новой игры
-            if self.new_game_button is None:
+            if self.new_game_button is None and not self.headless:
                 self._setup_new_game_button()
             return
 
@@ -389,10 +493,12 @@ class Game:
             return 
         
         # Обновление спаунера
-        self.spawner.update(dt)
+        with profiler.section('spawner'):
+            self.spawner.update(dt)
         
         # Обновление игрока
-        self.player.update(dt, self.camera, self.game_state)
+        with profiler.section('player'):
+            self.player.update(dt, self.camera, self.game_state)
         
         # Обновление камеры
         self.camera.update(self.player)
@@ -402,22 +508,34 @@ class Game:
             return
         
         # Обновление врагов
-        for enemy in self.enemies[:]:
-            enemy.update(dt)
-            if enemy.should_be_removed:
-                self.enemies.remove(enemy)
+        with profiler.section('enemies'):
+            if self.enemy_swarm is not None:
+                for enemy in self.enemy_swarm.update(dt):
+                    self.game_state.remove_enemy(enemy)
+            else:
+                # Анимация слаймов продвигается только в поле зрения камеры
+                self.game_state.update_visible_enemies()
+                for enemy in self.enemies[:]:
+                    enemy.update(dt)
+                    if enemy.should_be_removed:
+                        self.game_state.remove_enemy(enemy)
 
         # Проверка, закончилась ли волна
         if self.player.current_level > self.current_wave and self.current_wave <= SLIME_MAX_LEVEL:
              self._end_wave()
 
         # Обновление снарядов
-        for p in self.projectiles:
-            p.update(dt, self.game_state)
+        with profiler.section('projectiles'):
+            if self.projectile_pool is not None:
+                self.projectile_pool.update(dt, self.game_state)
+                return
+
+            for p in self.projectiles:
+                p.update(dt, self.game_state)
 
-        # Удаление мертвых снарядов
-        self.projectiles = [p for p in self.projectiles if not getattr(p, 'is_dead', False)]
-        self.game_state.projectiles = self.projectiles
+            # Удаление мертвых снарядов
+            self.projectiles = [p for p in self.projectiles if not getattr(p, 'is_dead', False)]
+            self.game_state.projectiles = self.projectiles
         
     def _update_wave_intro(self, dt):
         """Обновление волны"""
@@ -441,11 +559,12 @@ class Game:
 
     def _end_wave(self):
         """Завершение волны"""
+        profiler.mark('wave_end', wave=self.current_wave, enemies=len(self.enemies))
         # Удаление мертвых врагов
         enemies_to_remove = [e for e in self.game_state.enemies if not e.dying]
         for enemy in enemies_to_remove:
             # Удаление врага из списка
-            self.game_state.enemies.remove(enemy)
+            self.game_state.remove_enemy(enemy)
         # Переход к следующей волне
         self.spawner.next_wave()
         # Проверка, достигнут ли максимальный уровень волны
@@ -471,25 +590,33 @@ class Game:
             self.is_showing_upgrades = False
             self._start_next_wave_intro()
             return
-        # Определение количества карт
-        num_cards = len(selected_names)
-        total_width = num_cards * UPGRADE_CARD_SIZE[0] + (num_cards - 1) * UPGRADE_CARD_SPACING
-        start_x = (WINDOW_WIDTH - total_width) // 2
-        # Создание карт улучшений
-        for i, name in enumerate(selected_names):
-            # Получение данных улучшения
-            upgrade_data = get_upgrade_data(name)
-            # Проверка, существуют ли данные улучшения
-            if upgrade_data:
-                # Определение позиции карты
-                card_x = start_x + i * (UPGRADE_CARD_SIZE[0] + UPGRADE_CARD_SPACING)
-                card_y = UPGRADE_CARD_Y_POS
-                # Создание карты улучшения
-                box = UpgradeBox(upgrade_data, (card_x, card_y), UPGRADE_CARD_SIZE)
-                self.available_upgrade_boxes.append(box)
-            else:
-                pass
-                
+        # Без окна выбирается первое из предложенных улучшений
+        if self.headless:
+            self._apply_upgrade(get_upgrade_data(selected_names[0]))
+            self.is_showing_upgrades = False
+            self._start_next_wave_intro()
+            return
+        # Создание карт улучшений отдельным участком профилировщика
+        with profiler.section('upgrade_boxes'):
+            # Определение количества карт
+            num_cards = len(selected_names)
+            total_width = num_cards * UPGRADE_CARD_SIZE[0] + (num_cards - 1) * UPGRADE_CARD_SPACING
+            start_x = (WINDOW_WIDTH - total_width) // 2
+            # Создание карт улучшений
+            for i, name in enumerate(selected_names):
+                # Получение данных улучшения
+                upgrade_data = get_upgrade_data(name)
+                # Проверка, существуют ли данные улучшения
+                if upgrade_data:
+                    # Определение позиции карты
+                    card_x = start_x + i * (UPGRADE_CARD_SIZE[0] + UPGRADE_CARD_SPACING)
+                    card_y = UPGRADE_CARD_Y_POS
+                    # Создание карты улучшения
+                    box = UpgradeBox(upgrade_data, (card_x, card_y), UPGRADE_CARD_SIZE)
+                    self.available_upgrade_boxes.append(box)
+                else:
+                    pass
+
     def _select_upgrades(self, count=3):
         """Выбор улучшений"""
         # Определение количества доступных улучшений
@@ -501,9 +628,9 @@ class Game:
             return []
         # Выбор улучшений
         try:
-            return random.sample(self.all_upgrade_names, select_count)
+            return self.rng.sample(self.all_upgrade_names, select_count)
         except ValueError:
-            return random.sample(self.all_upgrade_names, available_count) 
+            return self.rng.sample(self.all_upgrade_names, available_count) 
             
     def _apply_upgrade(self, upgrade_data):
         """Применение улучшений"""
@@ -547,6 +674,7 @@ class Game:
     def _start_next_wave_intro(self):
         """Начало новой волны"""
         self.current_wave += 1 
+        profiler.mark('wave_start', wave=self.current_wave)
         # Показ вступления волны
         self.is_showing_wave_intro = True
         self.wave_intro_timer = 0.0
@@ -559,194 +687,90 @@ class Game:
     def draw(self, surface):
         """Отрисовка игры"""
         # Отрисовка фона
-        self._draw_background(surface)
-        # Определение объектов для отрисовки
-        render_objects = [] 
-        if not self.player.is_dying:
-            # Добавление врагов в список объектов
-            render_objects.extend(self.enemies)
-            # Добавление снарядов в список объектов
-            render_objects.extend(self.projectiles)
-            # Сортировка объектов по позиции
-            render_objects.sort(key=lambda obj: obj.position.y)
-        # Отрисовка объектов
-        for obj in render_objects:
-            obj.draw(surface, self.camera)
+        with profiler.section('background'):
+            self._draw_background(surface)
+        with profiler.section('entities'):
+            # Определение объектов для отрисовки
+            render_objects = [] 
+            if not self.player.is_dying:
+                # Добавление врагов и снарядов, которые могут попасть в кадр
+                render_objects.extend(self.game_state.query_visible_enemies())
+                render_objects.extend(self.game_state.query_visible_projectiles())
+                # Сортировка объектов по позиции
+                render_objects.sort(key=lambda obj: obj.position.y)
+            # Отрисовка объектов одним вызовом Surface.blits
+            drawn = self.render_queue.add_world_objects(
+                render_objects, self.camera, surface.get_width(), surface.get_height()
+            )
+            profiler.set_count('drawn_entities', drawn)
+            self.render_queue.flush(surface)
             
         # Отрисовка игрока
-        self.player.draw(surface, self.camera)
+        with profiler.section('player'):
+            self.player.draw(surface, self.camera, self.render_queue)
         # Отрисовка Head-Up Display
-        self._draw_player_hud(surface)
+        with profiler.section('hud'):
+            self._draw_player_hud(surface)
         
-        # Отрисовка кнопки паузы
-        if self.pause_button and self.pause_button.unpressed_sprite:
-            # Получение исходного спрайта
-            original_sprite = self.pause_button.unpressed_sprite
-            original_width, original_height = original_sprite.get_size()
-            zoom = self.camera.zoom
-            # Определение масштаба
-            scale_factor = zoom * 2
-            scaled_width = max(1, int(original_width * scale_factor))
-            scaled_height = max(1, int(original_height * scale_factor))
-            # Масштабирование спрайта
-            scaled_sprite = pygame.transform.scale(original_sprite, (scaled_width, scaled_height))
-            # Определение отступа
-            padding = 10
-            scaled_x = WINDOW_WIDTH - scaled_width - padding
-            scaled_y = padding
-            # Отрисовка спрайта
-            surface.blit(scaled_sprite, (scaled_x, scaled_y))
+        # Отрисовка элементов интерфейса поверх мира
+        with profiler.section('ui'):
+            # Отрисовка кнопки паузы
+            if self.pause_button and self.pause_button.unpressed_sprite:
+                # Получение исходного спрайта
+                original_sprite = self.pause_button.unpressed_sprite
+                original_width, original_height = original_sprite.get_size()
+                zoom = self.camera.zoom
+                # Определение масштаба
+                scale_factor = zoom * 2
+                scaled_width = max(1, int(original_width * scale_factor))
+                scaled_height = max(1, int(original_height * scale_factor))
+                # Масштабирование спрайта
+                scaled_sprite = get_scaled_sprite(original_sprite, scale_factor)
+                # Определение отступа
+                padding = 10
+                scaled_x = WINDOW_WIDTH - scaled_width - padding
+                scaled_y = padding
+                # Отрисовка спрайта
+                surface.blit(scaled_sprite, (scaled_x, scaled_y))
             
-        # Проверка, нажата ли пауза
-        if self.is_paused:
-            self._draw_pause_overlay(surface)
-        # Проверка, отображается ли вступление волны
-        if self.is_showing_wave_intro:
-            self._draw_wave_intro(surface)
-        # Проверка, закончилась ли игра
-        if self.is_game_over:
-            # Отрисовка экрана проигрыша
-            self._draw_game_over(surface)
-            # Проверка, отображается ли кнопка новой игры
-            if self.new_game_button:
-                # Отрисовка кнопки новой игры
-                self.new_game_button.draw(surface)
-        # Проверка, выиграна ли игра
-        if self.is_game_won:
-            # Отрисовка экрана победы
-            self._draw_win_screen(surface)
-            # Проверка, отображается ли кнопка новой игры
-            if self.new_game_button:
-                # Отрисовка кнопки новой игры
-                self.new_game_button.draw(surface)
-
-        # Проверка, отображаются ли улучшения
-        if self.is_showing_upgrades:
-            # Отрисовка карт улучшений
-            for box in self.available_upgrade_boxes:
-                box.draw(surface)
+            # Проверка, нажата ли пауза
+            if self.is_paused:
+                self._draw_pause_overlay(surface)
+            # Проверка, отображается ли вступление волны
+            if self.is_showing_wave_intro:
+                self._draw_wave_intro(surface)
+            # Проверка, закончилась ли игра
+            if self.is_game_over:
+                # Отрисовка экрана проигрыша
+                self._draw_game_over(surface)
+                # Проверка, отображается ли кнопка новой игры
+                if self.new_game_button:
+                    # Отрисовка кнопки новой игры
+                    self.new_game_button.draw(surface)
+            # Проверка, выиграна ли игра
+            if self.is_game_won:
+                # Отрисовка экрана победы
+                self._draw_win_screen(surface)
+                # Проверка, отображается ли кнопка новой игры
+                if self.new_game_button:
+                    # Отрисовка кнопки новой игры
+                    self.new_game_button.draw(surface)
+
+            # Проверка, отображаются ли улучшения
+            if self.is_showing_upgrades:
+                # Отрисовка карт улучшений
+                for box in self.available_upgrade_boxes:
+                    box.draw(surface)
 
     def _draw_background(self, surface):
         """Отрисовка фона"""
-        surface.fill((0, 0, 0))
-        # Определение масштаба
-        zoom = self.camera.zoom
-        if zoom != self.last_camera_zoom or self.scaled_background is None:
-            # Определение ширины и высоты фона
-            scaled_bg_width = int(self.background_width * zoom)
-            scaled_bg_height = int(self.background_height * zoom)
-            # Проверка, существует ли фон
-            if scaled_bg_width > 0 and scaled_bg_height > 0:
-                self.scaled_background = pygame.transform.scale(self.background, (scaled_bg_width, scaled_bg_height))
-                # Установка последнего масштаба камеры
-                self.last_camera_zoom = zoom
-            else:
-                # Установка фона в None
-                self.scaled_background = None 
-        # Проверка, существует ли фон
-        if self.scaled_background is None:
-            return
-        # Определение обратного масштаба
-        inv_zoom = 1.0 / zoom
-        # Определение ширины и высоты фона
-        world_view_width = self.camera.width * inv_zoom
-        world_view_height = self.camera.height * inv_zoom
-        world_view_left = self.camera.camera.x
-        world_view_top = self.camera.camera.y
-        # Определение ширины и высоты фона
-        scaled_bg_width = self.scaled_background.get_width()
-        scaled_bg_height = self.scaled_background.get_height()
-        # Определение начального и конечного столбца
-        start_col = int(world_view_left // self.background_width)
-        end_col = int((world_view_left + world_view_width) // self.background_width) + 1
-        start_row = int(world_view_top // self.background_height)
-        end_row = int((world_view_top + world_view_height) // self.background_height) + 1
-        # Отрисовка фона
-        for row in range(start_row, end_row):
-            for col in range(start_col, end_col):
-                tile_world_x = col * self.background_width
-                tile_world_y = row * self.background_height
-                # Определение позиции на экране
-                screen_x = (tile_world_x - world_view_left) * zoom
-                screen_y = (tile_world_y - world_view_top) * zoom
-                # Отрисовка фона
-                surface.blit(self.scaled_background, (int(screen_x), int(screen_y)))
+        # Фон сдвигается вместе с интерполированной камерой, как и объекты мира
+        offset_x, offset_y = self.camera.get_offset()
+        self.background_layer.draw(surface, offset_x, offset_y, self.camera.zoom)
 
     def _draw_player_hud(self, surface):
         """Отрисовка HUD"""
-        # Определение ширины экрана
-        screen_width = surface.get_width()
-        # Определение высоты HUD
-        HP_BAR_HEIGHT = 20
-        HP_BAR_X = 10
-        HP_BAR_Y = 10
-        # Проверка, есть ли здоровье
-        if self.player.max_hp > 0:
-            hp_ratio_to_base = self.player.max_hp / BASE_PLAYER_HP
-            target_hp_width = BASE_HP_BAR_WIDTH * hp_ratio_to_base
-            current_hp_bar_width = min(target_hp_width, MAX_HP_BAR_WIDTH)
-            # Определение отношения здоровья
-            hp_ratio = max(0, self.player.hp / self.player.max_hp)
-            # Определение цвета фона
-            hp_bg_color = (128, 0, 0)
-            hp_fg_color = (0, 200, 0)
-            hp_border_color = (255, 255, 255)
-            hp_bg_rect = pygame.Rect(HP_BAR_X, HP_BAR_Y, int(current_hp_bar_width), HP_BAR_HEIGHT)
-            hp_fg_rect_width = int(current_hp_bar_width * hp_ratio)
-            hp_fg_rect = pygame.Rect(HP_BAR_X, HP_BAR_Y, hp_fg_rect_width, HP_BAR_HEIGHT)
-            
-            pygame.draw.rect(surface, hp_bg_color, hp_bg_rect)
-            pygame.draw.rect(surface, hp_fg_color, hp_fg_rect)
-            pygame.draw.rect(surface, hp_border_color, hp_bg_rect, 2)
-        # Проверка, есть ли мана
-        if self.player.max_mana > 0:
-            MANA_BAR_HEIGHT = 15
-            MANA_BAR_X = HP_BAR_X
-            MANA_BAR_Y = HP_BAR_Y + HP_BAR_HEIGHT + 5
-            mana_ratio_to_base = self.player.max_mana / BASE_MAX_MANA
-            target_mana_width = BASE_MANA_BAR_WIDTH * mana_ratio_to_base
-            current_mana_bar_width = min(target_mana_width, MAX_MANA_BAR_WIDTH)
-            mana_ratio = max(0, self.player.current_mana / self.player.max_mana)
-            # Определение цвета фона
-            mana_bg_color = (0, 0, 100)
-            mana_fg_color = (0, 100, 255)
-            mana_border_color = (200, 200, 255)
-            
-            mana_bg_rect = pygame.Rect(MANA_BAR_X, MANA_BAR_Y, int(current_mana_bar_width), MANA_BAR_HEIGHT)
-            mana_fg_rect_width = int(current_mana_bar_width * mana_ratio)
-            mana_fg_rect = pygame.Rect(MANA_BAR_X, MANA_BAR_Y, mana_fg_rect_width, MANA_BAR_HEIGHT)
-            
-            pygame.draw.rect(surface, mana_bg_color, mana_bg_rect)
-            pygame.draw.rect(surface, mana_fg_color, mana_fg_rect)
-            pygame.draw.rect(surface, mana_border_color, mana_bg_rect, 2)
-        XP_BAR_WIDTH = 300
-        XP_BAR_HEIGHT = 15
-        XP_BAR_X = (screen_width - XP_BAR_WIDTH) // 2
-        XP_BAR_Y = 10
-        
-        if self.player.xp_for_next_level > 0:
-            xp_ratio = max(0, self.player.current_xp / self.player.xp_for_next_level)
-
-            xp_bg_color = (50, 50, 50)
-            xp_fg_color = (0, 180, 255)
-            xp_border_color = (200, 200, 200)
-            
-            xp_bg_rect = pygame.Rect(XP_BAR_X, XP_BAR_Y, XP_BAR_WIDTH, XP_BAR_HEIGHT)
-            xp_fg_rect_width = int(XP_BAR_WIDTH * xp_ratio)
-            xp_fg_rect = pygame.Rect(XP_BAR_X, XP_BAR_Y, xp_fg_rect_width, XP_BAR_HEIGHT)
-            
-            pygame.draw.rect(surface, xp_bg_color, xp_bg_rect)
-            pygame.draw.rect(surface, xp_fg_color, xp_fg_rect)
-            pygame.draw.rect(surface, xp_border_color, xp_bg_rect, 2)
-
-            try:
-                level_font = pygame.font.Font(None, 24)
-                level_text = f"Level: {self.player.current_level}"
-                level_surf = level_font.render(level_text, True, (255, 255, 255))
-                level_rect = level_surf.get_rect(midtop=(xp_bg_rect.centerx, xp_bg_rect.bottom + 5))
-                surface.blit(level_surf, level_rect)
-            except pygame.error:
-                pass
+        self.hud.draw(surface, self.player)
 
     def _draw_pause_overlay(self, surface):
         """Отрисовка паузы"""
@@ -805,16 +829,13 @@ class Game:
         current_size = max(1, current_size)
 
         try:
-            if self.wave_font is None or self.wave_font.get_height() != current_size:
-                 self.wave_font = pygame.font.Font(None, current_size) 
-            
+            # Размер округляется до ступени, чтобы надпись бралась из кэша, а не рисовалась каждый кадр
             wave_text = f"WAVE {self.current_wave}"
-            text_surface = self.wave_font.render(wave_text, True, (255, 255, 255))
-            text_surface.set_alpha(current_alpha)
+            text_surface = text_cache.render(wave_text, quantize_size(current_size), (255, 255, 255))
             
             text_rect = text_surface.get_rect(center=WAVE_INSCRIPTION_POSITION)
             
-            surface.blit(text_surface, text_rect)
+            blit_with_alpha(surface, text_surface, text_rect, current_alpha)
         except pygame.error:
             pass
         except AttributeError:
@@ -834,16 +855,12 @@ class Game:
         current_size = max(1, current_size)
         
         try:
-            if self.game_over_font is None or self.game_over_font.get_height() != current_size:
-                self.game_over_font = pygame.font.Font(None, current_size) 
-                
-            text_surface = self.game_over_font.render("GAME OVER", True, (200, 0, 0))
-            text_surface.set_alpha(current_alpha)
+            text_surface = text_cache.render("GAME OVER", quantize_size(current_size), (200, 0, 0))
             
             screen_rect = surface.get_rect()
             text_rect = text_surface.get_rect(center=screen_rect.center)
             
-            surface.blit(text_surface, text_rect)
+            blit_with_alpha(surface, text_surface, text_rect, current_alpha)
         except pygame.error:
             pass
         except AttributeError:
@@ -852,10 +869,7 @@ class Game:
     def _draw_win_screen(self, surface):
         """Отрисовка экрана победы"""
         try:
-            if self.game_over_font is None:
-                self.game_over_font = pygame.font.Font(None, GAME_OVER_MAX_FONT_SIZE) 
-                
-            text_surface = self.game_over_font.render("WIN!", True, (255, 215, 0))
+            text_surface = text_cache.render("WIN!", GAME_OVER_MAX_FONT_SIZE, (255, 215, 0))
             
             screen_rect = surface.get_rect()
             text_rect = text_surface.get_rect(center=screen_rect.center)
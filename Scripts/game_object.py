@@ -1,6 +1,9 @@
 import pygame
 from pygame.math import Vector2
 
+from utils import get_scaled_sprite
+from constants import ENTITY_HP_BAR_HEIGHT, ENTITY_HP_BAR_PADDING, ENTITY_HP_BAR_BG_COLOR, ENTITY_HP_BAR_FG_COLOR
+
 class GameObject:
 	"""Класс для управления объектами в игре"""
 	def __init__(self, position: tuple, sprite, velocity: Vector2):
@@ -21,30 +24,24 @@ class GameObject:
 			screen_rect = camera.apply(self)
 
 			if screen_rect.colliderect(surface.get_rect()):
-				w = max(1, int(screen_rect.width))
-				h = max(1, int(screen_rect.height))
-				scaled_sprite = pygame.transform.scale(self.sprite, (w, h))
+				# Масштабированная копия берётся из кэша, пересоздаётся только при смене зума
+				scaled_sprite = get_scaled_sprite(self.sprite, camera.zoom)
 				
 				surface.blit(scaled_sprite, screen_rect.topleft)
 				
 				if hasattr(self, 'hp') and hasattr(self, 'max_hp') and self.hp > 0:
-					BAR_HEIGHT = 5
-					BAR_PADDING = 2
 					bar_width = screen_rect.width
 					hp_ratio = max(0, self.hp / self.max_hp)
 					
-					bg_color = (128, 0, 0)
-					fg_color = (0, 200, 0)
-					
 					bg_rect_pos_x = screen_rect.left
-					bg_rect_pos_y = screen_rect.top - BAR_HEIGHT - BAR_PADDING
-					bg_rect = pygame.Rect(bg_rect_pos_x, bg_rect_pos_y, bar_width, BAR_HEIGHT)
+					bg_rect_pos_y = screen_rect.top - ENTITY_HP_BAR_HEIGHT - ENTITY_HP_BAR_PADDING
+					bg_rect = pygame.Rect(bg_rect_pos_x, bg_rect_pos_y, bar_width, ENTITY_HP_BAR_HEIGHT)
 					
 					fg_rect_width = int(bar_width * hp_ratio)
-					fg_rect = pygame.Rect(bg_rect_pos_x, bg_rect_pos_y, fg_rect_width, BAR_HEIGHT)
+					fg_rect = pygame.Rect(bg_rect_pos_x, bg_rect_pos_y, fg_rect_width, ENTITY_HP_BAR_HEIGHT)
 					
-					pygame.draw.rect(surface, bg_color, bg_rect)
-					pygame.draw.rect(surface, fg_color, fg_rect)
+					pygame.draw.rect(surface, ENTITY_HP_BAR_BG_COLOR, bg_rect)
+					pygame.draw.rect(surface, ENTITY_HP_BAR_FG_COLOR, fg_rect)
 		else:
 			blit_position = Vector2(
 				self.position.x - self.sprite.get_width() / 2,
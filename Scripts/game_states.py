@@ -4,4 +4,5 @@ STATE_GAMEPLAY = 'gameplay'
 STATE_EXIT = 'exit'
 STATE_NEW_GAME = "new_game"
 STATE_GO_TO_MENU = "go_to_menu"
-STATE_WEAPON_SELECTION = "weapon_selection"
\ No newline at end of file
+STATE_WEAPON_SELECTION = "weapon_selection"
+STATE_LOADING = "loading"
\ No newline at end of file
@@ -0,0 +1,230 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+# Добавляем корневую директорию проекта и папку Scripts в sys.path
+dir_scripts = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(dir_scripts, '..'))
+for path in (dir_scripts, project_root):
+	if path not in sys.path:
+		sys.path.append(path)
+
+import pygame
+
+from utils import set_headless
+from input_source import StubInput
+from input_recording import InputRecorder, ReplayInput, state_digest
+from profiler import profiler
+from trace_recorder import TraceRecorder
+from constants import ENEMY_BACKEND, WINDOW_WIDTH, WINDOW_HEIGHT, SIMULATION_HZ
+from game import Game
+
+
+def init_headless():
+	"""Инициализация pygame без окна и звука"""
+	os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+	os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+	os.chdir(project_root)
+	pygame.init()
+	set_headless(True)
+
+
+class HeadlessRunner:
+	"""Класс для запуска игровой симуляции без окна и отрисовки.
+
+	Game обновляется с фиксированным шагом dt без ограничения частоты кадров,
+	ввод берётся из input_source (по умолчанию StubInput). Если у источника
+	есть begin_frame (запись или воспроизведение), dt, число шагов и события
+	кадра берутся из него.
+	При with_ui создаётся невидимое окно и интерфейс игры, как в обычном запуске;
+	при render каждый кадр также отрисовывается в это окно."""
+	def __init__(self, starting_weapon_type='ranged', enemy_backend=ENEMY_BACKEND,
+	             input_source=None, dt=1 / SIMULATION_HZ, seed=None, with_ui=False, render=False):
+		init_headless()
+		self.screen = None
+		if with_ui or render:
+			self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+			# С окном спрайты конвертируются в формат экрана, как в обычном запуске
+			set_headless(False)
+		self.render = render
+		self.dt = dt
+		self.input_source = input_source if input_source is not None else StubInput(auto_fire=True)
+		self.game = Game(starting_weapon_type, enemy_backend=enemy_backend,
+		                 headless=not with_ui, input_source=self.input_source, seed=seed)
+		self.ticks = 0
+		self.sim_time = 0.0
+		# Действие, с которым игра была покинута (выход в меню или новая игра)
+		self.exit_action = None
+
+	def is_finished(self):
+		"""Проверка, закончилась ли игра (поражение, победа или выход из неё)"""
+		return self.game.is_game_over or self.game.is_game_won or self.exit_action is not None
+
+	def step(self, events=None):
+		"""Один кадр: обработка событий и шаги симуляции (по умолчанию один)"""
+		if events is None:
+			events = self.input_source.get_events()
+		dt, steps = self.dt, 1
+		if hasattr(self.input_source, 'begin_frame'):
+			dt, steps, events = self.input_source.begin_frame(dt, steps, events)
+		profiler.begin_frame()
+		with profiler.section('events'):
+			action = self.game.handle_events(events)
+		if action:
+			# Как и GameController, после выхода из игры она больше не обновляется
+			self.exit_action = action
+			profiler.end_frame()
+			return
+		with profiler.section('update'):
+			for _ in range(steps):
+				self.game.update(dt)
+		if self.render:
+			with profiler.section('draw'):
+				self.game.draw(self.screen)
+		profiler.end_frame()
+		self.ticks += steps
+		self.sim_time += dt * steps
+
+	def run(self, max_ticks, stop_when_finished=True):
+		"""Запуск симуляции на max_ticks тиков; возвращает статистику"""
+		start = time.perf_counter()
+		start_ticks = self.ticks
+		start_sim_time = self.sim_time
+		while self.ticks - start_ticks < max_ticks:
+			if stop_when_finished and self.is_finished():
+				break
+			if getattr(self.input_source, 'finished', False):
+				break
+			self.step()
+		elapsed = time.perf_counter() - start
+		return self.get_stats(self.ticks - start_ticks, elapsed, self.sim_time - start_sim_time)
+
+	def get_stats(self, ticks, elapsed, sim_time=None):
+		"""Получение статистики прогона"""
+		game = self.game
+		return {
+			'ticks': ticks,
+			'elapsed': elapsed,
+			'ticks_per_second': ticks / elapsed if elapsed > 0 else 0.0,
+			'sim_time': sim_time if sim_time is not None else ticks * self.dt,
+			'wave': game.current_wave,
+			'player_level': game.player.current_level,
+			'player_hp': game.player.hp,
+			'enemies': len(game.enemies),
+			'projectiles': len(game.projectiles),
+			'game_over': game.is_game_over,
+			'game_won': game.is_game_won,
+		}
+
+
+def record_session(path, max_ticks, starting_weapon_type='ranged', enemy_backend=ENEMY_BACKEND, seed=None):
+	"""Запись синтетической сессии (StubInput) в файл"""
+	init_headless()
+	if seed is None:
+		seed = random.randrange(2 ** 32)
+	recorder = InputRecorder(StubInput(auto_fire=True), path, seed, starting_weapon_type,
+	                         enemy_backend, headless=True)
+	runner = HeadlessRunner(starting_weapon_type, enemy_backend=enemy_backend,
+	                        input_source=recorder, seed=seed)
+	stats = runner.run(max_ticks)
+	recorder.close(runner.game)
+	return stats
+
+
+def replay_session(path):
+	"""Воспроизведение записи с максимальной скоростью и проверкой хэша состояния"""
+	replay_input = ReplayInput(path)
+	runner = HeadlessRunner(replay_input.starting_weapon_type, enemy_backend=replay_input.enemy_backend,
+	                        input_source=replay_input, seed=replay_input.seed,
+	                        with_ui=not replay_input.headless)
+	stats = runner.run(float('inf'), stop_when_finished=False)
+	stats['digest'] = state_digest(runner.game)
+	if replay_input.expected_digest is not None:
+		stats['digest_match'] = stats['digest'] == replay_input.expected_digest
+	return stats
+
+
+def check_replay_determinism(path, runs=2):
+	"""Повтор одной записи runs раз в одном процессе; возвращает статистику повторов и признак
+	совпадения итогового состояния между ними (глобальное состояние не должно переживать игру)"""
+	results = []
+	digests = set()
+	for _ in range(runs):
+		stats = replay_session(path)
+		digests.add(stats.pop('digest'))
+		results.append(stats)
+	return results, len(digests) == 1
+
+
+def _format_stats(stats):
+	"""Форматирование статистики в одну строку"""
+	return ", ".join(f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}"
+	                 for key, value in stats.items())
+
+
+def _print_profile():
+	"""Вывод перцентилей профилировщика, если он включён"""
+	if not profiler.enabled:
+		return
+	for path, (p50, p95, p99) in profiler.get_stats().items():
+		print(f"{path:<28} p50={p50:.3f}ms p95={p95:.3f}ms p99={p99:.3f}ms")
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Headless game simulation")
+	parser.add_argument('--ticks', type=int, default=60 * 60 * 5)
+	parser.add_argument('--weapon', choices=('melee', 'ranged'), default='ranged')
+	parser.add_argument('--backend', choices=('objects', 'numpy'), default=ENEMY_BACKEND)
+	parser.add_argument('--runs', type=int, default=1)
+	parser.add_argument('--seed', type=int, default=None)
+	parser.add_argument('--record', metavar='PATH', help="record the session input to a file")
+	parser.add_argument('--replay', metavar='PATH', help="replay a recorded session")
+	parser.add_argument('--check-determinism', metavar='PATH',
+	                    help="replay a recording --runs times (at least 2) in one process and compare the results")
+	parser.add_argument('--profile', action='store_true', help="print per-phase frame percentiles")
+	parser.add_argument('--trace', metavar='PATH', help="write a Chrome trace of the runs")
+	args = parser.parse_args()
+	profiler.set_enabled(args.profile)
+	if args.trace:
+		profiler.attach_tracer(TraceRecorder(args.trace))
+	try:
+		return _run_cli(args)
+	finally:
+		tracer = profiler.detach_tracer()
+		if tracer is not None:
+			tracer.close()
+
+
+def _run_cli(args):
+	"""Выполнение режима, выбранного аргументами командной строки; возвращает код выхода"""
+	if args.check_determinism:
+		results, consistent = check_replay_determinism(args.check_determinism, max(2, args.runs))
+		for run_index, stats in enumerate(results):
+			print(f"replay {run_index + 1}: " + _format_stats(stats))
+		matched = consistent and all(stats.get('digest_match', True) for stats in results)
+		print("deterministic" if matched else "NOT deterministic: replays of the same recording differ")
+		return 0 if matched else 1
+	if args.replay:
+		for run_index in range(args.runs):
+			stats = replay_session(args.replay)
+			del stats['digest']
+			print(f"replay {run_index + 1}: " + _format_stats(stats))
+		_print_profile()
+		return 0
+	if args.record:
+		print("record: " + _format_stats(record_session(args.record, args.ticks, args.weapon,
+		                                                  args.backend, args.seed)))
+		return 0
+
+	for run_index in range(args.runs):
+		runner = HeadlessRunner(args.weapon, enemy_backend=args.backend, seed=args.seed)
+		stats = runner.run(args.ticks)
+		print(f"run {run_index + 1}: " + _format_stats(stats))
+	_print_profile()
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,185 @@
+import struct
+import hashlib
+
+import pygame
+
+# Формат записи (little-endian):
+#   заголовок: сигнатура, версия, зерно, оружие, бэкенд врагов, флаги
+#   кадр: 'T', шаг симуляции dt, число шагов, движение x/y, позиция мыши x/y,
+#         число событий, затем события
+#   событие: тип, кнопка или клавиша, позиция x/y
+#   конец: 'E' и хэш состояния игры после последнего кадра
+RECORDING_MAGIC = b'TRRC'
+RECORDING_VERSION = 2
+
+_HEADER = struct.Struct('<4sHQBBB')
+_FRAME = struct.Struct('<cdBbbhhH')
+_EVENT = struct.Struct('<BIhh')
+_END_TAG = b'E'
+_FRAME_TAG = b'T'
+_DIGEST_SIZE = hashlib.sha256().digest_size
+
+WEAPON_CODES = {'melee': 0, 'ranged': 1}
+BACKEND_CODES = {'objects': 0, 'numpy': 1}
+FLAG_HEADLESS = 1
+
+# Записываются только события, которые обрабатывает Game
+_EVENT_CODES = {
+	pygame.MOUSEBUTTONDOWN: 1,
+	pygame.MOUSEBUTTONUP: 2,
+	pygame.MOUSEMOTION: 3,
+	pygame.KEYDOWN: 4,
+	pygame.KEYUP: 5,
+}
+_EVENT_TYPES = {code: event_type for event_type, code in _EVENT_CODES.items()}
+
+
+def _encode_event(event):
+	"""Упаковка события в запись фиксированного размера"""
+	code = _EVENT_CODES[event.type]
+	if event.type in (pygame.KEYDOWN, pygame.KEYUP):
+		return _EVENT.pack(code, event.key, 0, 0)
+	x, y = event.pos
+	return _EVENT.pack(code, getattr(event, 'button', 0), int(x), int(y))
+
+
+def _decode_event(code, value, x, y):
+	"""Восстановление события pygame из записи"""
+	event_type = _EVENT_TYPES[code]
+	if event_type in (pygame.KEYDOWN, pygame.KEYUP):
+		return pygame.event.Event(event_type, key=value)
+	if event_type == pygame.MOUSEMOTION:
+		return pygame.event.Event(event_type, pos=(x, y))
+	return pygame.event.Event(event_type, button=value, pos=(x, y))
+
+
+def state_digest(game):
+	"""Хэш состояния симуляции для проверки точности воспроизведения"""
+	digest = hashlib.sha256()
+	player = game.player
+	digest.update(struct.pack('<dddqd', player.position.x, player.position.y,
+	                          player.hp, player.current_level, player.current_xp))
+	digest.update(struct.pack('<qqq', game.current_wave, len(game.enemies), len(game.projectiles)))
+	for enemy in game.enemies:
+		digest.update(struct.pack('<ddd', enemy.position.x, enemy.position.y, enemy.hp))
+	for projectile in game.projectiles:
+		digest.update(struct.pack('<dd', projectile.position.x, projectile.position.y))
+	return digest.digest()
+
+
+class InputRecorder:
+	"""Класс записи ввода за каждый кадр в компактный бинарный файл.
+
+	Оборачивает источник ввода: движение и позиция мыши считываются один раз
+	в begin_frame и затем отдаются игре, поэтому запись совпадает с тем, что
+	увидела симуляция. Кадр - это обработка событий и steps шагов симуляции по dt."""
+	def __init__(self, input_source, path, seed, starting_weapon_type, enemy_backend, headless=False):
+		self.input_source = input_source
+		self.path = path
+		self.movement = (0, 0)
+		self.mouse_pos = (0, 0)
+		self.frames = 0
+		self._file = open(path, 'wb')
+		self._file.write(_HEADER.pack(
+			RECORDING_MAGIC, RECORDING_VERSION, seed,
+			WEAPON_CODES[starting_weapon_type], BACKEND_CODES[enemy_backend],
+			FLAG_HEADLESS if headless else 0
+		))
+
+	def begin_frame(self, dt, steps, events):
+		"""Запись ввода кадра; возвращает dt, число шагов и события, которые получит игра"""
+		move_x, move_y = self.input_source.get_movement()
+		mouse_x, mouse_y = self.input_source.get_mouse_pos()
+		self.movement = (move_x, move_y)
+		self.mouse_pos = (mouse_x, mouse_y)
+		recorded = [event for event in events if event.type in _EVENT_CODES]
+		if self._file is not None:
+			chunks = [_FRAME.pack(_FRAME_TAG, dt, steps, move_x, move_y, mouse_x, mouse_y, len(recorded))]
+			chunks.extend(_encode_event(event) for event in recorded)
+			self._file.write(b''.join(chunks))
+		self.frames += 1
+		return dt, steps, events
+
+	def get_movement(self):
+		"""Получение направления движения (по осям x и y)"""
+		return self.movement
+
+	def get_mouse_pos(self):
+		"""Получение позиции мыши на экране"""
+		return self.mouse_pos
+
+	def get_events(self):
+		"""Получение событий обёрнутого источника"""
+		return self.input_source.get_events()
+
+	def close(self, game=None):
+		"""Завершение записи; при переданной игре сохраняется хэш её состояния"""
+		if self._file is None:
+			return
+		if game is not None:
+			self._file.write(_END_TAG + state_digest(game))
+		self._file.close()
+		self._file = None
+
+
+class ReplayInput:
+	"""Класс источника ввода, воспроизводящего запись InputRecorder"""
+	def __init__(self, path):
+		with open(path, 'rb') as file:
+			self._data = file.read()
+		magic, version, seed, weapon, backend, flags = _HEADER.unpack_from(self._data, 0)
+		if magic != RECORDING_MAGIC or version != RECORDING_VERSION:
+			raise ValueError(f"Unsupported input recording: {path}")
+		self.seed = seed
+		self.starting_weapon_type = {code: name for name, code in WEAPON_CODES.items()}[weapon]
+		self.enemy_backend = {code: name for name, code in BACKEND_CODES.items()}[backend]
+		self.headless = bool(flags & FLAG_HEADLESS)
+		self.expected_digest = None
+		self.movement = (0, 0)
+		self.mouse_pos = (0, 0)
+		self.events = []
+		self.frames = 0
+		self._offset = _HEADER.size
+		self._check_end()
+
+	@property
+	def finished(self):
+		return self._offset >= len(self._data)
+
+	def _check_end(self):
+		"""Чтение хэша состояния, если записи кадров закончились"""
+		data = self._data
+		if data[self._offset:self._offset + 1] == _END_TAG:
+			start = self._offset + 1
+			self.expected_digest = data[start:start + _DIGEST_SIZE]
+			self._offset = len(data)
+
+	def begin_frame(self, dt, steps, events):
+		"""Чтение следующего кадра; возвращает записанные dt, число шагов и события"""
+		if self.finished:
+			return dt, 0, []
+		tag, dt, steps, move_x, move_y, mouse_x, mouse_y, event_count = _FRAME.unpack_from(self._data, self._offset)
+		if tag != _FRAME_TAG:
+			raise ValueError(f"Corrupted input recording at offset {self._offset}")
+		self._offset += _FRAME.size
+		self.movement = (move_x, move_y)
+		self.mouse_pos = (mouse_x, mouse_y)
+		self.events = []
+		for _ in range(event_count):
+			self.events.append(_decode_event(*_EVENT.unpack_from(self._data, self._offset)))
+			self._offset += _EVENT.size
+		self.frames += 1
+		self._check_end()
+		return dt, steps, self.events
+
+	def get_movement(self):
+		"""Получение записанного направления движения"""
+		return self.movement
+
+	def get_mouse_pos(self):
+		"""Получение записанной позиции мыши"""
+		return self.mouse_pos
+
+	def get_events(self):
+		"""События кадра возвращает begin_frame"""
+		return []
@@ -0,0 +1,42 @@
+import pygame
+
+
+class PygameInput:
+	"""Класс ввода с клавиатуры и мыши через pygame"""
+	def get_movement(self):
+		"""Получение направления движения (по осям x и y)"""
+		keys = pygame.key.get_pressed()
+		return keys[pygame.K_d] - keys[pygame.K_a], keys[pygame.K_s] - keys[pygame.K_w]
+
+	def get_mouse_pos(self):
+		"""Получение позиции мыши на экране"""
+		return pygame.mouse.get_pos()
+
+	def get_events(self):
+		"""Дополнительные события не нужны: их передаёт контроллер"""
+		return []
+
+
+class StubInput:
+	"""Класс заглушки ввода для запуска без окна.
+
+	Возвращает заданное движение и позицию мыши; при auto_fire каждый тик
+	генерирует нажатие левой кнопки мыши."""
+	def __init__(self, movement=(0, 0), mouse_pos=(0, 0), auto_fire=False):
+		self.movement = tuple(movement)
+		self.mouse_pos = tuple(mouse_pos)
+		self.auto_fire = auto_fire
+
+	def get_movement(self):
+		"""Получение направления движения (по осям x и y)"""
+		return self.movement
+
+	def get_mouse_pos(self):
+		"""Получение позиции мыши на экране"""
+		return self.mouse_pos
+
+	def get_events(self):
+		"""Получение синтетических событий за тик"""
+		if not self.auto_fire:
+			return []
+		return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=self.mouse_pos)]
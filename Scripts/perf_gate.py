@@ -0,0 +1,171 @@
+import os
+import sys
+import json
+import argparse
+from statistics import median
+
+# Добавляем корневую директорию проекта и папку Scripts в sys.path
+dir_scripts = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(dir_scripts, '..'))
+for path in (dir_scripts, project_root):
+	if path not in sys.path:
+		sys.path.append(path)
+
+from benchmark import SCENARIOS, run_scenario_isolated, get_environment_info
+from constants import (
+	ENEMY_BACKEND, PERF_BASELINE_PATH, PERF_GATE_SCENARIOS, PERF_GATE_REPETITIONS,
+	PERF_GATE_TOLERANCE, PERF_GATE_NOISE_FACTOR, PERF_GATE_MIN_DELTA_MS, PERF_GATE_PERCENTILES
+)
+
+EXIT_OK = 0
+EXIT_REGRESSION = 1
+EXIT_NO_BASELINE = 2
+
+# Метрика всего прогона; в отличие от времени фаз, чем она больше, тем лучше
+RUN_METRIC = 'ticks_per_second'
+
+
+def _mad(values):
+	"""Медианное абсолютное отклонение - устойчивая оценка шума между повторами"""
+	center = median(values)
+	return median(abs(value - center) for value in values)
+
+
+def collect_samples(names, repetitions, enemy_backend, render, ticks):
+	"""Прогон сценариев repetitions раз; собираются перцентили PERF_GATE_PERCENTILES каждой
+	фазы (метрика "фаза p99" ловит редкие подвисания, которые не видны в медиане) и
+	ticks_per_second всего прогона"""
+	samples = {}
+	for name in names:
+		metrics = {}
+		for repetition in range(repetitions):
+			print(f"  {name}: run {repetition + 1}/{repetitions}", file=sys.stderr)
+			result = run_scenario_isolated(name, enemy_backend, render, ticks)
+			for path, stats in result['phases'].items():
+				for percentile in PERF_GATE_PERCENTILES:
+					metrics.setdefault(f"{path} {percentile[:-3]}", []).append(stats[percentile])
+			metrics.setdefault(RUN_METRIC, []).append(result[RUN_METRIC])
+		samples[name] = metrics
+	return samples
+
+
+def compare(baseline, current, tolerance, noise_factor, min_delta_ms):
+	"""Сравнение замеров с эталоном; возвращает строки таблицы и признак регрессии.
+
+	Метрика считается ухудшившейся, если медиана повторов изменилась в худшую
+	сторону больше чем на tolerance, больше чем на noise_factor суммарного
+	разброса (MAD) эталона и текущих замеров и, для времени фаз, больше чем на
+	min_delta_ms. Для ticks_per_second хуже - это меньше."""
+	rows = []
+	regressed = False
+	for name, metrics in current.items():
+		baseline_metrics = baseline.get(name, {})
+		for path, values in metrics.items():
+			baseline_values = baseline_metrics.get(path)
+			current_median = median(values)
+			if not baseline_values:
+				rows.append((name, path, None, current_median, None, 'new'))
+				continue
+			baseline_median = median(baseline_values)
+			# Знак выбирается так, чтобы положительная разница всегда означала замедление
+			sign = -1 if path == RUN_METRIC else 1
+			delta = sign * (current_median - baseline_median)
+			noise = noise_factor * (_mad(baseline_values) + _mad(values))
+			change = delta / baseline_median if baseline_median > 0 else 0.0
+			min_delta = 0.0 if path == RUN_METRIC else min_delta_ms
+			if delta > min_delta and delta > noise and change > tolerance:
+				status = 'REGRESSION'
+				regressed = True
+			elif -delta > min_delta and -delta > noise and -change > tolerance:
+				status = 'faster'
+			else:
+				status = 'ok'
+			rows.append((name, path, baseline_median, current_median, sign * change, status))
+	return rows, regressed
+
+
+def format_table(rows):
+	"""Форматирование результатов сравнения в текстовую таблицу"""
+	header = ('scenario', 'metric', 'baseline', 'current', 'change', 'status')
+	lines = []
+	for name, path, baseline_ms, current_ms, change, status in rows:
+		lines.append((
+			name, path,
+			f"{baseline_ms:.3f}" if baseline_ms is not None else '-',
+			f"{current_ms:.3f}",
+			f"{change * 100:+.1f}%" if change is not None else '-',
+			status,
+		))
+	widths = [max(len(str(row[column])) for row in [header] + lines) for column in range(len(header))]
+	separator = '  '.join('-' * width for width in widths)
+	formatted = ['  '.join(str(value).ljust(width) for value, width in zip(header, widths)), separator]
+	formatted.extend('  '.join(str(value).ljust(width) for value, width in zip(row, widths)) for row in lines)
+	return '\n'.join(formatted)
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Performance regression gate")
+	parser.add_argument('scenarios', nargs='*', metavar='SCENARIO',
+	                    help="scenarios to check (default: " + ", ".join(PERF_GATE_SCENARIOS) + ")")
+	parser.add_argument('--baseline', default=PERF_BASELINE_PATH, help="baseline JSON file")
+	parser.add_argument('--update-baseline', action='store_true', help="record a new baseline instead of checking")
+	parser.add_argument('--repetitions', type=int, default=PERF_GATE_REPETITIONS)
+	parser.add_argument('--tolerance', type=float, default=PERF_GATE_TOLERANCE,
+	                    help="allowed relative slowdown of a metric median (0.1 = 10%%)")
+	parser.add_argument('--noise-factor', type=float, default=PERF_GATE_NOISE_FACTOR,
+	                    help="slowdown must also exceed this many MADs of run-to-run noise")
+	parser.add_argument('--min-delta-ms', type=float, default=PERF_GATE_MIN_DELTA_MS,
+	                    help="ignore slowdowns smaller than this many milliseconds")
+	parser.add_argument('--backend', choices=('objects', 'numpy'), default=None)
+	parser.add_argument('--ticks', type=int, default=None, help="override the scenario tick count")
+	args = parser.parse_args()
+
+	unknown = [name for name in args.scenarios if name not in SCENARIOS]
+	if unknown:
+		parser.error("unknown scenario: " + ", ".join(unknown))
+
+	if args.update_baseline:
+		names = args.scenarios or list(PERF_GATE_SCENARIOS)
+		backend = args.backend or ENEMY_BACKEND
+		samples = collect_samples(names, args.repetitions, backend, True, args.ticks)
+		baseline = {
+			'environment': get_environment_info(backend, True),
+			'ticks': args.ticks,
+			'repetitions': args.repetitions,
+			'percentiles': list(PERF_GATE_PERCENTILES),
+			'samples': samples,
+		}
+		directory = os.path.dirname(args.baseline)
+		if directory:
+			os.makedirs(directory, exist_ok=True)
+		with open(args.baseline, 'w', encoding='utf-8') as file:
+			json.dump(baseline, file, indent=2)
+		print(f"Baseline written to {args.baseline}")
+		return EXIT_OK
+
+	if not os.path.exists(args.baseline):
+		print(f"Baseline {args.baseline} not found; record one with --update-baseline", file=sys.stderr)
+		return EXIT_NO_BASELINE
+	with open(args.baseline, encoding='utf-8') as file:
+		baseline = json.load(file)
+	if 'percentiles' not in baseline:
+		# Эталон старого формата хранит только p50 под именами фаз - с ним нечего сравнивать
+		print(f"Baseline {args.baseline} has an old format; re-record it with --update-baseline", file=sys.stderr)
+		return EXIT_NO_BASELINE
+
+	# Сценарии и настройки прогона берутся из эталона, чтобы сравнение было честным
+	names = args.scenarios or list(baseline['samples'])
+	backend = args.backend or baseline['environment']['enemy_backend']
+	ticks = args.ticks if args.ticks is not None else baseline.get('ticks')
+	current = collect_samples(names, args.repetitions, backend, True, ticks)
+	rows, regressed = compare(baseline['samples'], current, args.tolerance,
+	                          args.noise_factor, args.min_delta_ms)
+	print(format_table(rows))
+	if regressed:
+		print("\nPerformance regression detected", file=sys.stderr)
+		return EXIT_REGRESSION
+	return EXIT_OK
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -1,18 +1,34 @@
 import pygame
 from pygame.math import Vector2
 
-from utils import load_sprite
+from animation import Animation, AnimationSet, get_animation_set
 from constants import (SPEED, BASE_DAMAGE, INITIAL_XP_TO_LEVEL_UP, XP_LEVEL_MULTIPLIER,
                      BASE_MAX_MANA, BASE_PLAYER_HP)
 from weapon import MeleeWeapon, RangeWeapon, Pistol
 from game_object import GameObject
+from render_queue import RenderQueue
 from weapon_stats import WEAPON_STATS
 from camera import Camera
+from input_source import PygameInput
+
+PLAYER_IDLE_SPRITE_NAMES = [f'Player/Player_Idle/player_idle_{i}' for i in range(1, 7)]
+PLAYER_MOVE_SPRITE_NAMES = [f'Player/Player_Move/player_move_{i}' for i in range(1, 7)]
+PLAYER_DIE_SPRITE_NAMES = [f'Player/Player_Die/player_die_{i}' for i in range(1, 4)]
+
+
+def _build_player_animations():
+	"""Создание набора анимаций игрока"""
+	return AnimationSet({
+		'idle': Animation.from_names(PLAYER_IDLE_SPRITE_NAMES, 0.5),
+		'move': Animation.from_names(PLAYER_MOVE_SPRITE_NAMES, 0.15),
+		'die': Animation.from_names(PLAYER_DIE_SPRITE_NAMES, 0.4),
+	})
 
 
 class Player(GameObject):
 	"""Класс для управления игровым персонажем"""
-	def __init__(self, position: tuple, starting_weapon_type: str):
+	def __init__(self, position: tuple, starting_weapon_type: str, input_source=None):
+		self.input_source = input_source if input_source is not None else PygameInput()
 		self.direction = Vector2(0, 0)
 		self.speed = SPEED
 		self.damage = BASE_DAMAGE
@@ -25,40 +41,18 @@ class Player(GameObject):
 		self.xp_for_next_level = INITIAL_XP_TO_LEVEL_UP
 		self.xp_multiplier = 1.0
 
-		self.idle_sprites = [
-			load_sprite('Player/Player_Idle/player_idle_1'),
-			load_sprite('Player/Player_Idle/player_idle_2'),
-			load_sprite('Player/Player_Idle/player_idle_3'),
-			load_sprite('Player/Player_Idle/player_idle_4'),
-			load_sprite('Player/Player_Idle/player_idle_5'),
-			load_sprite('Player/Player_Idle/player_idle_6'),
-		]
-		self.move_sprites = [
-			load_sprite('Player/Player_Move/player_move_1'),
-			load_sprite('Player/Player_Move/player_move_2'),
-			load_sprite('Player/Player_Move/player_move_3'),
-			load_sprite('Player/Player_Move/player_move_4'),
-			load_sprite('Player/Player_Move/player_move_5'),
-			load_sprite('Player/Player_Move/player_move_6'),
-		]
-		self.death_sprites = [
-			load_sprite('Player/Player_Die/player_die_1'),
-			load_sprite('Player/Player_Die/player_die_2'),
-			load_sprite('Player/Player_Die/player_die_3'),
-		]
+		self.animations = get_animation_set('player', _build_player_animations)
 		# Инициализация переменных для анимации
 		self.last_direction = Vector2(1, 0)
 		self.current_sprite_index = 0
-		self.current_animation = self.idle_sprites
+		self.current_animation = self.animations['idle']
 		self.previous_animation = self.current_animation
-		self.animation_speed = 0.5
 		self.animation_timer = 0
 		self.is_dying = False
 		self.death_frame_index = 0
 		self.death_timer = 0.0
-		self.death_frame_duration = 0.4
 		# Инициализация базовых переменных
-		super().__init__(position, self.idle_sprites[0], Vector2(0))
+		super().__init__(position, self.animations['idle'][0], Vector2(0))
 		self.active_weapon = None
 		# Выбор начального оружия
 		if starting_weapon_type == 'melee':
@@ -116,8 +110,9 @@ class Player(GameObject):
 				self.death_frame_index = 0
 				self.death_timer = 0.0
 
-				if self.death_sprites:
-					self.sprite = self.death_sprites[0]
+				death_animation = self.animations['die']
+				if len(death_animation):
+					self.sprite = death_animation[0]
 					self.rect.size = self.sprite.get_size()
 	
 	def gain_xp(self, amount):
@@ -164,7 +159,7 @@ class Player(GameObject):
 			if event.type == pygame.MOUSEBUTTONDOWN:
 				if event.button == 1:
 					if self.active_weapon and not self.is_dying:
-						mouse_screen_pos = pygame.mouse.get_pos()
+						mouse_screen_pos = self.input_source.get_mouse_pos()
 						mouse_world_pos = camera.screen_to_world(mouse_screen_pos)
 						self.active_weapon.attack(mouse_world_pos, game_state)
 	
@@ -173,19 +168,20 @@ class Player(GameObject):
 		if self.is_dying:
 			self.velocity = Vector2(0, 0)
 			self.death_timer += dt
-			target_frame_index = int(self.death_timer // self.death_frame_duration)
-			current_frame_index = min(target_frame_index, len(self.death_sprites) - 1)
+			death_animation = self.animations['die']
+			target_frame_index = int(self.death_timer // death_animation.frame_duration)
+			current_frame_index = min(target_frame_index, len(death_animation) - 1)
 			if current_frame_index != self.death_frame_index:
 				self.death_frame_index = current_frame_index
-				self.sprite = self.death_sprites[self.death_frame_index]
+				self.sprite = death_animation[self.death_frame_index]
 				self.rect.size = self.sprite.get_size()
 			self.rect.center = (int(self.position.x), int(self.position.y))
 			return
 		# Обработка движения игрока
-		keys = pygame.key.get_pressed()
+		move_x, move_y = self.input_source.get_movement()
 		self.direction = Vector2(0, 0)
-		self.direction.x = keys[pygame.K_d] - keys[pygame.K_a]
-		self.direction.y = keys[pygame.K_s] - keys[pygame.K_w]
+		self.direction.x = move_x
+		self.direction.y = move_y
 
 		# Обработка направления движения
 		if self.direction.x != 0:
@@ -196,11 +192,9 @@ class Player(GameObject):
 		if self.direction.length_squared() > 0:
 			self.direction.normalize_ip()
 			self.velocity = self.direction * self.speed
-			self.current_animation = self.move_sprites
-			self.animation_speed = 0.15
+			self.current_animation = self.animations['move']
 		else:
-			self.current_animation = self.idle_sprites
-			self.animation_speed = 0.5
+			self.current_animation = self.animations['idle']
 			self.velocity *= 0.6
 			if self.velocity.length_squared() < 1:
 				self.velocity = Vector2(0, 0)
@@ -210,25 +204,24 @@ class Player(GameObject):
 			self.current_sprite_index = 0
 			self.previous_animation = self.current_animation
 		
+		frame_duration = self.current_animation.frame_duration
 		self.animation_timer += dt
-		if self.animation_timer >= self.animation_speed:
-			self.animation_timer %= self.animation_speed
+		if self.animation_timer >= frame_duration:
+			self.animation_timer %= frame_duration
 			self.current_sprite_index = (self.current_sprite_index + 1) % len(self.current_animation)
 		
-		current_sprite = self.current_animation[self.current_sprite_index]
-		if self.last_direction.x < 0:
-			self.sprite = pygame.transform.flip(current_sprite, True, False)
-		else:
-			self.sprite = current_sprite
+		self.sprite = self.current_animation.frame(self.current_sprite_index, self.last_direction.x < 0)
 		
 		self.position += self.velocity * dt
 		self.rect.center = self.position
 		if self.active_weapon:
 			self.active_weapon.update(dt, game_state)
 	
-	def draw(self, surface, camera: Camera):
-		"""Отрисовка игрока"""
-		super().draw(surface, camera)
+	def draw(self, surface, camera: Camera, render_queue=None):
+		"""Отрисовка игрока: спрайт, полоска здоровья, точки перезарядки и оружие выводятся
+		одним вызовом Surface.blits через очередь render_queue"""
+		queue = render_queue if render_queue is not None else RenderQueue()
+		queue.add_world_objects([self], camera, surface.get_width(), surface.get_height())
 		if not self.is_dying and self.active_weapon:
 			num_dots, dot_sprite = self.active_weapon.get_cooldown_dots()
 			# Отрисовка точек на экране
@@ -238,22 +231,23 @@ class Player(GameObject):
 				spacing = 2
 				# Расчет ширины всех точек
 				total_dots_width = (num_dots * dot_width) + ((num_dots - 1) * spacing)
-				# Расчет координат для отрисовки
-				world_x = self.position.x
-				world_y_top = self.position.y - (self.sprite.get_height() / 2)
+				# Расчет координат для отрисовки (с интерполяцией между шагами симуляции)
+				motion_x, motion_y = camera.get_motion_offset(self)
+				world_x = self.position.x + motion_x
+				world_y_top = self.position.y + motion_y - (self.sprite.get_height() / 2)
 				# Расчет масштаба
 				zoom = camera.zoom
 				# Расчет координат центра экрана
-				cam_x, cam_y = camera.camera.topleft
+				cam_x, cam_y = camera.get_offset()
 				screen_center_x = (world_x - cam_x) * zoom
 				screen_top_y = (world_y_top - cam_y) * zoom
 				start_x = screen_center_x - (total_dots_width // 2)
 				y_pos = screen_top_y - dot_height - 20
-				# Отрисовка точек
 				for i in range(num_dots):
-					dot_x = start_x + i * (dot_width + spacing)
-					surface.blit(dot_sprite, (int(dot_x), int(y_pos)))
+					queue.add(dot_sprite, (int(start_x + i * (dot_width + spacing)), int(y_pos)))
 		# Отрисовка оружия
-		if not self.is_dying:
-			if self.active_weapon:
-				self.active_weapon.draw(surface, camera)
+		if not self.is_dying and self.active_weapon:
+			weapon_item = self.active_weapon.get_draw_item(camera)
+			if weapon_item is not None:
+				queue.add(*weapon_item)
+		queue.flush(surface)
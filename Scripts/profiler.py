@@ -0,0 +1,174 @@
+import gc
+import sys
+from collections import deque
+from time import perf_counter
+
+from constants import PROFILER_WINDOW
+
+
+class _NullSection:
+	"""Пустой участок замера, который используется при выключенном профилировщике"""
+	__slots__ = ()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section:
+	"""Замер времени участка кода внутри кадра"""
+	__slots__ = ('profiler', 'name', 'start')
+
+	def __init__(self, profiler, name):
+		self.profiler = profiler
+		self.name = name
+		self.start = 0.0
+
+	def __enter__(self):
+		self.profiler._stack.append(self.name)
+		self.start = perf_counter()
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		elapsed = perf_counter() - self.start
+		profiler = self.profiler
+		path = '/'.join(profiler._stack)
+		profiler._stack.pop()
+		profiler._frame_times[path] = profiler._frame_times.get(path, 0.0) + elapsed
+		if profiler.tracer is not None:
+			profiler.tracer.complete(self.name, self.start, elapsed)
+		return False
+
+
+def _percentile(sorted_values, fraction):
+	"""Перцентиль по отсортированным значениям (ближайший ранг)"""
+	return sorted_values[int(round(fraction * (len(sorted_values) - 1)))]
+
+
+class FrameProfiler:
+	"""Класс иерархического профилировщика кадров.
+
+	Участки вкладываются друг в друга (путь вида 'update/enemies'), время
+	участка суммируется за кадр, а перцентили считаются по последним window
+	кадрам. Если подключён tracer (TraceRecorder), участки и кадры также
+	пишутся в трассировку. Когда профилировщик выключен и трассировка не
+	ведётся, section возвращает общий пустой объект, поэтому замеры почти
+	ничего не стоят."""
+	def __init__(self, window=PROFILER_WINDOW):
+		self.enabled = False
+		self.tracer = None
+		# Замеры ведутся, если включён профилировщик или подключена трассировка
+		self.active = False
+		self.window = window
+		self.frame_count = 0
+		self._stack = []
+		self._frame_times = {}
+		self._frame_start = None
+		self._blocks_start = 0
+		self._collections_start = 0
+		self._history = {}
+		self.counts = {}
+
+	def set_enabled(self, enabled):
+		"""Включение или выключение замеров"""
+		if self.enabled == enabled:
+			return
+		self.enabled = enabled
+		self._update_active()
+
+	def _update_active(self):
+		"""Пересчёт флага активности; незавершённый кадр отбрасывается"""
+		self.active = self.enabled or self.tracer is not None
+		self._stack.clear()
+		self._frame_times.clear()
+		self._frame_start = None
+
+	def attach_tracer(self, tracer):
+		"""Подключение записи трассировки"""
+		self.tracer = tracer
+		self._update_active()
+
+	def detach_tracer(self):
+		"""Отключение записи трассировки; возвращает отключённый объект"""
+		tracer = self.tracer
+		self.tracer = None
+		self._update_active()
+		return tracer
+
+	def toggle(self):
+		"""Переключение профилировщика"""
+		self.set_enabled(not self.enabled)
+
+	def reset(self):
+		"""Сброс накопленной статистики"""
+		self._history.clear()
+		self.counts.clear()
+		self.frame_count = 0
+
+	def section(self, name):
+		"""Контекстный менеджер для замера участка кода"""
+		if not self.active:
+			return _NULL_SECTION
+		return _Section(self, name)
+
+	def set_count(self, name, value):
+		"""Запись счётчика кадра (число врагов, снарядов и т.п.)"""
+		if self.active:
+			self.counts[name] = value
+
+	def mark(self, name, **args):
+		"""Мгновенное событие в трассировке (начало волны, выбор улучшений и т.п.)"""
+		if self.tracer is not None:
+			self.tracer.instant(name, args)
+
+	def begin_frame(self):
+		"""Начало кадра"""
+		if not self.active:
+			return
+		self._frame_times.clear()
+		self._blocks_start = sys.getallocatedblocks()
+		self._collections_start = self._gc_collections()
+		self._frame_start = perf_counter()
+
+	def end_frame(self):
+		"""Завершение кадра и сохранение его замеров в историю"""
+		if not self.active or self._frame_start is None:
+			return
+		frame_start = self._frame_start
+		frame_times = self._frame_times
+		frame_times['frame'] = perf_counter() - frame_start
+		self._frame_start = None
+		# Прирост выделенных блоков памяти и число сборок мусора за кадр
+		self.counts['allocated_blocks'] = sys.getallocatedblocks() - self._blocks_start
+		self.counts['gc_collections'] = self._gc_collections() - self._collections_start
+		for path, elapsed in frame_times.items():
+			history = self._history.get(path)
+			if history is None:
+				history = self._history[path] = deque(maxlen=self.window)
+			history.append(elapsed)
+		self.frame_count += 1
+		if self.tracer is not None:
+			self.tracer.complete('frame', frame_start, frame_times['frame'], self.counts)
+			self.tracer.counter('counts', self.counts, frame_start)
+
+	@staticmethod
+	def _gc_collections():
+		return sum(stats['collections'] for stats in gc.get_stats())
+
+	def get_stats(self):
+		"""Получение перцентилей времени участков в миллисекундах: {путь: (p50, p95, p99)}"""
+		stats = {}
+		for path in sorted(self._history, key=lambda path: (path != 'frame', path)):
+			values = sorted(self._history[path])
+			if not values:
+				continue
+			stats[path] = tuple(_percentile(values, fraction) * 1000 for fraction in (0.5, 0.95, 0.99))
+		return stats
+
+
+profiler = FrameProfiler()
@@ -0,0 +1,185 @@
+from math import atan2, degrees
+from pygame.math import Vector2
+
+from game_object import GameObject
+from utils import get_rotated_sprite
+from constants import PROJECTILE_POOL_CAPACITY
+
+try:
+    import numpy
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class PooledProjectile(GameObject):
+    """Класс снаряда из пула; позиция, скорость и время жизни хранятся в массивах ProjectilePool"""
+    def __init__(self, pool):
+        self.pool = pool
+        self.slot = -1
+        self.sprite = None
+        self.damage = 0
+        self.knockback = 0
+        self.stun = 0
+
+    @property
+    def position(self):
+        x, y = self.pool.positions[self.slot]
+        return Vector2(float(x), float(y))
+
+    @property
+    def previous_position(self):
+        x, y = self.pool.previous_positions[self.slot]
+        return Vector2(float(x), float(y))
+
+    @property
+    def velocity(self):
+        x, y = self.pool.velocities[self.slot]
+        return Vector2(float(x), float(y))
+
+    @property
+    def lifetime(self):
+        return float(self.pool.lifetimes[self.slot])
+
+    @property
+    def rect(self):
+        x, y = self.pool.positions[self.slot]
+        return self.sprite.get_rect(center=(float(x), float(y)))
+
+    @property
+    def radius(self):
+        return self.sprite.get_width() / 2
+
+    @property
+    def is_dead(self):
+        return self.slot < 0
+
+
+class ProjectilePool:
+    """Класс пула снарядов с заранее выделенными слотами.
+
+    Активные снаряды занимают слоты [0, count); погибший снаряд заменяется
+    последним активным, а позиции и время жизни обновляются одним проходом."""
+    def __init__(self, capacity=PROJECTILE_POOL_CAPACITY):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy is required for the projectile pool")
+        self.count = 0
+        self.capacity = 0
+        self.positions = None
+        self.previous_positions = None
+        self.velocities = None
+        self.lifetimes = None
+        # Список активных снарядов в порядке слотов (его же использует отрисовка)
+        self.projectiles = []
+        self._free = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """Выделение (или расширение) слотов"""
+        positions = numpy.zeros((capacity, 2))
+        previous_positions = numpy.zeros((capacity, 2))
+        velocities = numpy.zeros((capacity, 2))
+        lifetimes = numpy.zeros(capacity)
+        if self.count:
+            positions[:self.count] = self.positions[:self.count]
+            previous_positions[:self.count] = self.previous_positions[:self.count]
+            velocities[:self.count] = self.velocities[:self.count]
+            lifetimes[:self.count] = self.lifetimes[:self.count]
+        self.positions = positions
+        self.previous_positions = previous_positions
+        self.velocities = velocities
+        self.lifetimes = lifetimes
+        self._free.extend(PooledProjectile(self) for _ in range(capacity - self.capacity))
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, position, direction: Vector2, speed: float, sprite_name: str,
+              damage: float, knockback: float, stun: float, lifetime: float = 5):
+        """Запуск снаряда из свободного слота"""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        slot = self.count
+        self.count += 1
+
+        projectile = self._free.pop()
+        projectile.slot = slot
+        angle = degrees(atan2(-direction.y, direction.x))
+        projectile.sprite = get_rotated_sprite(sprite_name, angle)
+        projectile.damage = damage
+        projectile.knockback = knockback
+        projectile.stun = stun
+
+        self.positions[slot] = (position[0], position[1])
+        self.previous_positions[slot] = self.positions[slot]
+        self.velocities[slot] = (direction.x * speed, direction.y * speed)
+        self.lifetimes[slot] = lifetime
+        self.projectiles.append(projectile)
+        return projectile
+
+    def _release(self, slot):
+        """Освобождение слота с переносом последнего снаряда на его место"""
+        last = self.count - 1
+        projectile = self.projectiles[slot]
+        if slot != last:
+            moved = self.projectiles[last]
+            self.positions[slot] = self.positions[last]
+            self.previous_positions[slot] = self.previous_positions[last]
+            self.velocities[slot] = self.velocities[last]
+            self.lifetimes[slot] = self.lifetimes[last]
+            moved.slot = slot
+            self.projectiles[slot] = moved
+        self.projectiles.pop()
+        self.count -= 1
+        projectile.slot = -1
+        projectile.sprite = None
+        self._free.append(projectile)
+
+    def query_rect(self, rect):
+        """Снаряды, центр которых лежит внутри прямоугольника (в порядке слотов)"""
+        positions = self.positions[:self.count]
+        inside = ((positions[:, 0] >= rect.left) & (positions[:, 0] < rect.right)
+                  & (positions[:, 1] >= rect.top) & (positions[:, 1] < rect.bottom))
+        projectiles = self.projectiles
+        return [projectiles[slot] for slot in numpy.flatnonzero(inside)]
+
+    def store_previous_positions(self):
+        """Запоминание позиций перед шагом симуляции для интерполяции отрисовки"""
+        self.previous_positions[:self.count] = self.positions[:self.count]
+
+    def clear(self):
+        """Освобождение всех снарядов"""
+        while self.count:
+            self._release(self.count - 1)
+
+    def update(self, dt, game_state):
+        """Обновление всех снарядов: попадания, движение и время жизни"""
+        n = self.count
+        if n == 0:
+            return
+
+        # Проверка попаданий до движения, как у обычного Projectile
+        hits = numpy.zeros(n, dtype=bool)
+        enemy_grid = game_state.enemy_grid
+        for slot in range(n):
+            projectile = self.projectiles[slot]
+            rect = projectile.rect
+            for enemy in enemy_grid.query_rect(rect):
+                if not enemy.alive:
+                    continue
+                if rect.colliderect(enemy.rect):
+                    enemy.take_damage(projectile.damage)
+                    enemy.apply_knockback(projectile.velocity.normalize(), projectile.knockback, projectile.stun)
+                    hits[slot] = True
+                    break
+
+        # Движение и уменьшение времени жизни одним проходом
+        moving = ~hits
+        self.positions[:n][moving] += self.velocities[:n][moving] * dt
+        self.lifetimes[:n][moving] -= dt
+
+        dead = hits | (self.lifetimes[:n] <= 0)
+        # Освобождение с конца, чтобы перенос последнего снаряда не затрагивал ещё не обработанные слоты
+        for slot in numpy.flatnonzero(dead)[::-1]:
+            self._release(int(slot))
@@ -0,0 +1,87 @@
+import pygame
+
+from utils import scaled_sprite_cache
+from constants import ENTITY_HP_BAR_HEIGHT, ENTITY_HP_BAR_PADDING, ENTITY_HP_BAR_BG_COLOR, ENTITY_HP_BAR_FG_COLOR
+
+
+class RenderQueue:
+	"""Класс очереди отрисовки слоя.
+
+	Объекты добавляются в очередь парами (поверхность, позиция) в порядке
+	отрисовки, а flush выводит весь слой одним вызовом Surface.blits вместо
+	отдельных blit и pygame.draw.rect на каждый объект. Полоски здоровья
+	выводятся заранее залитыми поверхностями из кэша, поэтому попадают в тот
+	же вызов и перекрываются соседними спрайтами так же, как раньше."""
+	def __init__(self):
+		self.items = []
+		self._bars = {}
+
+	def __len__(self):
+		return len(self.items)
+
+	def add(self, surface, dest):
+		"""Добавление поверхности в очередь"""
+		self.items.append((surface, dest))
+
+	def _bar(self, width, color):
+		"""Залитая цветом поверхность полоски (создаётся один раз на ширину и цвет)"""
+		key = (width, color)
+		bar = self._bars.get(key)
+		if bar is None:
+			bar = pygame.Surface((width, ENTITY_HP_BAR_HEIGHT))
+			bar.fill(color)
+			self._bars[key] = bar
+		return bar
+
+	def add_hp_bar(self, left, top, width, ratio):
+		"""Добавление полоски здоровья над спрайтом с экранными координатами (left, top)"""
+		y = top - ENTITY_HP_BAR_HEIGHT - ENTITY_HP_BAR_PADDING
+		if width > 0:
+			self.items.append((self._bar(width, ENTITY_HP_BAR_BG_COLOR), (left, y)))
+		fill_width = int(width * ratio)
+		if fill_width > 0:
+			self.items.append((self._bar(fill_width, ENTITY_HP_BAR_FG_COLOR), (left, y)))
+
+	def add_world_objects(self, objects, camera, view_width, view_height):
+		"""Добавление спрайтов объектов мира и их полосок здоровья, попадающих в кадр.
+
+		Повторяет GameObject.draw (camera.apply, масштабирование, проверка
+		видимости), но смещение камеры и интерполяция считаются один раз на
+		слой; возвращает число добавленных объектов."""
+		offset_x, offset_y = camera.get_offset()
+		zoom = camera.zoom
+		interpolate = camera.alpha < 1.0
+		back = 1.0 - camera.alpha
+		get_scaled = scaled_sprite_cache.get
+		items = self.items
+		drawn = 0
+		for obj in objects:
+			rect = obj.rect
+			x = rect.x
+			y = rect.y
+			if interpolate:
+				previous = getattr(obj, 'previous_position', None)
+				if previous is not None:
+					position = obj.position
+					x += (previous.x - position.x) * back
+					y += (previous.y - position.y) * back
+			screen_x = int((x - offset_x) * zoom)
+			screen_y = int((y - offset_y) * zoom)
+			screen_w = int(rect.width * zoom)
+			screen_h = int(rect.height * zoom)
+			# Та же проверка, что и Rect.colliderect с прямоугольником экрана
+			if (screen_w <= 0 or screen_h <= 0 or screen_x >= view_width or screen_y >= view_height
+			        or screen_x + screen_w <= 0 or screen_y + screen_h <= 0):
+				continue
+			items.append((get_scaled(obj.sprite, zoom), (screen_x, screen_y)))
+			hp = getattr(obj, 'hp', None)
+			if hp is not None and hp > 0 and hasattr(obj, 'max_hp'):
+				self.add_hp_bar(screen_x, screen_y, screen_w, max(0, hp / obj.max_hp))
+			drawn += 1
+		return drawn
+
+	def flush(self, surface):
+		"""Вывод всех поверхностей слоя одним вызовом и очистка очереди"""
+		if self.items:
+			surface.blits(self.items, doreturn=False)
+			self.items.clear()
@@ -0,0 +1,69 @@
+class SceneRegistry:
+	"""Класс реестра сцен с кэшированием экземпляров и хуками жизненного цикла.
+
+	Сцена регистрируется под именем состояния вместе с фабрикой. Кэшируемая
+	сцена создаётся при первом входе и дальше живёт вместе со своими ресурсами
+	(видео, кнопки, отрисованный текст): при уходе с неё вызывается on_suspend,
+	при возвращении - on_resume. Некэшируемая сцена (например, игра, у которой
+	каждый запуск свой) создаётся заново при каждом входе, а при уходе
+	закрывается через on_exit. После создания любой сцены вызывается on_enter.
+	Хуки необязательны: вызываются только те, что сцена определяет."""
+	def __init__(self):
+		self._factories = {}
+		self._cached = {}
+		self._instances = {}
+		self.active = None
+		self.active_name = None
+
+	def register(self, name, factory, cached=True):
+		"""Регистрация сцены; factory вызывается с аргументами из switch"""
+		self._factories[name] = factory
+		self._cached[name] = cached
+
+	def get(self, name):
+		"""Кэшированный экземпляр сцены или None, если она ещё не создавалась"""
+		return self._instances.get(name)
+
+	@staticmethod
+	def _call_hook(scene, hook):
+		method = getattr(scene, hook, None)
+		if method is not None:
+			method()
+
+	def _leave_active(self):
+		"""Приостановка кэшируемой или закрытие некэшируемой активной сцены"""
+		if self.active is None:
+			return
+		if self._cached.get(self.active_name):
+			self._call_hook(self.active, 'on_suspend')
+		else:
+			self._call_hook(self.active, 'on_exit')
+		self.active = None
+		self.active_name = None
+
+	def switch(self, name, **kwargs):
+		"""Переход на сцену name; возвращает её экземпляр"""
+		if name == self.active_name and self._cached[name]:
+			return self.active
+		self._leave_active()
+		scene = self._instances.get(name)
+		if scene is not None:
+			self._call_hook(scene, 'on_resume')
+		else:
+			scene = self._factories[name](**kwargs)
+			if self._cached[name]:
+				self._instances[name] = scene
+			self._call_hook(scene, 'on_enter')
+		self.active = scene
+		self.active_name = name
+		return scene
+
+	def close(self):
+		"""Закрытие активной и всех кэшированных сцен (при выходе из игры)"""
+		if self.active is not None and not self._cached.get(self.active_name):
+			self._call_hook(self.active, 'on_exit')
+		for scene in self._instances.values():
+			self._call_hook(scene, 'on_exit')
+		self._instances.clear()
+		self.active = None
+		self.active_name = None
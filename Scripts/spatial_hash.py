@@ -0,0 +1,111 @@
+from pygame.math import Vector2
+
+from constants import ENEMY_GRID_CELL_SIZE
+
+
+class SpatialHash:
+	"""Класс равномерной сетки для быстрого поиска объектов рядом с точкой.
+
+	Объект хранится в одной ячейке по своей позиции (position). Размер ячейки
+	должен быть не меньше размера объектов, тогда поиск по прямоугольнику с
+	запасом в одну ячейку не пропускает пересечения."""
+	def __init__(self, cell_size=ENEMY_GRID_CELL_SIZE):
+		self.cell_size = cell_size
+		# Ячейки хранят словари вместо множеств, чтобы порядок обхода был детерминированным
+		self._cells = {}
+		self._object_cells = {}
+
+	def __len__(self):
+		return len(self._object_cells)
+
+	def __contains__(self, obj):
+		return obj in self._object_cells
+
+	def _cell_of(self, x, y):
+		"""Получение координат ячейки для точки"""
+		return int(x // self.cell_size), int(y // self.cell_size)
+
+	def insert(self, obj):
+		"""Добавление объекта в сетку"""
+		cell = self._cell_of(obj.position.x, obj.position.y)
+		self._cells.setdefault(cell, {})[obj] = None
+		self._object_cells[obj] = cell
+
+	def remove(self, obj):
+		"""Удаление объекта из сетки"""
+		cell = self._object_cells.pop(obj, None)
+		if cell is None:
+			return
+		bucket = self._cells.get(cell)
+		if bucket is not None:
+			bucket.pop(obj, None)
+			if not bucket:
+				del self._cells[cell]
+
+	def update(self, obj):
+		"""Перенос объекта в новую ячейку, если он её покинул"""
+		old_cell = self._object_cells.get(obj)
+		if old_cell is None:
+			return
+		new_cell = self._cell_of(obj.position.x, obj.position.y)
+		if new_cell == old_cell:
+			return
+		bucket = self._cells[old_cell]
+		del bucket[obj]
+		if not bucket:
+			del self._cells[old_cell]
+		self._cells.setdefault(new_cell, {})[obj] = None
+		self._object_cells[obj] = new_cell
+
+	def clear(self):
+		"""Очистка сетки"""
+		self._cells.clear()
+		self._object_cells.clear()
+
+	def _objects_in_area(self, left, top, right, bottom):
+		"""Список объектов из ячеек, покрывающих область"""
+		min_cx, min_cy = self._cell_of(left, top)
+		max_cx, max_cy = self._cell_of(right, bottom)
+		cells = self._cells
+		result = []
+		for cy in range(min_cy, max_cy + 1):
+			for cx in range(min_cx, max_cx + 1):
+				bucket = cells.get((cx, cy))
+				if bucket:
+					result.extend(bucket)
+		return result
+
+	def query_rect(self, rect, margin=None):
+		"""Поиск кандидатов для пересечения с прямоугольником"""
+		if margin is None:
+			margin = self.cell_size
+		return self._objects_in_area(
+			rect.left - margin, rect.top - margin,
+			rect.right + margin, rect.bottom + margin
+		)
+
+	def query_radius(self, center, radius):
+		"""Поиск объектов, центр которых ближе radius к точке"""
+		center = Vector2(center)
+		radius_sq = radius * radius
+		result = []
+		for obj in self._objects_in_area(center.x - radius, center.y - radius,
+		                                 center.x + radius, center.y + radius):
+			if (obj.position - center).length_squared() < radius_sq:
+				result.append(obj)
+		return result
+
+	def query_cone(self, origin, direction: Vector2, radius, half_angle, include_edge=True):
+		"""Поиск объектов в секторе (half_angle в градусах); include_edge - попадают ли объекты ровно на границе сектора"""
+		origin = Vector2(origin)
+		if direction.length_squared() == 0:
+			return []
+		result = []
+		for obj in self.query_radius(origin, radius):
+			offset = obj.position - origin
+			if offset.length_squared() == 0:
+				continue
+			angle = abs(direction.angle_to(offset))
+			if angle < half_angle or (include_edge and angle == half_angle):
+				result.append(obj)
+		return result
@@ -1,5 +1,4 @@
 import pygame
-import random
 import math
 from pygame.math import Vector2
 
@@ -21,6 +20,8 @@ class Spawner:
         self.spawn_timer = INITIAL_SPAWN_COOLDOWN
         self.current_enemy_level = 1
         self.active = True
+        # Фабрика врагов: класс Slime или SlimeSwarm.spawn с той же сигнатурой
+        self.enemy_factory = Slime
 
     def _calculate_stats(self, level):
         
@@ -43,8 +44,9 @@ class Spawner:
             self._spawn_enemy()
 
     def _spawn_enemy(self):
-        angle = random.uniform(0, 2 * math.pi)
-        radius = random.uniform(SPAWN_RADIUS_MIN, SPAWN_RADIUS_MAX)
+        rng = self.game_state.rng
+        angle = rng.uniform(0, 2 * math.pi)
+        radius = rng.uniform(SPAWN_RADIUS_MIN, SPAWN_RADIUS_MAX)
         offset = Vector2(radius, 0).rotate(math.degrees(angle))
         spawn_pos = self.player.position + offset
 
@@ -52,13 +54,13 @@ class Spawner:
         
 
         try:
-            enemy = Slime(
+            enemy = self.enemy_factory(
                 position=spawn_pos,
                 target=self.player,
                 hp=current_hp,
                 damage=current_damage
             )
-            self.game_state.enemies.append(enemy)
+            self.game_state.add_enemy(enemy)
         except TypeError as e:
              pass
         except Exception as e:
@@ -0,0 +1,91 @@
+from collections import OrderedDict
+
+import pygame
+
+from constants import TEXT_CACHE_MAX_SIZE, FONT_CACHE_MAX_SIZE, TEXT_SIZE_STEP
+
+
+def quantize_size(size, step=TEXT_SIZE_STEP):
+	"""Округление размера шрифта до ближайшей ступени (для анимированных надписей)"""
+	return max(step, int(round(size / step)) * step)
+
+
+def size_steps(min_size, max_size, step=TEXT_SIZE_STEP):
+	"""Все ступени размера шрифта от min_size до max_size"""
+	return list(range(quantize_size(min_size, step), quantize_size(max_size, step) + 1, step))
+
+
+class TextCache:
+	"""Класс кэша шрифтов и отрисованного текста.
+
+	Шрифт создаётся один раз на пару (имя, размер), а поверхность с текстом -
+	один раз на (шрифт, размер, строку, цвет); оба кэша ограничены и вытесняют
+	давно не использованные записи (LRU). Поверхности из кэша общие, поэтому
+	менять их нельзя: прозрачность задаётся через blit_with_alpha."""
+	def __init__(self, max_size=TEXT_CACHE_MAX_SIZE, max_fonts=FONT_CACHE_MAX_SIZE):
+		self.max_size = max_size
+		self.max_fonts = max_fonts
+		self._fonts = OrderedDict()
+		self._surfaces = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+	def get_font(self, size, name=None):
+		"""Шрифт размера size: встроенный (name=None) или системный с именем name"""
+		key = (name, size)
+		font = self._fonts.get(key)
+		if font is not None:
+			self._fonts.move_to_end(key)
+			return font
+		if name is None:
+			font = pygame.font.Font(None, size)
+		else:
+			font = pygame.font.SysFont(name, size)
+		self._fonts[key] = font
+		if len(self._fonts) > self.max_fonts:
+			self._fonts.popitem(last=False)
+		return font
+
+	def has_font(self, size, name=None):
+		return (name, size) in self._fonts
+
+	def render(self, text, size, color, name=None, antialias=True):
+		"""Поверхность с текстом (из кэша или отрисованная и сохранённая в кэш)"""
+		key = (name, size, text, tuple(color), antialias)
+		surface = self._surfaces.get(key)
+		if surface is not None:
+			self._surfaces.move_to_end(key)
+			self.hits += 1
+			return surface
+		self.misses += 1
+		surface = self.get_font(size, name).render(text, antialias, color)
+		self._surfaces[key] = surface
+		if len(self._surfaces) > self.max_size:
+			self._surfaces.popitem(last=False)
+		return surface
+
+	def clear(self):
+		self._fonts.clear()
+		self._surfaces.clear()
+
+	def get_stats(self):
+		return {
+			'fonts': len(self._fonts),
+			'surfaces': len(self._surfaces),
+			'hits': self.hits,
+			'misses': self.misses,
+		}
+
+
+def blit_with_alpha(target, text_surface, dest, alpha):
+	"""Вывод поверхности из кэша с прозрачностью alpha, не меняя её для других вызовов"""
+	if alpha >= 255:
+		target.blit(text_surface, dest)
+		return
+	text_surface.set_alpha(alpha)
+	target.blit(text_surface, dest)
+	text_surface.set_alpha(255)
+
+
+# Глобальный кэш текста (общий для игры и интерфейса)
+text_cache = TextCache()
@@ -0,0 +1,79 @@
+import math
+import pygame
+
+from utils import load_sprite, sprite_cache
+
+
+class TiledBackground:
+	"""Класс бесконечного фона из повторяющейся плитки.
+
+	Для текущего зума один раз собирается слой из масштабированных плиток не
+	меньше экрана (его размер кратен плитке, поэтому слой сам повторяется без
+	швов). Каждый кадр слой выводится одним вызовом Surface.blits: экран
+	покрывают от одного до четырёх прямоугольников слоя со сдвигом по модулю
+	его размера, сколько бы плиток ни было видно."""
+	def __init__(self, tile, view_width, view_height):
+		self.tile = tile
+		self.view_width = int(view_width)
+		self.view_height = int(view_height)
+		self.layer = None
+		self.zoom = None
+
+	def _build_layer(self, zoom):
+		"""Сборка слоя из плиток, масштабированных под зум"""
+		tile_width = int(self.tile.get_width() * zoom)
+		tile_height = int(self.tile.get_height() * zoom)
+		self.zoom = zoom
+		if tile_width <= 0 or tile_height <= 0:
+			self.layer = None
+			return
+		scaled_tile = pygame.transform.scale(self.tile, (tile_width, tile_height))
+		columns = math.ceil(self.view_width / tile_width)
+		rows = math.ceil(self.view_height / tile_height)
+		if columns == 1 and rows == 1:
+			# Плитка больше экрана - она и есть слой
+			self.layer = scaled_tile
+			return
+		self.layer = pygame.Surface((columns * tile_width, rows * tile_height), 0, scaled_tile)
+		self.layer.blits([(scaled_tile, (column * tile_width, row * tile_height))
+		                  for row in range(rows) for column in range(columns)], doreturn=False)
+
+	def draw(self, surface, offset_x, offset_y, zoom):
+		"""Отрисовка фона для камеры со смещением (offset_x, offset_y) в мировых координатах"""
+		if zoom != self.zoom:
+			self._build_layer(zoom)
+		if self.layer is None:
+			surface.fill((0, 0, 0))
+			return
+		layer_width, layer_height = self.layer.get_size()
+		source_x = int(math.floor(offset_x * zoom)) % layer_width
+		source_y = int(math.floor(offset_y * zoom)) % layer_height
+		# Экран делится по границам слоя не более чем на две части по каждой оси
+		first_width = min(layer_width - source_x, self.view_width)
+		first_height = min(layer_height - source_y, self.view_height)
+		columns = [(source_x, 0, first_width)]
+		if first_width < self.view_width:
+			columns.append((0, first_width, self.view_width - first_width))
+		rows = [(source_y, 0, first_height)]
+		if first_height < self.view_height:
+			rows.append((0, first_height, self.view_height - first_height))
+		surface.blits([(self.layer, (dest_x, dest_y), (area_x, area_y, width, height))
+		               for area_y, dest_y, height in rows
+		               for area_x, dest_x, width in columns], doreturn=False)
+
+
+# Фоны по (имя плитки, with_alpha, размер экрана): игра создаётся заново на каждый
+# запуск, а слой, уже собранный под зум, переживает переходы между сценами. При
+# инвалидации кэша спрайтов плитка загружается заново, поэтому фоны сбрасываются
+_backgrounds = {}
+sprite_cache.add_invalidation_callback(lambda name: _backgrounds.clear())
+
+
+def get_tiled_background(name, view_width, view_height, with_alpha=False):
+	"""Общий фон для плитки name и размера экрана"""
+	key = (name, with_alpha, int(view_width), int(view_height))
+	background = _backgrounds.get(key)
+	if background is None:
+		background = TiledBackground(load_sprite(name, with_alpha), view_width, view_height)
+		_backgrounds[key] = background
+	return background
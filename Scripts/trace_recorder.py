@@ -0,0 +1,69 @@
+import os
+import json
+import threading
+from time import perf_counter
+
+
+class TraceRecorder:
+	"""Класс записи событий в формате Chrome Trace Event (JSON-массив).
+
+	События пишутся в файл по мере поступления, поэтому длинную сессию не
+	нужно держать в памяти. Файл открывается в chrome://tracing и Perfetto;
+	время указывается в микросекундах от начала записи."""
+	def __init__(self, path, process_name="Terra"):
+		directory = os.path.dirname(path)
+		if directory:
+			os.makedirs(directory, exist_ok=True)
+		self.path = path
+		self.pid = os.getpid()
+		self._origin = perf_counter()
+		self._file = open(path, 'w', encoding='utf-8')
+		self._file.write("[\n")
+		self._encoder = json.JSONEncoder(separators=(',', ':'))
+		self._write({'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'tid': 0,
+		             'args': {'name': process_name}})
+
+	def _timestamp(self, moment):
+		"""Перевод момента perf_counter в микросекунды от начала записи"""
+		return round((moment - self._origin) * 1_000_000, 3)
+
+	def _write(self, event):
+		if self._file is None:
+			return
+		self._file.write(self._encoder.encode(event))
+		self._file.write(",\n")
+
+	def complete(self, name, start, duration, args=None, category='frame'):
+		"""Запись участка длительностью duration секунд, начатого в момент start (perf_counter)"""
+		event = {'name': name, 'cat': category, 'ph': 'X', 'pid': self.pid,
+		         'tid': threading.get_native_id(), 'ts': self._timestamp(start),
+		         'dur': round(duration * 1_000_000, 3)}
+		if args:
+			event['args'] = args
+		self._write(event)
+
+	def instant(self, name, args=None, category='game'):
+		"""Запись мгновенного события (например, начала волны)"""
+		event = {'name': name, 'cat': category, 'ph': 'i', 's': 'p', 'pid': self.pid,
+		         'tid': threading.get_native_id(), 'ts': self._timestamp(perf_counter())}
+		if args:
+			event['args'] = args
+		self._write(event)
+
+	def counter(self, name, values, moment=None):
+		"""Запись значений счётчиков (отображаются графиком)"""
+		if moment is None:
+			moment = perf_counter()
+		self._write({'name': name, 'ph': 'C', 'pid': self.pid, 'ts': self._timestamp(moment),
+		             'args': values})
+
+	def close(self):
+		"""Завершение записи"""
+		if self._file is None:
+			return
+		# Последнее событие без запятой, чтобы файл был корректным JSON
+		self._file.write(self._encoder.encode({'name': 'trace_end', 'ph': 'i', 's': 'g', 'pid': self.pid,
+		                                       'tid': 0, 'ts': self._timestamp(perf_counter())}))
+		self._file.write("\n]\n")
+		self._file.close()
+		self._file = None
@@ -1,16 +1,294 @@
 from pygame.image import load
+from collections import OrderedDict
 import os
+import json
 import pygame
 
-def load_sprite(name, with_alpha=True):
-	"""Модуль для загрузки спрайтов"""
-	base_path = os.path.dirname(os.path.abspath(__file__))
-	sprite_path = os.path.join(base_path, "..", "Sprites", f"{name}.png")
-	sprite_path = os.path.normpath(sprite_path)
-	
-	try:
-		loaded_sprite = load(sprite_path)
-		surface = loaded_sprite.convert_alpha() if with_alpha else loaded_sprite.convert()
+from constants import (
+	SPRITE_CACHE_MAX_SIZE, SCALED_SPRITE_CACHE_MAX_SIZE, ROTATION_BUCKETS, ATLAS_DIR, ATLAS_INDEX_NAME
+)
+
+
+_headless = False
+
+
+def set_headless(enabled):
+	"""Включение режима без окна: спрайты загружаются без convert/convert_alpha"""
+	global _headless
+	if _headless != enabled:
+		_headless = enabled
+		sprite_cache.invalidate()
+		image_cache.invalidate()
+
+
+def is_headless():
+	"""Проверка, включён ли режим без окна"""
+	return _headless
+
+
+_project_root = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+
+def _sprite_path(name):
+	"""Получение полного пути к спрайту"""
+	return os.path.normpath(os.path.join(_project_root, "Sprites", f"{name}.png"))
+
+
+def _asset_path(path):
+	"""Получение полного пути к файлу, указанному относительно корня проекта"""
+	return os.path.normpath(os.path.join(_project_root, path))
+
+
+def convert_surface(surface, with_alpha=True):
+	"""Конвертация пикселей в формат экрана (должна выполняться в основном потоке)"""
+	# Без окна конвертировать пиксели не во что
+	if _headless:
 		return surface
+	return surface.convert_alpha() if with_alpha else surface.convert()
+
+
+_atlas_index = None
+
+
+def get_atlas_index():
+	"""Индекс атласа {имя спрайта: (путь страницы от корня проекта, (x, y, w, h))}.
+
+	Пустой, если атлас не собран (atlas_builder.py); тогда спрайты читаются по одному."""
+	global _atlas_index
+	if _atlas_index is None:
+		_atlas_index = {}
+		index_path = _asset_path(os.path.join(ATLAS_DIR, ATLAS_INDEX_NAME))
+		if os.path.exists(index_path):
+			with open(index_path, encoding='utf-8') as file:
+				index = json.load(file)
+			pages = [f"{ATLAS_DIR}/{page}" for page in index['pages']]
+			for name, entry in index['sprites'].items():
+				_atlas_index[name] = (pages[entry['page']], tuple(entry['rect']))
+	return _atlas_index
+
+
+def get_atlas_entry(path):
+	"""Запись атласа для файла из папки Sprites (по пути от корня проекта) или None"""
+	if path.startswith("Sprites/") and path.endswith(".png"):
+		return get_atlas_index().get(path[len("Sprites/"):-len(".png")])
+	return None
+
+
+def _load_from_atlas(entry):
+	"""Спрайт как часть страницы атласа: страница декодируется один раз на все спрайты"""
+	page_path, rect = entry
+	return image_cache.get(page_path, True).subsurface(rect)
+
+
+def _load_sprite_from_disk(name, with_alpha=True):
+	"""Чтение спрайта с диска и конвертация пикселей"""
+	entry = get_atlas_index().get(name) if with_alpha else None
+	if entry is not None:
+		return _load_from_atlas(entry)
+	sprite_path = _sprite_path(name)
+	try:
+		return convert_surface(load(sprite_path), with_alpha)
 	except pygame.error:
-		raise SystemExit(f"Ошибка: не удалось найти спрайт по пути: {sprite_path}")
\ No newline at end of file
+		raise SystemExit(f"Ошибка: не удалось найти спрайт по пути: {sprite_path}")
+
+
+def _load_image_from_disk(path, with_alpha=True):
+	"""Чтение изображения интерфейса с диска; ошибки загрузки обрабатывает вызывающий код"""
+	entry = get_atlas_entry(path) if with_alpha else None
+	if entry is not None:
+		return _load_from_atlas(entry)
+	return convert_surface(load(_asset_path(path)), with_alpha)
+
+
+class SpriteCache:
+	"""Класс для кэширования загруженных спрайтов.
+
+	Один и тот же Surface отдаётся всем объектам, поэтому его нельзя изменять на месте:
+	для масштабирования, поворота и отражения нужно создавать копию."""
+	def __init__(self, max_size=SPRITE_CACHE_MAX_SIZE, loader=_load_sprite_from_disk):
+		self.max_size = max_size
+		self.hits = 0
+		self.misses = 0
+		self._loader = loader
+		self._surfaces = OrderedDict()
+		self._invalidation_callbacks = []
+
+	def get(self, name, with_alpha=True):
+		"""Получение спрайта из кэша (с загрузкой при промахе)"""
+		key = (name, with_alpha)
+		surface = self._surfaces.get(key)
+		if surface is not None:
+			self._surfaces.move_to_end(key)
+			self.hits += 1
+			return surface
+
+		self.misses += 1
+		surface = self._loader(name, with_alpha)
+		self.put(name, surface, with_alpha)
+		return surface
+
+	def put(self, name, surface, with_alpha=True):
+		"""Помещение уже загруженного спрайта в кэш (используется предзагрузчиком)"""
+		self._surfaces[(name, with_alpha)] = surface
+		# Вытеснение давно не использованных спрайтов
+		while len(self._surfaces) > self.max_size:
+			self._surfaces.popitem(last=False)
+
+	def contains(self, name, with_alpha=True):
+		"""Проверка, есть ли спрайт в кэше"""
+		return (name, with_alpha) in self._surfaces
+
+	def preload(self, names, with_alpha=True):
+		"""Предварительная загрузка списка спрайтов"""
+		for name in names:
+			key = (name, with_alpha)
+			if key not in self._surfaces:
+				self.misses += 1
+				self._surfaces[key] = self._loader(name, with_alpha)
+		while len(self._surfaces) > self.max_size:
+			self._surfaces.popitem(last=False)
+
+	def invalidate(self, name=None):
+		"""Удаление спрайта из кэша (или очистка всего кэша, если name не указан)"""
+		if name is None:
+			self._surfaces.clear()
+		else:
+			for key in [key for key in self._surfaces if key[0] == name]:
+				del self._surfaces[key]
+		for callback in self._invalidation_callbacks:
+			callback(name)
+
+	def add_invalidation_callback(self, callback):
+		"""Подписка на инвалидацию кэша; callback получает имя спрайта или None"""
+		if callback not in self._invalidation_callbacks:
+			self._invalidation_callbacks.append(callback)
+
+	def remove_invalidation_callback(self, callback):
+		"""Отписка от инвалидации кэша"""
+		if callback in self._invalidation_callbacks:
+			self._invalidation_callbacks.remove(callback)
+
+	def get_stats(self):
+		"""Получение статистики кэша"""
+		return {
+			'hits': self.hits,
+			'misses': self.misses,
+			'size': len(self._surfaces),
+			'max_size': self.max_size,
+		}
+
+	def reset_stats(self):
+		"""Сброс счётчиков попаданий и промахов"""
+		self.hits = 0
+		self.misses = 0
+
+
+sprite_cache = SpriteCache()
+# Изображения интерфейса (кнопки, окна улучшений) хранятся по пути от корня проекта
+image_cache = SpriteCache(loader=_load_image_from_disk)
+
+
+def load_sprite(name, with_alpha=True):
+	"""Модуль для загрузки спрайтов"""
+	return sprite_cache.get(name, with_alpha)
+
+
+def preload_sprites(names, with_alpha=True):
+	"""Предварительная загрузка спрайтов в кэш"""
+	sprite_cache.preload(names, with_alpha)
+
+
+def load_image(path, with_alpha=True):
+	"""Загрузка изображения интерфейса по пути от корня проекта (pygame.error при ошибке)"""
+	return image_cache.get(path, with_alpha)
+
+
+_asset_data = {}
+
+
+def load_asset_data(path):
+	"""Получение содержимого файла (музыки) по пути от корня проекта; файл читается один раз"""
+	data = _asset_data.get(path)
+	if data is None:
+		with open(_asset_path(path), 'rb') as file:
+			data = file.read()
+		_asset_data[path] = data
+	return data
+
+
+def store_asset_data(path, data):
+	"""Помещение прочитанного файла в кэш (используется предзагрузчиком)"""
+	_asset_data[path] = data
+
+
+def has_asset_data(path):
+	"""Проверка, прочитан ли файл"""
+	return path in _asset_data
+
+
+class ScaledSpriteCache:
+	"""Класс для кэширования масштабированных под зум копий спрайтов"""
+	def __init__(self, max_size=SCALED_SPRITE_CACHE_MAX_SIZE):
+		self.max_size = max_size
+		self.hits = 0
+		self.misses = 0
+		self._surfaces = OrderedDict()
+
+	def get(self, surface, zoom):
+		"""Получение масштабированной копии спрайта (с масштабированием при промахе)"""
+		key = (surface, zoom)
+		scaled = self._surfaces.get(key)
+		if scaled is not None:
+			self._surfaces.move_to_end(key)
+			self.hits += 1
+			return scaled
+
+		self.misses += 1
+		w = max(1, int(surface.get_width() * zoom))
+		h = max(1, int(surface.get_height() * zoom))
+		scaled = pygame.transform.scale(surface, (w, h))
+		self._surfaces[key] = scaled
+		# Вытеснение давно не использованных копий (в том числе для старого зума)
+		while len(self._surfaces) > self.max_size:
+			self._surfaces.popitem(last=False)
+		return scaled
+
+	def clear(self):
+		"""Очистка кэша"""
+		self._surfaces.clear()
+
+	def get_stats(self):
+		"""Получение статистики кэша"""
+		return {
+			'hits': self.hits,
+			'misses': self.misses,
+			'size': len(self._surfaces),
+			'max_size': self.max_size,
+		}
+
+
+scaled_sprite_cache = ScaledSpriteCache()
+sprite_cache.add_invalidation_callback(lambda name: scaled_sprite_cache.clear())
+
+
+def get_scaled_sprite(surface, zoom):
+	"""Получение спрайта, масштабированного под текущий зум камеры"""
+	return scaled_sprite_cache.get(surface, zoom)
+
+
+_rotated_sprites = {}
+
+
+def get_rotated_sprite(name, angle, buckets=ROTATION_BUCKETS):
+	"""Получение спрайта, повёрнутого на угол, округлённый до ближайшей из buckets ступеней"""
+	step = 360.0 / buckets
+	bucket = int(round(angle / step)) % buckets
+	key = (name, bucket, buckets)
+	rotated = _rotated_sprites.get(key)
+	if rotated is None:
+		rotated = pygame.transform.rotate(load_sprite(name, with_alpha=True), bucket * step)
+		_rotated_sprites[key] = rotated
+	return rotated
+
+
+sprite_cache.add_invalidation_callback(lambda name: _rotated_sprites.clear())
@@ -0,0 +1,291 @@
+import os
+import json
+import shutil
+import threading
+from collections import deque
+
+import pygame
+
+try:
+	import cv2
+	import numpy
+	OPENCV_AVAILABLE = True
+except ImportError:
+	OPENCV_AVAILABLE = False
+
+from constants import VIDEO_BUFFER_FRAMES, VIDEO_DEFAULT_FPS, VIDEO_CACHE_MAX_MB
+
+VIDEO_CACHE_VERSION = 1
+
+
+def fit_size(frame_width, frame_height, max_width, max_height):
+	"""Размер кадра, вписанного в max_width x max_height с сохранением пропорций"""
+	scale = min(max_width / frame_width, max_height / frame_height)
+	return int(frame_width * scale), int(frame_height * scale)
+
+
+def _cache_paths(cache_dir, path, max_width, max_height):
+	"""Пути файла кадров (.npy) и его описания (.json) в папке кэша"""
+	name = os.path.splitext(os.path.basename(path))[0]
+	base = os.path.join(cache_dir, f"{name}_{max_width}x{max_height}")
+	return base + '.npy', base + '.json'
+
+
+def _source_info(path):
+	stat = os.stat(path)
+	return {'source_size': stat.st_size, 'source_mtime_ns': stat.st_mtime_ns}
+
+
+def load_frame_cache(path, max_width, max_height, cache_dir):
+	"""Кадры ролика из кэша на диске (numpy.memmap) и их частота, или None, если кэш не готов или устарел"""
+	cache_path, meta_path = _cache_paths(cache_dir, path, max_width, max_height)
+	try:
+		with open(meta_path, encoding='utf-8') as file:
+			meta = json.load(file)
+		if meta.get('version') != VIDEO_CACHE_VERSION or any(
+				meta.get(key) != value for key, value in _source_info(path).items()):
+			return None
+		frames = numpy.load(cache_path, mmap_mode='r')
+	except (OSError, ValueError):
+		return None
+	count = meta['frames']
+	if frames.shape[0] < count or frames.shape[1:] != (meta['height'], meta['width'], 3):
+		return None
+	return frames[:count], meta['fps']
+
+
+def build_frame_cache(path, max_width, max_height, cache_dir):
+	"""Однократное декодирование всего ролика в кэш кадров размера экрана; возвращает успех.
+
+	Кадры пишутся во временный .npy через numpy.memmap, описание (.json)
+	сохраняется последним: пока его нет, кэш считается недостроенным."""
+	cache_path, meta_path = _cache_paths(cache_dir, path, max_width, max_height)
+	temp_path = cache_path + '.tmp'
+	capture = cv2.VideoCapture(path)
+	if not capture.isOpened():
+		return False
+	frames = None
+	try:
+		fps = capture.get(cv2.CAP_PROP_FPS)
+		width, height = fit_size(capture.get(cv2.CAP_PROP_FRAME_WIDTH),
+		                         capture.get(cv2.CAP_PROP_FRAME_HEIGHT), max_width, max_height)
+		capacity = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+		size_bytes = capacity * width * height * 3
+		if capacity <= 0 or size_bytes > VIDEO_CACHE_MAX_MB * 1024 * 1024:
+			print(f"Video cache skipped for {path}: {size_bytes // (1024 * 1024)} MB is over the limit")
+			return False
+		os.makedirs(cache_dir, exist_ok=True)
+		if shutil.disk_usage(cache_dir).free < size_bytes:
+			print(f"Video cache skipped for {path}: not enough disk space")
+			return False
+		if os.path.exists(meta_path):
+			os.remove(meta_path)
+		frames = numpy.lib.format.open_memmap(temp_path, mode='w+', dtype=numpy.uint8,
+		                                      shape=(capacity, height, width, 3))
+		count = 0
+		decoded = None
+		while True:
+			success, decoded = capture.read(decoded)
+			if not success:
+				break
+			if count >= capacity:
+				# Кадров больше, чем сообщил файл: такой ролик не кэшируется
+				return False
+			cv2.resize(decoded, (width, height), dst=frames[count])
+			count += 1
+		if count == 0:
+			return False
+		frames.flush()
+		frames = None
+		os.replace(temp_path, cache_path)
+		meta = {'version': VIDEO_CACHE_VERSION, 'width': width, 'height': height, 'frames': count,
+		        'fps': fps if fps and fps > 0 else VIDEO_DEFAULT_FPS}
+		meta.update(_source_info(path))
+		with open(meta_path, 'w', encoding='utf-8') as file:
+			json.dump(meta, file, indent=1)
+		return True
+	except OSError as e:
+		print(f"Error building video cache: {e}")
+		return False
+	finally:
+		capture.release()
+		frames = None
+		if os.path.exists(temp_path):
+			os.remove(temp_path)
+
+
+# Потоки построения кэша по пути файла кадров: кэш строится один раз, даже если меню пересоздаётся
+_cache_builds = {}
+
+
+def start_frame_cache_build(path, max_width, max_height, cache_dir):
+	"""Запуск build_frame_cache в фоновом потоке, если он ещё не идёт"""
+	key = _cache_paths(cache_dir, path, max_width, max_height)[0]
+	thread = _cache_builds.get(key)
+	if thread is not None and thread.is_alive():
+		return
+	thread = threading.Thread(target=build_frame_cache, args=(path, max_width, max_height, cache_dir),
+	                          name='video-cache', daemon=True)
+	_cache_builds[key] = thread
+	thread.start()
+
+
+class VideoDecoder:
+	"""Класс фонового декодирования зацикленного видео.
+
+	Рабочий поток читает кадры и масштабирует их (cv2.resize с dst) прямо в
+	кольцевой буфер из buffer_frames заранее выделенных массивов BGR. Поверх
+	каждого массива один раз создаётся поверхность pygame.image.frombuffer без
+	копирования пикселей, поэтому перевод в RGB, поворот массива и новые
+	поверхности на каждый кадр не нужны. Основной поток в take_frame только
+	забирает поверхность самого свежего кадра, время показа которого уже
+	наступило: видео идёт со своей частотой кадров, а не с частотой обновления
+	сцены. Ячейка показанного кадра не перезаписывается, пока её не сменит
+	следующий кадр. Перемотка на начало в конце ролика тоже выполняется в
+	рабочем потоке.
+
+	С cache_dir кадры берутся из кэша на диске (load_frame_cache): рабочий
+	поток только копирует готовый кадр в ячейку, без декодирования и без
+	перемотки - конец ролика переходит в начало по индексу. Если кэша ещё нет,
+	видео декодируется как обычно, а кэш строится в фоне для следующих показов
+	меню и запусков игры."""
+	def __init__(self, path, max_width, max_height, buffer_frames=VIDEO_BUFFER_FRAMES, cache_dir=None):
+		self.path = path
+		self._thread = None
+		self._ready = deque()
+		self.capture = None
+		self.cached_frames = None
+		fps = None
+		if cache_dir is not None:
+			cached = load_frame_cache(path, max_width, max_height, cache_dir)
+			if cached is None:
+				start_frame_cache_build(path, max_width, max_height, cache_dir)
+			else:
+				self.cached_frames, fps = cached
+				self.size = (self.cached_frames.shape[2], self.cached_frames.shape[1])
+				self._read = self._read_cached
+				self._convert = self._copy_cached
+				self._cache_index = 0
+		if self.cached_frames is None:
+			self.capture = cv2.VideoCapture(path)
+			self.failed = not self.capture.isOpened()
+			if self.failed:
+				self.capture.release()
+				return
+			fps = self.capture.get(cv2.CAP_PROP_FPS)
+			self.size = fit_size(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH),
+			                     self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT), max_width, max_height)
+		self.failed = False
+		self.frame_duration = 1.0 / (fps if fps and fps > 0 else VIDEO_DEFAULT_FPS)
+		width, height = self.size
+		self.frames = [numpy.empty((height, width, 3), numpy.uint8) for _ in range(buffer_frames)]
+		self.surfaces = [pygame.image.frombuffer(frame, self.size, 'BGR') for frame in self.frames]
+		self._decoded = None
+		# Свободные ячейки буфера, готовые кадры (ячейка, время показа) и ячейка на экране
+		self._free = deque(range(buffer_frames))
+		self._shown = None
+		self._condition = threading.Condition()
+		self._stopped = False
+		self._paused = False
+		self.play_time = 0.0
+		self.shown_time = 0.0
+		self._thread = threading.Thread(target=self._run, name='video-decoder', daemon=True)
+		self._thread.start()
+
+	def _read(self):
+		"""Чтение следующего кадра; в конце ролика - перемотка на начало"""
+		# Декодированный кадр каждый раз пишется в один и тот же массив
+		success, frame = self.capture.read(self._decoded)
+		if not success:
+			self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+			success, frame = self.capture.read(self._decoded)
+		if not success:
+			return None
+		self._decoded = frame
+		return frame
+
+	def _convert(self, frame, slot):
+		"""Масштабирование кадра сразу в ячейку буфера (её видит поверхность ячейки)"""
+		cv2.resize(frame, self.size, dst=self.frames[slot])
+
+	def _read_cached(self):
+		"""Следующий кадр из кэша; после последнего - снова первый"""
+		frame = self.cached_frames[self._cache_index]
+		self._cache_index = (self._cache_index + 1) % len(self.cached_frames)
+		return frame
+
+	def _copy_cached(self, frame, slot):
+		"""Копирование кадра из кэша в ячейку (страницы файла читаются в рабочем потоке, а не при blit)"""
+		numpy.copyto(self.frames[slot], frame)
+
+	def _run(self):
+		index = 0
+		try:
+			while True:
+				with self._condition:
+					while (not self._free or self._paused) and not self._stopped:
+						self._condition.wait()
+					if self._stopped:
+						return
+					slot = self._free.popleft()
+				frame = self._read()
+				if frame is None:
+					print(f"Error: Could not read video frame: {self.path}")
+					self.failed = True
+					return
+				self._convert(frame, slot)
+				with self._condition:
+					self._ready.append((slot, index * self.frame_duration))
+				index += 1
+		except Exception as e:
+			print(f"Error decoding video: {e}")
+			self.failed = True
+		finally:
+			if self.capture is not None:
+				self.capture.release()
+
+	def take_frame(self, dt):
+		"""Поверхность самого свежего кадра, время показа которого наступило, или None, если смены кадра нет"""
+		if self.failed and not self._ready:
+			return None
+		self.play_time += dt
+		latest = None
+		with self._condition:
+			while self._ready and self._ready[0][1] <= self.play_time:
+				# Пропущенные кадры сразу возвращаются декодеру
+				if latest is not None:
+					self._free.append(latest[0])
+				latest = self._ready.popleft()
+			if latest is not None:
+				if self._shown is not None:
+					self._free.append(self._shown)
+				self._shown, self.shown_time = latest
+				self._condition.notify()
+			if not self._ready:
+				# Декодер не успевает: часы видео ждут его, а не убегают вперёд
+				self.play_time = min(self.play_time, self.shown_time + self.frame_duration)
+		return self.surfaces[latest[0]] if latest is not None else None
+
+	def pause(self):
+		"""Остановка декодирования без освобождения видеофайла и буферов"""
+		if self._thread is None:
+			return
+		with self._condition:
+			self._paused = True
+
+	def resume(self):
+		"""Продолжение декодирования после pause"""
+		if self._thread is None:
+			return
+		with self._condition:
+			self._paused = False
+			self._condition.notify()
+
+	def close(self):
+		"""Остановка рабочего потока и освобождение видеофайла"""
+		if self._thread is None:
+			return
+		with self._condition:
+			self._stopped = True
+			self._condition.notify()
+		self._thread.join()
@@ -4,11 +4,16 @@ import math
 import random
 
 from game_object import GameObject
-from utils import load_sprite
+from utils import load_sprite, get_rotated_sprite, load_image
+from animation import Animation, AnimationSet, get_animation_set
 from weapon_stats import WEAPON_STATS
 from math import atan2, degrees
 from constants import WINDOW_WIDTH, WINDOW_HEIGHT
 
+PROJECTILE_SPRITE_NAME = "Weapons/RangeWeapons/bullet1"
+PISTOL_IDLE_SPRITE_NAME = "Weapons/RangeWeapons/Pistol/pistol_idle_1"
+DOT_SPRITE_PATH = "UI/ui_sprites/dot.png"
+
 class Weapon:
     """Общий класс для управления оружием"""
     def __init__(self, owner, offset: Vector2, stats: dict):
@@ -16,6 +21,7 @@ class Weapon:
         self.offset = Vector2(offset)
         self.stats = stats
         self.sprite = None
+        self.flipped_sprite = None
         self.rect = pygame.Rect(0,0,0,0)
         self.angle = 0
         self.world_position = owner.position + offset
@@ -29,8 +35,7 @@ class Weapon:
     # Загрузка спрайта для точек на экране
     def _load_dot_sprite(self):
         try:
-            dot_path = "UI/ui_sprites/dot.png"
-            self.dot_sprite = pygame.image.load(dot_path).convert_alpha()
+            self.dot_sprite = load_image(DOT_SPRITE_PATH)
         except pygame.error as e:
             self.dot_sprite = None
         except FileNotFoundError:
@@ -87,30 +92,40 @@ class Weapon:
         
         if self.sprite:
             if self.last_direction.x < 0:
-                self.oriented_sprite = pygame.transform.flip(self.sprite, True, False)
+                self.oriented_sprite = self.flipped_sprite
             else:
                 self.oriented_sprite = self.sprite
                 
         if self.sprite:
             self.update_position()
 
-    def draw(self, surface, camera):
-        """Отрисовка оружия"""
-        if not self.sprite: return
+    def get_draw_item(self, camera):
+        """Спрайт оружия и его позиция на экране (пара для Surface.blits) или None"""
+        if not self.sprite: return None
 
         flip_horizontal = self.owner.last_direction.x < 0
         
-        current_sprite = self.sprite
-        
-        final_sprite = pygame.transform.flip(current_sprite, flip_horizontal, False)
+        # Отражённый кадр берётся из заранее подготовленного банка
+        final_sprite = self.flipped_sprite if flip_horizontal else self.sprite
 
         temp_obj_for_apply = pygame.sprite.Sprite()
         temp_obj_for_apply.rect = self.rect
         temp_obj_for_apply.image = final_sprite
 
-        screen_rect = camera.apply(temp_obj_for_apply)
+        screen_rect = camera.apply(temp_obj_for_apply, self.owner)
 
-        surface.blit(final_sprite, screen_rect.topleft)
+        return final_sprite, screen_rect.topleft
+
+    def draw(self, surface, camera):
+        """Отрисовка оружия"""
+        item = self.get_draw_item(camera)
+        if item is not None:
+            surface.blit(*item)
+
+    def set_frame(self, animation, index):
+        """Установка текущего кадра оружия вместе с его отражённой копией"""
+        self.sprite = animation.frames[index]
+        self.flipped_sprite = animation.flipped_frames[index]
 
     def get_cooldown_dots(self):
         """Получение количества точек на экране"""
@@ -133,16 +148,16 @@ class MeleeWeapon(Weapon):
         frame_duration: float = 0.1
     ):
         super().__init__(owner, offset, stats)
-        self.idle_sprite    = load_sprite(idle_sprite_name, with_alpha=True)
-        self.attack_sprites = [load_sprite(n, with_alpha=True) for n in attack_sprite_names]
-        
         scale = self.stats.get('scale', 1)
-        if scale != 1:
-            w, h = self.idle_sprite.get_size()
-            self.idle_sprite = pygame.transform.scale(self.idle_sprite, (int(w * scale), int(h * scale)))
-            self.attack_sprites = [pygame.transform.scale(s, (int(s.get_width() * scale), int(s.get_height() * scale))) for s in self.attack_sprites]
+        animations_key = ('melee', idle_sprite_name, tuple(attack_sprite_names), scale, frame_duration)
+        self.animations = get_animation_set(
+            animations_key,
+            lambda: self._build_animations(idle_sprite_name, attack_sprite_names, scale, frame_duration)
+        )
+        self.idle_sprite    = self.animations['idle'][0]
+        self.attack_sprites = self.animations['attack']
 
-        self.sprite         = self.idle_sprite
+        self.set_frame(self.animations['idle'], 0)
         self.attacking      = False
         self.frame_index    = 0
         self.timer          = 0.0
@@ -152,6 +167,21 @@ class MeleeWeapon(Weapon):
         self.half_arc_rad = self.attack_arc_rad / 2
         self.current_attack_direction = Vector2(1, 0)
     
+    @staticmethod
+    def _build_animations(idle_sprite_name, attack_sprite_names, scale, frame_duration):
+        """Создание набора анимаций оружия (один раз на тип оружия)"""
+        def scaled(sprite):
+            if scale == 1:
+                return sprite
+            return pygame.transform.scale(sprite, (int(sprite.get_width() * scale), int(sprite.get_height() * scale)))
+
+        idle_sprite = scaled(load_sprite(idle_sprite_name, with_alpha=True))
+        attack_sprites = [scaled(load_sprite(n, with_alpha=True)) for n in attack_sprite_names]
+        return AnimationSet({
+            'idle': Animation([idle_sprite], frame_duration),
+            'attack': Animation(attack_sprites, frame_duration),
+        })
+
     def update_position(self):
         """Обновление позиции оружия"""
         if not self.sprite: return
@@ -180,7 +210,7 @@ class MeleeWeapon(Weapon):
             self.timer = 0.0
             self.hit_enemies_this_attack = set()
             
-            self.sprite = self.attack_sprites[0]
+            self.set_frame(self.attack_sprites, 0)
             self.update_position()
             
             owner_pos = self.owner.position
@@ -210,39 +240,34 @@ class MeleeWeapon(Weapon):
                 if self.frame_index >= len(self.attack_sprites):
                     self.attacking = False
                     self.frame_index = 0
-                    self.sprite = self.idle_sprite
+                    self.set_frame(self.animations['idle'], 0)
                     return
                 else:
-                    self.sprite = self.attack_sprites[self.frame_index]
+                    self.set_frame(self.attack_sprites, self.frame_index)
             
             if self.frame_index < 3:
                 owner_pos = self.owner.position
-                attack_range_sq = self.stats.get('range', 50) ** 2
+                attack_range = self.stats.get('range', 50)
                 attack_direction = self.current_attack_direction
                 if attack_direction.length_squared() == 0: attack_direction = Vector2(1,0)
                 
-                for enemy in game_state.enemies:
+                # Поиск врагов в секторе атаки через пространственную сетку
+                enemies_in_arc = game_state.enemy_grid.query_cone(
+                    owner_pos, attack_direction, attack_range, math.degrees(self.half_arc_rad)
+                )
+                for enemy in enemies_in_arc:
                     if enemy not in self.hit_enemies_this_attack:
                         if not enemy.alive:
                             continue
-                        # Расчет расстояния до врага
-                        enemy_vec = enemy.position - owner_pos
-                        if enemy_vec.length_squared() < attack_range_sq:
-                            # Расчет угла между направлением атаки и направлением к врагу
-                            if attack_direction.length() > 0 and enemy_vec.length() > 0:
-                                # Расчет угла между направлением атаки и направлением к врагу
-                                angle_between = attack_direction.angle_to(enemy_vec)
-                                # Проверка, находится ли враг в зоне атаки
-                                if abs(angle_between) <= math.degrees(self.half_arc_rad):
-                                    # Нанесение урона врагу
-                                    enemy.take_damage(self.stats.get('damage', 0))
-                                    # Применение отталкивания врагу
-                                    enemy.apply_knockback(attack_direction, self.stats.get('repulsion', 0), 0.1)
-                                    # Добавление врага в список врагов, которых атаковал оружие
-                                    self.hit_enemies_this_attack.add(enemy)
+                        # Нанесение урона врагу
+                        enemy.take_damage(self.stats.get('damage', 0))
+                        # Применение отталкивания врагу
+                        enemy.apply_knockback(attack_direction, self.stats.get('repulsion', 0), 0.1)
+                        # Добавление врага в список врагов, которых атаковал оружие
+                        self.hit_enemies_this_attack.add(enemy)
 
         else:
-            self.sprite = self.idle_sprite
+            self.set_frame(self.animations['idle'], 0)
             self.update_position()
 
 
@@ -257,18 +282,29 @@ class RangeWeapon(Weapon):
         projectile_sprite_name: str,
     ):
         super().__init__(owner, offset, stats)
-        self.idle_sprite = load_sprite(weapon_idle_sprite, with_alpha=True)
-        
         scale = self.stats.get('scale', 1)
-        if scale != 1:
-            w, h = self.idle_sprite.get_size()
-            self.idle_sprite = pygame.transform.scale(self.idle_sprite, (w * scale, h * scale))
+        self.animations = get_animation_set(
+            ('range', weapon_idle_sprite, scale),
+            lambda: self._build_animations(weapon_idle_sprite, scale)
+        )
+        self.idle_sprite = self.animations['idle'][0]
             
-        self.sprite = self.idle_sprite
+        self.set_frame(self.animations['idle'], 0)
         self.projectile_sprite_name = projectile_sprite_name
         self.angle = 0
         self.facing_left = False
 
+    @staticmethod
+    def _build_animations(weapon_idle_sprite, scale):
+        """Создание набора анимаций оружия (один раз на тип оружия)"""
+        idle_sprite = load_sprite(weapon_idle_sprite, with_alpha=True)
+        if scale != 1:
+            w, h = idle_sprite.get_size()
+            idle_sprite = pygame.transform.scale(idle_sprite, (w * scale, h * scale))
+        return AnimationSet({
+            'idle': Animation([idle_sprite], 0),
+        })
+
     def update_position(self):
         """Обновление позиции оружия"""
         if not self.sprite: return
@@ -303,7 +339,8 @@ class RangeWeapon(Weapon):
 
         accuracy_degrees = self.stats.get('accuracy', 0)
         if accuracy_degrees > 0:
-            spread = random.uniform(-accuracy_degrees, accuracy_degrees)
+            rng = getattr(game_state, 'rng', random)
+            spread = rng.uniform(-accuracy_degrees, accuracy_degrees)
             direction.rotate_ip(spread)
         
         projectile_speed = self.stats.get('projectile_speed', 300)
@@ -311,16 +348,22 @@ class RangeWeapon(Weapon):
         knockback = self.stats.get('repulsion', 0)
         stun = self.stats.get('stun', 0.1)
 
-        projectile = Projectile(
-            position=self.rect.center,
-            direction=direction,
-            speed=projectile_speed,
-            sprite_name=self.projectile_sprite_name,
-            damage=damage,
-            knockback=knockback,
-            stun=stun
-        )
-        game_state.projectiles.append(projectile)
+        projectile_args = {
+            'position': self.rect.center,
+            'direction': direction,
+            'speed': projectile_speed,
+            # Все снаряды пока используют общий спрайт пули
+            'sprite_name': PROJECTILE_SPRITE_NAME,
+            'damage': damage,
+            'knockback': knockback,
+            'stun': stun
+        }
+        # Снаряд берётся из пула, если он есть
+        projectile_pool = getattr(game_state, 'projectile_pool', None)
+        if projectile_pool is not None:
+            projectile_pool.spawn(**projectile_args)
+        else:
+            game_state.projectiles.append(Projectile(**projectile_args))
 
         self.cooldown_timer = self.stats.get('cooldown', 0.5)
 
@@ -336,16 +379,16 @@ class RangeWeapon(Weapon):
 
         self.update_position()
 
-    def draw(self, surface, camera):
-        """Отрисовка оружия"""
-        if not self.idle_sprite: return
+    def get_draw_item(self, camera):
+        """Повёрнутый спрайт оружия и его позиция на экране (пара для Surface.blits) или None"""
+        if not self.idle_sprite: return None
 
         weapon_world_pos = Vector2(self.rect.center)
         
         sprite_to_rotate = self.idle_sprite
         
         if self.facing_left:
-            sprite_to_rotate = pygame.transform.flip(self.idle_sprite, True, False)
+            sprite_to_rotate = self.animations['idle'].flipped_frames[0]
             draw_angle = self.angle + 180 if self.angle > 0 else self.angle - 180
         else:
             draw_angle = self.angle
@@ -358,18 +401,15 @@ class RangeWeapon(Weapon):
         temp_obj_for_apply.rect = rotated_rect
         temp_obj_for_apply.image = rotated_sprite
         
-        screen_rect = camera.apply(temp_obj_for_apply)
+        screen_rect = camera.apply(temp_obj_for_apply, self.owner)
         
-        surface.blit(rotated_sprite, screen_rect.topleft)
+        return rotated_sprite, screen_rect.topleft
 
 class Projectile(GameObject):
     """Класс для управления снарядами"""
     def __init__(self, position, direction: Vector2, speed: float, sprite_name: str, damage: float, knockback: float, stun: float):
-        sprite_path = f"Weapons/RangeWeapons/bullet1"
-        sprite = load_sprite(sprite_path, with_alpha=True)
-        
         angle = degrees(atan2(-direction.y, direction.x))
-        rotated_sprite = pygame.transform.rotate(sprite, angle)
+        rotated_sprite = get_rotated_sprite(PROJECTILE_SPRITE_NAME, angle)
 
         super().__init__(position, rotated_sprite, direction * speed)
         self.rect = self.sprite.get_rect(center=self.position)
@@ -381,7 +421,7 @@ class Projectile(GameObject):
 
     def update(self, dt, game_state):
         """Обновление состояния снаряда"""
-        for enemy in game_state.enemies:
+        for enemy in game_state.enemy_grid.query_rect(self.rect):
             if not enemy.alive:
                 continue
             if self.rect.colliderect(enemy.rect):
@@ -401,9 +441,10 @@ class Projectile(GameObject):
 class Pistol(RangeWeapon):
     """Класс для управления пистолетом"""
     def __init__(self, owner, offset: Vector2 = Vector2(15, 10)):
-        stats = WEAPON_STATS['pistol']
-        idle_sprite_name = "Weapons/RangeWeapons/Pistol/pistol_idle_1"
-        projectile_sprite_name = "Weapons/RangeWeapons/bullet1"
+        # Копия, чтобы улучшения меняли оружие этой игры, а не общий словарь WEAPON_STATS
+        stats = WEAPON_STATS['pistol'].copy()
+        idle_sprite_name = PISTOL_IDLE_SPRITE_NAME
+        projectile_sprite_name = PROJECTILE_SPRITE_NAME
 
         stats['projectile_sprite_name'] = projectile_sprite_name
 
@@ -423,23 +464,16 @@ class Pistol(RangeWeapon):
         direction = (target_pos - owner_pos).normalize() if (target_pos - owner_pos).length_squared() > 0 else self.owner.last_direction
 
         # Расчет расстояния до врага
-        range_sq = self.stats.get('close_quarters_range', 0) ** 2
-        half_arc_rad = math.radians(self.stats.get('close_quarters_arc', 0) / 2)
+        close_range = self.stats.get('close_quarters_range', 0)
+        half_arc = self.stats.get('close_quarters_arc', 0) / 2
 
-        if range_sq == 0 or half_arc_rad == 0:
+        if close_range == 0 or half_arc == 0:
             return
 
         # Проверка, находится ли враг в зоне атаки
-        for enemy in game_state.enemies:
+        for enemy in game_state.enemy_grid.query_cone(owner_pos, direction, close_range, half_arc,
+                                                      include_edge=False):
             if not enemy.alive:
                 continue
-            # Расчет расстояния до врага
-            enemy_vec = enemy.position - owner_pos
-            if enemy_vec.length_squared() < range_sq:
-                # Расчет угла между направлением атаки и направлением к врагу
-                if direction.length() > 0 and enemy_vec.length() > 0:
-                    angle_to_enemy = direction.angle_to(enemy_vec.normalize())
-                    # Проверка, находится ли враг в зоне атаки
-                    if abs(math.radians(angle_to_enemy)) < half_arc_rad:
-                        enemy.take_damage(self.stats.get('damage', 0))
-                        enemy.apply_knockback(direction, self.stats.get('repulsion', 0), 0.1)
+            enemy.take_damage(self.stats.get('damage', 0))
+            enemy.apply_knockback(direction, self.stats.get('repulsion', 0), 0.1)
@@ -1,35 +1,44 @@
 import pygame
+from collections import OrderedDict
+
+from utils import load_image, image_cache
+from text_cache import text_cache
+from Scripts.constants import BUTTON_SURFACE_CACHE_MAX_SIZE
+
+# Готовые поверхности кнопок (масштабированные спрайты и спрайты с надписью) по
+# параметрам кнопки: сцены пересоздают кнопки, а их поверхности - нет. Кэш ограничен
+# (LRU) и очищается вместе с кэшем изображений интерфейса
+_button_surfaces = OrderedDict()
+image_cache.add_invalidation_callback(lambda name: _button_surfaces.clear())
+
+
+def _get_cached(key):
+    surfaces = _button_surfaces.get(key)
+    if surfaces is not None:
+        _button_surfaces.move_to_end(key)
+    return surfaces
+
+
+def _put_cached(key, surfaces):
+    _button_surfaces[key] = surfaces
+    while len(_button_surfaces) > BUTTON_SURFACE_CACHE_MAX_SIZE:
+        _button_surfaces.popitem(last=False)
+
 
 class Button:
     def __init__(self, x, y, unpressed_sprite_path, pressed_sprite_path, callback=None,
                  text="", font_size=30, font_color=(255, 255, 255), text_offset_y=0,
                  scale=1.0):
-        try:
-            unpressed_sprite_base = pygame.image.load(unpressed_sprite_path).convert_alpha()
-            pressed_sprite_base = pygame.image.load(pressed_sprite_path).convert_alpha()
-        except pygame.error as e:
-            print(f"Error loading button sprite: {e}")
-            placeholder_size = (100, 50)
-            unpressed_sprite_base = pygame.Surface(placeholder_size, pygame.SRCALPHA)
-            unpressed_sprite_base.fill((100, 100, 100, 150))
-            pressed_sprite_base = pygame.Surface(placeholder_size, pygame.SRCALPHA)
-            pressed_sprite_base.fill((50, 50, 50, 200))
-        except FileNotFoundError:
-             placeholder_size = (100, 50)
-             unpressed_sprite_base = pygame.Surface(placeholder_size, pygame.SRCALPHA)
-             unpressed_sprite_base.fill((100, 100, 100, 150))
-             pressed_sprite_base = pygame.Surface(placeholder_size, pygame.SRCALPHA)
-             pressed_sprite_base.fill((50, 50, 50, 200))
-             
         self.scale = scale
-        if self.scale != 1.0:
-            new_width = int(unpressed_sprite_base.get_width() * self.scale)
-            new_height = int(unpressed_sprite_base.get_height() * self.scale)
-            self.unpressed_sprite_base = pygame.transform.smoothscale(unpressed_sprite_base, (new_width, new_height))
-            self.pressed_sprite_base = pygame.transform.smoothscale(pressed_sprite_base, (new_width, new_height))
-        else:
-            self.unpressed_sprite_base = unpressed_sprite_base
-            self.pressed_sprite_base = pressed_sprite_base
+        sprite_key = (unpressed_sprite_path, pressed_sprite_path, scale)
+        sprites = _get_cached(sprite_key)
+        # Заглушки вместо незагрузившихся спрайтов в кэш не попадают
+        cacheable = True
+        if sprites is None:
+            sprites, cacheable = self._load_sprites(unpressed_sprite_path, pressed_sprite_path)
+            if cacheable:
+                _put_cached(sprite_key, sprites)
+        self.unpressed_sprite_base, self.pressed_sprite_base = sprites
 
         self.rect = self.unpressed_sprite_base.get_rect()
         self.rect.topleft = (x, y)
@@ -39,20 +48,21 @@ class Button:
         self.text_surface = None
         if text:
             try:
-                font = pygame.font.Font(None, font_size)
+                self.text_surface = text_cache.render(text, font_size, font_color)
             except pygame.error:
-                font = pygame.font.SysFont('arial', font_size)
-                
-            self.text_surface = font.render(text, True, font_color)
+                self.text_surface = text_cache.render(text, font_size, font_color, name='arial')
             self.text_rect = self.text_surface.get_rect()
             self.text_rect.centerx = self.rect.width // 2
             self.text_rect.centery = self.rect.height // 2 + text_offset_y
             
-            self.unpressed_sprite_with_text = self.unpressed_sprite_base.copy()
-            self.unpressed_sprite_with_text.blit(self.text_surface, self.text_rect)
-            
-            self.pressed_sprite_with_text = self.pressed_sprite_base.copy()
-            self.pressed_sprite_with_text.blit(self.text_surface, self.text_rect)
+            text_key = sprite_key + (text, font_size, tuple(font_color), text_offset_y)
+            sprites = _get_cached(text_key)
+            if sprites is None:
+                sprites = (self._with_text(self.unpressed_sprite_base),
+                           self._with_text(self.pressed_sprite_base))
+                if cacheable:
+                    _put_cached(text_key, sprites)
+            self.unpressed_sprite_with_text, self.pressed_sprite_with_text = sprites
         else:
             self.unpressed_sprite_with_text = self.unpressed_sprite_base
             self.pressed_sprite_with_text = self.pressed_sprite_base
@@ -60,6 +70,37 @@ class Button:
         self.image = self.unpressed_sprite_with_text
         self.unpressed_sprite = self.unpressed_sprite_base
 
+    def _load_sprites(self, unpressed_sprite_path, pressed_sprite_path):
+        """Спрайты кнопки в масштабе scale и признак успешной загрузки (иначе - заглушки)"""
+        loaded = True
+        try:
+            unpressed_sprite_base = load_image(unpressed_sprite_path)
+            pressed_sprite_base = load_image(pressed_sprite_path)
+        except pygame.error as e:
+            print(f"Error loading button sprite: {e}")
+            loaded = False
+        except FileNotFoundError:
+            loaded = False
+        if not loaded:
+            placeholder_size = (100, 50)
+            unpressed_sprite_base = pygame.Surface(placeholder_size, pygame.SRCALPHA)
+            unpressed_sprite_base.fill((100, 100, 100, 150))
+            pressed_sprite_base = pygame.Surface(placeholder_size, pygame.SRCALPHA)
+            pressed_sprite_base.fill((50, 50, 50, 200))
+
+        if self.scale != 1.0:
+            new_width = int(unpressed_sprite_base.get_width() * self.scale)
+            new_height = int(unpressed_sprite_base.get_height() * self.scale)
+            unpressed_sprite_base = pygame.transform.smoothscale(unpressed_sprite_base, (new_width, new_height))
+            pressed_sprite_base = pygame.transform.smoothscale(pressed_sprite_base, (new_width, new_height))
+        return (unpressed_sprite_base, pressed_sprite_base), loaded
+
+    def _with_text(self, sprite):
+        """Копия спрайта кнопки с надписью"""
+        sprite = sprite.copy()
+        sprite.blit(self.text_surface, self.text_rect)
+        return sprite
+
     def handle_event(self, event):
         action = None
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -0,0 +1,96 @@
+import pygame
+
+from text_cache import text_cache
+
+from Scripts.constants import (
+    BASE_PLAYER_HP, BASE_MAX_MANA, BASE_HP_BAR_WIDTH, BASE_MANA_BAR_WIDTH,
+    MAX_HP_BAR_WIDTH, MAX_MANA_BAR_WIDTH
+)
+
+HP_BAR_X = 10
+HP_BAR_Y = 10
+HP_BAR_HEIGHT = 20
+MANA_BAR_HEIGHT = 15
+MANA_BAR_Y = HP_BAR_Y + HP_BAR_HEIGHT + 5
+XP_BAR_WIDTH = 300
+XP_BAR_HEIGHT = 15
+XP_BAR_Y = 10
+
+
+class PlayerHud:
+    """Класс HUD игрока (полоски здоровья, маны и опыта, уровень).
+
+    Полоски и текст рисуются на две кэшированные поверхности (слева - здоровье
+    и мана, по центру - опыт и уровень), которые перерисовываются только при
+    изменении показателей игрока; в остальных кадрах HUD - это два blit."""
+    def __init__(self):
+        self.vitals_surface = None
+        self.vitals_state = None
+        self.xp_surface = None
+        self.xp_rect = None
+        self.xp_state = None
+
+    @staticmethod
+    def _draw_bar(surface, x, y, width, height, ratio, bg_color, fg_color, border_color):
+        """Отрисовка полоски с рамкой"""
+        rect = pygame.Rect(x, y, int(width), height)
+        fg_rect = pygame.Rect(x, y, int(width * ratio), height)
+        pygame.draw.rect(surface, bg_color, rect)
+        pygame.draw.rect(surface, fg_color, fg_rect)
+        pygame.draw.rect(surface, border_color, rect, 2)
+
+    def _render_vitals(self, player):
+        """Отрисовка полосок здоровья и маны на кэшированную поверхность"""
+        hp_width = mana_width = 0
+        if player.max_hp > 0:
+            hp_width = min(BASE_HP_BAR_WIDTH * (player.max_hp / BASE_PLAYER_HP), MAX_HP_BAR_WIDTH)
+        if player.max_mana > 0:
+            mana_width = min(BASE_MANA_BAR_WIDTH * (player.max_mana / BASE_MAX_MANA), MAX_MANA_BAR_WIDTH)
+        width = max(int(hp_width), int(mana_width), 1)
+        # Поверхность начинается в точке (HP_BAR_X, HP_BAR_Y) экрана
+        self.vitals_surface = pygame.Surface((width, MANA_BAR_Y + MANA_BAR_HEIGHT - HP_BAR_Y), pygame.SRCALPHA)
+        if player.max_hp > 0:
+            self._draw_bar(self.vitals_surface, 0, 0, hp_width, HP_BAR_HEIGHT,
+                           max(0, player.hp / player.max_hp),
+                           (128, 0, 0), (0, 200, 0), (255, 255, 255))
+        if player.max_mana > 0:
+            self._draw_bar(self.vitals_surface, 0, MANA_BAR_Y - HP_BAR_Y, mana_width, MANA_BAR_HEIGHT,
+                           max(0, player.current_mana / player.max_mana),
+                           (0, 0, 100), (0, 100, 255), (200, 200, 255))
+
+    def _render_xp(self, player, screen_width):
+        """Отрисовка полоски опыта и уровня на кэшированную поверхность"""
+        self.xp_surface = None
+        if player.xp_for_next_level <= 0:
+            return
+        bar_rect = pygame.Rect((screen_width - XP_BAR_WIDTH) // 2, XP_BAR_Y, XP_BAR_WIDTH, XP_BAR_HEIGHT)
+        level_surf = None
+        self.xp_rect = bar_rect.copy()
+        try:
+            level_surf = text_cache.render(f"Level: {player.current_level}", 24, (255, 255, 255))
+        except pygame.error:
+            pass
+        else:
+            level_rect = level_surf.get_rect(midtop=(bar_rect.centerx, bar_rect.bottom + 5))
+            self.xp_rect.union_ip(level_rect)
+        self.xp_surface = pygame.Surface(self.xp_rect.size, pygame.SRCALPHA)
+        self._draw_bar(self.xp_surface, bar_rect.x - self.xp_rect.x, bar_rect.y - self.xp_rect.y,
+                       XP_BAR_WIDTH, XP_BAR_HEIGHT, max(0, player.current_xp / player.xp_for_next_level),
+                       (50, 50, 50), (0, 180, 255), (200, 200, 200))
+        if level_surf is not None:
+            self.xp_surface.blit(level_surf, level_rect.move(-self.xp_rect.x, -self.xp_rect.y))
+
+    def draw(self, surface, player):
+        """Отрисовка HUD; поверхности пересобираются только при изменении показателей"""
+        vitals_state = (player.hp, player.max_hp, player.current_mana, player.max_mana)
+        if vitals_state != self.vitals_state:
+            self.vitals_state = vitals_state
+            self._render_vitals(player)
+        screen_width = surface.get_width()
+        xp_state = (player.current_xp, player.xp_for_next_level, player.current_level, screen_width)
+        if xp_state != self.xp_state:
+            self.xp_state = xp_state
+            self._render_xp(player, screen_width)
+        surface.blit(self.vitals_surface, (HP_BAR_X, HP_BAR_Y))
+        if self.xp_surface is not None:
+            surface.blit(self.xp_surface, self.xp_rect)
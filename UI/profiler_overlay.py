@@ -0,0 +1,54 @@
+import pygame
+
+from Scripts.constants import PROFILER_OVERLAY_REFRESH
+
+
+class ProfilerOverlay:
+    """Класс оверлея с перцентилями времени участков кадра и счётчиками профилировщика"""
+    def __init__(self, profiler, position=(10, 60), refresh_interval=PROFILER_OVERLAY_REFRESH):
+        self.profiler = profiler
+        self.position = position
+        self.refresh_interval = refresh_interval
+        # Моноширинный шрифт, чтобы колонки с числами не разъезжались
+        self.font = pygame.font.SysFont('consolas,couriernew,monospace', 16)
+        self.line_height = self.font.get_linesize()
+        self.text_color = (255, 255, 255)
+        self.background_color = (0, 0, 0, 170)
+        # Текст перерисовывается не каждый кадр, а раз в refresh_interval секунд
+        self.surface = None
+        self.refresh_timer = 0.0
+
+    def _build_lines(self):
+        """Формирование строк оверлея"""
+        lines = ["phase                         p50     p95     p99 (ms)"]
+        for path, (p50, p95, p99) in self.profiler.get_stats().items():
+            depth = path.count('/')
+            name = "  " * depth + path.rsplit('/', 1)[-1]
+            lines.append(f"{name:<26}{p50:8.2f}{p95:8.2f}{p99:8.2f}")
+        if self.profiler.counts:
+            lines.append("")
+            for name, value in self.profiler.counts.items():
+                lines.append(f"{name:<26}{value:>8}")
+        return lines
+
+    def _render(self):
+        """Отрисовка текста оверлея на отдельную поверхность"""
+        lines = self._build_lines()
+        rendered = [self.font.render(line, True, self.text_color) for line in lines]
+        width = max(text.get_width() for text in rendered) + 16
+        height = self.line_height * len(rendered) + 12
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.surface.fill(self.background_color)
+        for index, text in enumerate(rendered):
+            self.surface.blit(text, (8, 6 + index * self.line_height))
+
+    def draw(self, surface, dt):
+        """Отрисовка оверлея (только при включённом профилировщике)"""
+        if not self.profiler.enabled:
+            self.surface = None
+            return
+        self.refresh_timer -= dt
+        if self.surface is None or self.refresh_timer <= 0:
+            self.refresh_timer = self.refresh_interval
+            self._render()
+        surface.blit(self.surface, self.position)
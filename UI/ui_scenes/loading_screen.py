@@ -0,0 +1,40 @@
+import pygame
+from text_cache import text_cache
+from Scripts.constants import WINDOW_WIDTH, WINDOW_HEIGHT
+
+ACTION_LOADING_FINISHED = 'loading_finished'
+
+
+class LoadingScreen:
+    """Класс экрана загрузки с полосой прогресса предзагрузки ресурсов"""
+    def __init__(self, preloader):
+        self.preloader = preloader
+        self.preloader.start()
+        self.bar_rect = pygame.Rect(0, 0, WINDOW_WIDTH * 0.5, 24)
+        self.bar_rect.center = (WINDOW_WIDTH / 2, WINDOW_HEIGHT / 2)
+        self.audio_manager = None
+
+    def set_audio_manager(self, audio_manager):
+        """Установка менеджера звука"""
+        self.audio_manager = audio_manager
+
+    def handle_events(self, events):
+        """Переход в меню после окончания загрузки"""
+        if self.preloader.finished:
+            return ACTION_LOADING_FINISHED
+        return None
+
+    def update(self, dt):
+        """Конвертация очередной порции загруженных ресурсов"""
+        self.preloader.update()
+
+    def draw(self, surface):
+        """Отрисовка полосы прогресса"""
+        surface.fill((30, 30, 50))
+        progress = self.preloader.progress
+        fill_rect = self.bar_rect.copy()
+        fill_rect.width = int(self.bar_rect.width * progress)
+        pygame.draw.rect(surface, (200, 200, 220), fill_rect)
+        pygame.draw.rect(surface, (255, 255, 255), self.bar_rect, 2)
+        text = text_cache.render(f"Loading... {int(progress * 100)}%", 40, (255, 255, 255))
+        surface.blit(text, text.get_rect(midbottom=(self.bar_rect.centerx, self.bar_rect.top - 12)))
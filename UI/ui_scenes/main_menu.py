@@ -1,20 +1,19 @@
 import pygame
 import sys
 from UI.button import Button
+from video_decoder import VideoDecoder, OPENCV_AVAILABLE
 import os
-from Scripts.constants import PLAY_BUTTON_POSITION, SETTINGS_BUTTON_POSITION, EXIT_BUTTON_POSITION, WINDOW_WIDTH, WINDOW_HEIGHT
+from Scripts.constants import (
+    PLAY_BUTTON_POSITION, SETTINGS_BUTTON_POSITION, EXIT_BUTTON_POSITION, WINDOW_WIDTH, WINDOW_HEIGHT,
+    MENU_VIDEO_PATH, MENU_VIDEO_CACHE, MENU_VIDEO_CACHE_DIR
+)
 
 ACTION_START_GAME = 'start_game'
 ACTION_OPEN_SETTINGS = 'open_settings'
 ACTION_EXIT = 'exit'
 
-try:
-    import cv2
-    import numpy
-    OPENCV_AVAILABLE = True
-except ImportError:
+if not OPENCV_AVAILABLE:
     print("Warning: OpenCV library (cv2) not found. Video background disabled. Install with 'pip install opencv-python'")
-    OPENCV_AVAILABLE = False
 
 
 class MainMenu:
@@ -24,22 +23,22 @@ class MainMenu:
         self.buttons = []
         self._setup_buttons()
 
-        self.video_capture = None
+        self.video_decoder = None
         self.current_frame_surface = None
 
         if OPENCV_AVAILABLE:
             try:
-                video_path = "Videos/background_1.mp4"
-                self.video_capture = cv2.VideoCapture(video_path)
-                if not self.video_capture.isOpened():
-                    print(f"Error: Could not open video file: {video_path}")
-                    self.video_capture = None
-                else:
-                    pass
+                # Кадры декодируются в отдельном потоке, меню только забирает готовые
+                cache_dir = MENU_VIDEO_CACHE_DIR if MENU_VIDEO_CACHE else None
+                self.video_decoder = VideoDecoder(MENU_VIDEO_PATH, int(WINDOW_WIDTH), int(WINDOW_HEIGHT),
+                                                  cache_dir=cache_dir)
+                if self.video_decoder.failed:
+                    print(f"Error: Could not open video file: {MENU_VIDEO_PATH}")
+                    self.video_decoder = None
 
             except Exception as e:
                 print(f"Error initializing video capture: {e}")
-                self.video_capture = None
+                self.video_decoder = None
 
     def set_audio_manager(self, audio_manager):
         """Установка менеджера звука"""
@@ -107,44 +106,26 @@ class MainMenu:
 
     def update(self, dt):
         """Обновление состояния меню"""
-        if self.video_capture:
-            # Чтение кадра из видео
-            success, frame = self.video_capture.read()
-
-            # Если кадр не прочитан, то сбрасываем кадр на начало и пытаемся прочитать его снова
-            if not success:
-                self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                success, frame = self.video_capture.read()
-
-            try:
-                # Если кадр прочитан, то масштабируем его и преобразуем в RGB
-                if success:
-                    frame_h, frame_w = frame.shape[:2]
-                    window_w, window_h = int(WINDOW_WIDTH), int(WINDOW_HEIGHT)
-                    
-                    scale_w = window_w / frame_w
-                    scale_h = window_h / frame_h
-                    scale_factor = min(scale_w, scale_h)
-
-                    new_w = int(frame_w * scale_factor)
-                    new_h = int(frame_h * scale_factor)
-                    scaled_frame = cv2.resize(frame, (new_w, new_h))
-
-
-                    frame_rgb = cv2.cvtColor(scaled_frame, cv2.COLOR_BGR2RGB)
-                    rotated_frame = numpy.rot90(frame_rgb)
-                    flipped_frame = numpy.flipud(rotated_frame)
-                    self.current_frame_surface = pygame.surfarray.make_surface(flipped_frame)
-                else:
-                    self.current_frame_surface = None
-                    self.video_capture.release()
-                    self.video_capture = None
-
-            except Exception as e:
-                print(f"Error processing video frame: {e}")
-                self.current_frame_surface = None
-                if self.video_capture:
-                    self.video_capture.release()
+        if self.video_decoder:
+            frame_surface = self.video_decoder.take_frame(dt)
+            if frame_surface is not None:
+                self.current_frame_surface = frame_surface
+
+    def on_suspend(self):
+        """Пауза видео, пока меню не на экране (поток и буферы кадров сохраняются)"""
+        if self.video_decoder:
+            self.video_decoder.pause()
+
+    def on_resume(self):
+        """Продолжение видео с того же кадра"""
+        if self.video_decoder:
+            self.video_decoder.resume()
+
+    def on_exit(self):
+        """Остановка декодирования видео и освобождение видеофайла"""
+        if self.video_decoder:
+            self.video_decoder.close()
+            self.video_decoder = None
 
     def draw(self, surface):
         """Отрисовка меню"""
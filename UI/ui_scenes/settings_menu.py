@@ -1,5 +1,6 @@
 import pygame
 from UI.button import Button
+from text_cache import text_cache
 from Scripts.constants import WINDOW_WIDTH, WINDOW_HEIGHT
 
 ACTION_CLOSE_SETTINGS = 'close_settings'
@@ -18,11 +19,8 @@ class SettingsMenu:
         
         self._setup_return_button()
         
-        self.title_font = pygame.font.Font(None, 74)
-        self.label_font = pygame.font.Font(None, 48)
-        
-        self.title_text = self.title_font.render("НАСТРОЙКИ", True, (255, 255, 255))
-        self.volume_label = self.label_font.render("Громкость", True, (255, 255, 255))
+        self.title_text = text_cache.render("НАСТРОЙКИ", 74, (255, 255, 255))
+        self.volume_label = text_cache.render("Громкость", 48, (255, 255, 255))
         
         self._center_elements()
         
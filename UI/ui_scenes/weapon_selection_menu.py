@@ -1,5 +1,6 @@
 import pygame
 from UI.button import Button
+from text_cache import text_cache
 from Scripts.constants import WINDOW_WIDTH, WINDOW_HEIGHT
 
 ACTION_START_MELEE = 'start_melee'
@@ -10,8 +11,7 @@ class WeaponSelectionMenu:
     """Класс для управления меню выбора оружия"""
     def __init__(self):
         self._setup_buttons()
-        self.title_font = pygame.font.Font(None, 74)
-        self.title_surf = self.title_font.render("Choose your Weapon", True, (255, 255, 255))
+        self.title_surf = text_cache.render("Choose your Weapon", 74, (255, 255, 255))
         self.title_rect = self.title_surf.get_rect(center=(WINDOW_WIDTH / 2, WINDOW_HEIGHT * 0.25))
         self.audio_manager = None
 
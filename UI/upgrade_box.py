@@ -1,6 +1,11 @@
 import pygame
 import os
 
+from utils import load_image
+from text_cache import text_cache
+
+UPGRADE_WINDOW_PATH = "Sprites/Upgrades/Upgrade_sheets/window.png"
+
 def wrap_text(text, font, max_width):
     lines = []
     words = text.split(' ')
@@ -51,8 +56,7 @@ class UpgradeBox:
 
     def _load_resources(self):
         try:
-            bg_path = "Sprites/Upgrades/Upgrade_sheets/window.png"
-            self.background = pygame.image.load(bg_path).convert_alpha()
+            self.background = load_image(UPGRADE_WINDOW_PATH)
             self.background = pygame.transform.scale(self.background, self.size)
         except (pygame.error, FileNotFoundError) as e:
             self.background = pygame.Surface(self.size)
@@ -62,7 +66,7 @@ class UpgradeBox:
         try:
             icon_path = self.data.get('icon')
             if icon_path:
-                self.original_icon_surf = pygame.image.load(icon_path).convert_alpha()
+                self.original_icon_surf = load_image(icon_path)
                 self.icon_surf = None
             else:
                 self.original_icon_surf = None
@@ -71,13 +75,17 @@ class UpgradeBox:
             self.icon_surf = None
 
         try:
-            self.title_font = pygame.font.Font(None, 30)
-            self.desc_font = pygame.font.Font(None, 22)
-            self.stats_font = pygame.font.Font(None, 24)
+            self.font_name = None
+            self.title_size, self.desc_size, self.stats_size = 30, 22, 24
+            self.title_font = text_cache.get_font(self.title_size)
+            self.desc_font = text_cache.get_font(self.desc_size)
+            self.stats_font = text_cache.get_font(self.stats_size)
         except pygame.error as e:
-             self.title_font = pygame.font.SysFont('arial', 28)
-             self.desc_font = pygame.font.SysFont('arial', 20)
-             self.stats_font = pygame.font.SysFont('arial', 22)
+             self.font_name = 'arial'
+             self.title_size, self.desc_size, self.stats_size = 28, 20, 22
+             self.title_font = text_cache.get_font(self.title_size, self.font_name)
+             self.desc_font = text_cache.get_font(self.desc_size, self.font_name)
+             self.stats_font = text_cache.get_font(self.stats_size, self.font_name)
 
     def _prepare_layout(self):
         useful_rect = self.rect.inflate(-self.padding * 2, -self.padding * 2)
@@ -144,7 +152,7 @@ class UpgradeBox:
             title_line_height = self.title_font.get_linesize()
             for line in title_lines:
                 if available_text_height - title_line_height < 0: break
-                surf = self.title_font.render(line, True, text_color)
+                surf = text_cache.render(line, self.title_size, text_color, self.font_name)
                 rect = surf.get_rect(centerx=text_section_rect.centerx, top=current_y)
                 self.title_surfs.append(surf)
                 self.title_rects.append(rect)
@@ -158,7 +166,7 @@ class UpgradeBox:
             desc_line_height = self.desc_font.get_linesize()
             for line in desc_lines:
                 if available_text_height - desc_line_height < 0: break
-                surf = self.desc_font.render(line, True, text_color)
+                surf = text_cache.render(line, self.desc_size, text_color, self.font_name)
                 rect = surf.get_rect(centerx=text_section_rect.centerx, top=current_y)
                 self.desc_surfs.append(surf)
                 self.desc_rects.append(rect)
@@ -180,7 +188,7 @@ class UpgradeBox:
                 if current_stat_y + stat_line_height > max_stat_y:
                     break
 
-                surf = self.stats_font.render(message, True, stats_color)
+                surf = text_cache.render(message, self.stats_size, stats_color, self.font_name)
                 rect = surf.get_rect(centerx=stats_section_rect.centerx, top=current_stat_y)
                 self.stats_surfs.append(surf)
                 self.stats_rects.append(rect)